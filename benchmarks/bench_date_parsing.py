@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark for date cell parsing.
+Checks scrapers.date_parsing against the previous strptime loop on a corpus
+of date cells, then times both on a README-sized workload.
+
+    python -m benchmarks.bench_date_parsing
+"""
+import os
+import re
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.date_parsing import parse_date, cache_info
+
+# (cell, expected) - expected is a datetime, or a timedelta meaning "now minus this"
+CORPUS = [
+    ("Jun 19", None),
+    ("Jan 02", None),
+    ("Dec 18, 2024", datetime(2024, 12, 18)),
+    ("December 18, 2024", datetime(2024, 12, 18)),
+    ("12/18/2024", datetime(2024, 12, 18)),
+    ("2024-12-18", datetime(2024, 12, 18)),
+    ("18-12-2024", datetime(2024, 12, 18)),
+    ("12-18-2024", datetime(2024, 12, 18)),
+    ("2024/12/18", datetime(2024, 12, 18)),
+    ("25/12/2024", datetime(2024, 12, 25)),
+    ("Posted: Dec 18, 2024", datetime(2024, 12, 18)),
+    ("  Added: 2024-12-18  ", datetime(2024, 12, 18)),
+    ("3 days ago", timedelta(days=3)),
+    ("1 week ago", timedelta(weeks=1)),
+    ("2 months old", timedelta(days=60)),
+    ("yesterday-ish", timedelta(days=7)),
+    ("", timedelta(days=7)),
+]
+
+
+def legacy_parse_date(date_str: str) -> datetime:
+    """The parser this module replaced, kept here as the reference implementation"""
+    date_str = date_str.strip()
+    date_str = re.sub(r'^(posted|updated|added):\s*', '', date_str, flags=re.IGNORECASE)
+    date_str = re.sub(r'\s*(ago|old)$', '', date_str, flags=re.IGNORECASE)
+    relative_match = re.search(r'(\d+)\s*(day|week|month)s?\s*ago', date_str, re.IGNORECASE)
+    if relative_match:
+        num = int(relative_match.group(1))
+        unit = relative_match.group(2).lower()
+        if unit == 'day':
+            return datetime.now() - timedelta(days=num)
+        elif unit == 'week':
+            return datetime.now() - timedelta(weeks=num)
+        elif unit == 'month':
+            return datetime.now() - timedelta(days=num * 30)
+    try:
+        date_obj = datetime.strptime(date_str, '%b %d')
+        date_obj = date_obj.replace(year=datetime.now().year)
+        if date_obj > datetime.now():
+            date_obj = date_obj.replace(year=datetime.now().year - 1)
+        return date_obj
+    except ValueError:
+        pass
+    formats = ['%b %d, %Y', '%B %d, %Y', '%m/%d/%Y', '%Y-%m-%d', '%d-%m-%Y', '%m-%d-%Y', '%Y/%m/%d', '%d/%m/%Y']
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return datetime.now() - timedelta(days=7)
+
+
+def check_corpus() -> int:
+    now = datetime.now()
+    failures = 0
+    for cell, expected in CORPUS:
+        got = parse_date(cell, now=now)
+        if expected is None:
+            # Month/day cells must agree with the old parser
+            expected = legacy_parse_date(cell)
+        elif isinstance(expected, timedelta):
+            expected = now - expected
+        if got != expected:
+            failures += 1
+            print(f"MISMATCH {cell!r}: expected {expected}, got {got}")
+
+    # Cached relative results must follow the reference time, not the first call
+    later = now + timedelta(days=2)
+    if parse_date("3 days ago", now=later) != later - timedelta(days=3):
+        failures += 1
+        print("MISMATCH: relative date did not move with the reference time")
+    return failures
+
+
+def main():
+    failures = check_corpus()
+    print(f"Corpus: {len(CORPUS) - failures}/{len(CORPUS)} cells as expected")
+
+    # A README has thousands of rows drawn from a few dozen distinct date cells
+    cells = [cell for cell, _ in CORPUS] * 200
+    number = 5
+    new_time = timeit.timeit(lambda: [parse_date(cell) for cell in cells], number=number)
+    old_time = timeit.timeit(lambda: [legacy_parse_date(cell) for cell in cells], number=number)
+    per_cell = lambda t: t / (number * len(cells)) * 1e6
+    print(f"parse_date:        {per_cell(new_time):8.2f} us/cell")
+    print(f"legacy_parse_date: {per_cell(old_time):8.2f} us/cell")
+    print(f"Speedup: {old_time / new_time:.1f}x  ({cache_info()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the cross-source duplicate index.
+Warms scrapers.dedup.DedupIndex with tens of thousands of historical jobs and
+times a scrape cycle that contains cross-source reposts.
+
+    python -m benchmarks.bench_dedup [--history 50000] [--cycle 1000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from data.models import JobPosting
+from scrapers.dedup import DedupIndex
+from benchmarks.fixtures import TITLES, LOCATIONS
+
+TEAMS = ["Platform", "Infrastructure", "Payments", "Ads", "Search", "Cloud", "Security", "Data", "ML", "Mobile"]
+
+
+def make_jobs(n: int, rng: random.Random):
+    now = time.time()
+    companies = [f"Company {i} Inc" for i in range(max(1, n // 20))]
+    return [
+        JobPosting(
+            title=f"{rng.choice(TITLES)} - {rng.choice(TEAMS)} ({i})",
+            company=rng.choice(companies),
+            location=rng.choice(LOCATIONS),
+            url=f"https://boards.greenhouse.io/c/jobs/{i}",
+            date_posted=now - rng.uniform(0, 20) * 86400,
+        )
+        for i in range(n)
+    ]
+
+
+def repost(job: JobPosting, rng: random.Random) -> JobPosting:
+    """The same role as another aggregator lists it"""
+    variant = rng.choice(["tracking", "title", "url"])
+    url = job.url
+    title = job.title
+    if variant == "tracking":
+        url = f"{job.url}?utm_source=Simplify&ref=Simplify"
+    elif variant == "title":
+        url = f"https://jobright.ai/jobs/info/{rng.getrandbits(64):x}"
+        title = job.title.replace("Engineering", "Engineer").replace(" - ", ", ")
+    else:
+        url = f"https://jobright.ai/jobs/info/{rng.getrandbits(64):x}"
+    return JobPosting(title=title, company=job.company.replace(" Inc", ""), location=job.location,
+                      url=url, date_posted=job.date_posted)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", type=int, default=50000)
+    parser.add_argument("--cycle", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    history = make_jobs(args.history, rng)
+    index = DedupIndex()
+
+    start = time.perf_counter()
+    index.warm(history)
+    warm_time = time.perf_counter() - start
+    print(f"Warm {len(history)} jobs: {warm_time:.2f} s ({warm_time / len(history) * 1e6:.0f} us/job)")
+
+    reposts = [repost(rng.choice(history), rng) for _ in range(args.cycle // 3)]
+    fresh = make_jobs(args.cycle - len(reposts), random.Random(99))
+    for i, job in enumerate(fresh):
+        job.url = f"https://jobs.lever.co/new/{i}"
+        job.company = f"Fresh Company {i}"
+    cycle = reposts + fresh
+    rng.shuffle(cycle)
+
+    start = time.perf_counter()
+    duplicates = sum(1 for job in cycle if index.check_and_add(job) is not None)
+    cycle_time = time.perf_counter() - start
+    print(f"Cycle of {len(cycle)} jobs: {cycle_time * 1000:.1f} ms ({cycle_time / len(cycle) * 1e6:.0f} us/job)")
+    print(f"Caught {duplicates}/{len(reposts)} reposts; stats {index.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Simulation of the sharded deployment's lease and delivery queue.
+Runs competing producers and shard workers in one process against mongomock
+(or a real MongoDB with --mongo-uri). Producers are stopped and restarted to
+force failovers, and workers drop some of their claims as if they had crashed.
+At the end every delivery must have been posted exactly once, and the lease
+must never have had two holders at the same time.
+
+    python -m benchmarks.bench_job_queue [--jobs 1000] [--producers 2] [--shards 4] [--mongo-uri mongodb://localhost:27017/]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from collections import Counter
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from data.lease import Lease
+from data.job_queue import JobQueue, delivery
+from data.models import JobPosting
+
+
+def open_database(mongo_uri: str):
+    if mongo_uri:
+        from pymongo import MongoClient
+        database = MongoClient(mongo_uri)["engjobs_bench"]
+    else:
+        import mongomock
+        database = mongomock.MongoClient()["engjobs_bench"]
+    for name in ("leases", "job_queue"):
+        database[name].drop()
+    database["job_queue"].create_index("key", unique=True)
+    return database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--channels", type=int, default=40)
+    parser.add_argument("--producers", type=int, default=2)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--crash-rate", type=float, default=0.05, help="Share of claims a worker drops without finishing")
+    parser.add_argument("--mongo-uri", default=os.getenv("BENCH_MONGO_URI", ""))
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    database = open_database(args.mongo_uri)
+    leases = [Lease("scraper", f"producer-{i}", ttl_seconds=1, collection=database["leases"]) for i in range(args.producers)]
+    # Short claims so dropped deliveries come back within the run
+    queue = JobQueue(database["job_queue"], claim_seconds=1, retry_delay_seconds=0, max_attempts=1000)
+    guilds = {channel: rng.getrandbits(40) << 22 for channel in range(args.channels)}
+
+    # Every producer emits the same jobs, as overlapping leaders would
+    jobs = [JobPosting(f"Job {i}", "Company", "Remote", f"https://example.com/{i}", datetime.now()) for i in range(args.jobs)]
+    channels = {job.url: rng.sample(range(args.channels), 2) for job in jobs}
+    batches = [jobs[i:i + 100] for i in range(0, len(jobs), 100)]
+
+    posted = Counter()
+    leader_history = []
+    crashed = set()
+    start = time.perf_counter()
+    step = 0
+    while step < len(batches) or sum(queue.depth().get(status, 0) for status in ("pending", "claimed")):
+        leaders = [lease for lease in leases if lease.holder not in crashed and lease.acquire()]
+        if len(leaders) > 1:
+            print(f"FAIL: {len(leaders)} producers hold the lease at once")
+        leader_history.append(leaders[0].holder if leaders else None)
+
+        if step < len(batches):
+            for lease in leases:
+                # Producers without the lease still emit, the queue keys must absorb the duplicates
+                deliveries = [
+                    delivery(job, channel, guilds[channel], args.shards, "software_jobs", True)
+                    for job in batches[step] for channel in channels[job.url]
+                ]
+                queue.enqueue(deliveries, lease.term)
+
+        # Kill the current leader now and then so the lease fails over after its TTL
+        if leaders and rng.random() < 0.1:
+            crashed.add(leaders[0].holder)
+        elif crashed and rng.random() < 0.3:
+            crashed.pop()
+
+        for shard in range(args.shards):
+            claimed = queue.claim(f"worker-{shard}", [shard], 50)
+            kept = [entry for entry in claimed if rng.random() >= args.crash_rate]
+            for entry in kept:
+                posted[entry["key"]] += 1
+            if kept:
+                queue.complete([entry["_id"] for entry in kept], kept[0]["claim_token"])
+        step += 1
+        if step >= len(batches):
+            time.sleep(0.2)
+
+    elapsed = time.perf_counter() - start
+    queued = database["job_queue"].count_documents({})
+    duplicates = sum(1 for count in posted.values() if count > 1)
+    failovers = sum(1 for previous, current in zip(leader_history, leader_history[1:]) if current and previous and current != previous)
+    print(f"{queued} deliveries queued, {len(posted)} posted in {elapsed:.1f} s; {failovers} lease failovers, final state {queue.depth()}")
+    if duplicates or len(posted) != queued:
+        print(f"FAIL: {duplicates} deliveries posted more than once, {queued - len(posted)} never posted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark for listings.json decoding.
+Compares a full json.loads + filter against scrapers.json_feed.decode_listings
+on a recorded listings.json (or a synthetic one), reporting time and peak memory.
+
+    python -m benchmarks.bench_json_feed [--fixture path/to/listings.json] [--rows 20000]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.json_feed import decode_listings, decoder_name
+from benchmarks.fixtures import make_listings
+
+
+def legacy_decode(body: bytes, cutoff: float):
+    """What fetch_github_json + filter_recent_jobs did before: decode everything, then filter"""
+    return [job for job in json.loads(body) if job["date_posted"] >= cutoff]
+
+
+def measure(label: str, fn, *args, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {best * 1000:8.1f} ms   peak {peak / 1e6:7.1f} MB   {len(result)} rows kept")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", help="Recorded listings.json to replay")
+    parser.add_argument("--rows", type=int, default=20000, help="Size of the synthetic feed when no fixture is given")
+    args = parser.parse_args()
+
+    if args.fixture:
+        with open(args.fixture, "rb") as f:
+            body = f.read()
+    else:
+        body = make_listings(args.rows)
+    print(f"Feed: {len(body) / 1e6:.1f} MB, decoder: {decoder_name()}")
+
+    cutoff = time.time() - 7 * 86400
+    old = measure("json.loads + filter", legacy_decode, body, cutoff)
+    new = measure(f"decode_listings ({decoder_name()})", decode_listings, body, cutoff)
+    print(f"Speedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for scrapers.parse_pool.
+Parses a batch of large listings.json (and README) bodies concurrently, once
+in threads (the workers=0 baseline) and then in process pools of increasing
+size, and reports throughput per worker count.
+
+    python -m benchmarks.bench_parse_pool [--bodies 8] [--rows 50000] [--workers 1,2,4]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.parse_pool import ParsePool, parse_records, rows_from_records
+from benchmarks.fixtures import make_listings, make_readme
+
+DAYS = 7
+
+
+def parse_in_thread(source_config, body):
+    return rows_from_records(source_config['type'], parse_records(
+        source_config['type'], source_config.get('table_format', 'default'), body, DAYS))
+
+
+async def run_batch(pool, batch):
+    if pool is None:
+        jobs = [asyncio.to_thread(parse_in_thread, config, body) for config, body in batch]
+    else:
+        jobs = [pool.aparse(config, body, DAYS) for config, body in batch]
+    return await asyncio.gather(*jobs)
+
+
+async def measure(workers, batch):
+    pool = None
+    if workers:
+        pool = ParsePool(workers, min_bytes=0)
+        pool.start()
+    try:
+        start = time.perf_counter()
+        results = await run_batch(pool, batch)
+        elapsed = time.perf_counter() - start
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return elapsed, sum(len(rows) for rows in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bodies", type=int, default=8, help="Bodies parsed concurrently per run")
+    parser.add_argument("--rows", type=int, default=50000, help="Rows per body")
+    parser.add_argument("--workers", default=",".join(str(n) for n in sorted({1, 2, 4, os.cpu_count() or 1})))
+    parser.add_argument("--markdown", action="store_true", help="Parse full README tables (no early stop) instead of listings.json")
+    args = parser.parse_args()
+
+    if args.markdown:
+        # A days window wide enough that the whole table is parsed
+        global DAYS
+        DAYS = args.rows // 100 + 2
+        batch = [({'type': 'markdown_table', 'table_format': 'jobright'}, make_readme(args.rows, seed=i)) for i in range(args.bodies)]
+    else:
+        batch = [({'type': 'json'}, make_listings(args.rows, seed=i)) for i in range(args.bodies)]
+    total_mb = sum(len(body) for _, body in batch) / 1e6
+    print(f"{args.bodies} bodies, {total_mb:.1f} MB total, {os.cpu_count()} cores")
+
+    baseline = None
+    for workers in [0] + [int(n) for n in args.workers.split(",")]:
+        elapsed, rows = asyncio.run(measure(workers, batch))
+        baseline = baseline or elapsed
+        label = "threads" if workers == 0 else f"{workers} processes"
+        print(f"{label:<14} {elapsed * 1000:8.1f} ms   {total_mb / elapsed:6.1f} MB/s   x{baseline / elapsed:.2f}   {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark.
+Replays listings.json / README fixtures through a local HTTP stub and times
+each stage: fetch, parse, filter, map, dedup, persist (mongomock or a real
+MongoDB), and embed build. It also times a cold and a warm (304) end-to-end
+JobScraper.afetch_all_jobs run. Results are written as JSON so runs can be
+compared.
+
+    python -m benchmarks.bench_pipeline [--sizes 1000,10000,100000] [--output run.json] [--compare baseline.json]
+    python -m benchmarks.bench_pipeline --record benchmarks/recorded     # save the live sources once
+    python -m benchmarks.bench_pipeline --fixtures benchmarks/recorded   # replay them instead of synthetic feeds
+
+Synthetic cases raise the destination cap and the README rows per day with
+the size, so a larger feed is parsed, mapped and deduplicated in full instead
+of stopping at the production cap. Recorded cases keep the production cap and
+are re-dated on replay, so the window covers the same rows as on the day they
+were recorded.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import re
+import tempfile
+import contextlib
+from datetime import datetime, timedelta
+
+import requests
+from aiohttp import web
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.multi_source import JobScraper
+from scrapers.dedup import DedupIndex
+from scrapers.json_feed import decoder_name
+from scrapers.resilience import CircuitBreakers
+from scrapers.selection import DEFAULT_CAP
+from scrapers.source_registry import load_sources
+from data.persistence import upsert_new_jobs
+from bot.embed_utils import create_job_embed
+from benchmarks.fixtures import make_listings, make_readme
+
+STAGES = ["fetch", "parse", "filter", "map", "dedup", "persist", "embed", "end_to_end_cold", "end_to_end_warm"]
+DAYS = 7
+# Every benchmark case is routed here, with the case's cap
+BENCH_DESTINATION = "bench"
+# "Mar 05" date cells of JobRight-style READMEs
+MONTH_DAY_RE = re.compile(r'(?<=\| )([A-Z][a-z]{2}) (\d{1,2})(?= *\|)')
+
+
+class StubServer:
+    """Serves fixture bodies from memory with an ETag, answering 304 to a matching If-None-Match"""
+
+    def __init__(self):
+        self.bodies = {}
+        self.runner = None
+        self.port = None
+
+    def add(self, name: str, body: bytes) -> str:
+        self.bodies[name] = body
+        return f"http://127.0.0.1:{self.port}/{name}"
+
+    async def _handle(self, request):
+        body = self.bodies.get(request.match_info["name"])
+        if body is None:
+            return web.Response(status=404)
+        etag = f'"{len(body)}-{hash(body) & 0xffffffff:x}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, headers={"ETag": etag})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{name}", self._handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+def open_collection(mongo_uri: str):
+    """A scratch collection on the given MongoDB, or in mongomock when no URI is given"""
+    if mongo_uri:
+        from pymongo import MongoClient
+        collection = MongoClient(mongo_uri)["engjobs_bench"]["jobs"]
+    else:
+        try:
+            import mongomock
+        except ImportError:
+            return None
+        collection = mongomock.MongoClient()["engjobs_bench"]["jobs"]
+    collection.drop()
+    collection.create_index("url", unique=True)
+    return collection
+
+
+def new_scraper(work_dir: str, sources=None, cap: int = DEFAULT_CAP) -> JobScraper:
+    """A scraper whose HTTP cache and breaker state live in a scratch directory, capping every source at cap"""
+    return JobScraper(cache_dir=os.path.join(work_dir, "http"), sources=sources or {},
+                      breakers=CircuitBreakers(os.path.join(work_dir, "breakers.json")),
+                      destinations={BENCH_DESTINATION: {"window_days": DAYS, "cap": cap}})
+
+
+def synthetic_cases(sizes):
+    """(name, source config, body, cap) per size; the cap and README density grow with the size"""
+    for n in sizes:
+        yield (f"listings-{n}", {"type": "json", "source_name": f"Bench-Listings-{n}"},
+               make_listings(n), n)
+        # Spread the rows over the window, so the parser does not stop at the cutoff after a week's worth
+        rows_per_day = max(100, -(-n // (DAYS - 1)))
+        yield (f"readme-{n}", {"type": "markdown_table", "source_name": f"Bench-README-{n}", "table_format": "jobright"},
+               make_readme(n, rows_per_day=rows_per_day), n)
+
+
+def redate(config: dict, body: bytes, seconds: float) -> bytes:
+    """Move every posting date of a recorded body forward by seconds"""
+    if config["type"] == "json":
+        rows = json.loads(body)
+        for row in rows:
+            for field in ("date_posted", "date_updated"):
+                if isinstance(row.get(field), (int, float)):
+                    row[field] += int(seconds)
+        return json.dumps(rows).encode("utf-8")
+
+    days = int(seconds // 86400)
+    if not days:
+        return body
+    # Month-day cells carry no year; any year reads both days the same way
+    year = datetime.now().year
+
+    def shift(match):
+        try:
+            posted = datetime.strptime(f"{match.group(1)} {match.group(2)} {year}", "%b %d %Y")
+        except ValueError:
+            return match.group(0)
+        return (posted + timedelta(days=days)).strftime("%b %d")
+
+    return MONTH_DAY_RE.sub(shift, body.decode("utf-8")).encode("utf-8")
+
+
+def recorded_cases(fixture_dir: str):
+    """(name, source config, body, cap) per recorded source, at the production cap"""
+    with open(os.path.join(fixture_dir, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    for key, entry in manifest.items():
+        with open(os.path.join(fixture_dir, entry["file"]), "rb") as f:
+            body = f.read()
+        config = {name: value for name, value in entry.items() if name not in ("file", "recorded_at")}
+        if entry.get("recorded_at"):
+            body = redate(config, body, time.time() - entry["recorded_at"])
+        yield key, config, body, DEFAULT_CAP
+
+
+def record(fixture_dir: str):
+    """Download every registered source once into fixture_dir, with a manifest for replay"""
+    os.makedirs(fixture_dir, exist_ok=True)
+    manifest = {}
+    for key, source_config in load_sources().items():
+        response = requests.get(source_config["url"], timeout=(5, 60))
+        response.raise_for_status()
+        file_name = f"{key}.{'json' if source_config['type'] == 'json' else 'md'}"
+        with open(os.path.join(fixture_dir, file_name), "wb") as f:
+            f.write(response.content)
+        manifest[key] = {
+            "file": file_name,
+            "type": source_config["type"],
+            "source_name": source_config["source_name"],
+            "table_format": source_config.get("table_format", "default"),
+            "recorded_at": int(time.time()),
+        }
+        print(f"Recorded {key}: {len(response.content)} bytes", file=sys.stderr)
+    with open(os.path.join(fixture_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4)
+
+
+async def run_case(server: StubServer, name: str, config: dict, body: bytes, cap: int, collection, work_dir: str) -> dict:
+    config = dict(config, url=server.add(name, body), destination=BENCH_DESTINATION)
+    scraper = new_scraper(work_dir, cap=cap)
+    stages = {}
+    counts = {}
+    # The scraper prints per-source and dedup progress; keep the report readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        session = await scraper._get_async_session()
+        async with session.get(config["url"]) as response:
+            fetched = await response.read()
+        stages["fetch"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows = scraper._parse_body(config, fetched, DAYS)
+        stages["parse"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        recent = scraper.filter_recent_jobs(rows, DAYS)
+        stages["filter"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        jobs = [scraper.map_job(row, config["source_name"]) for row in recent]
+        stages["map"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scraper.dedup_index = DedupIndex()
+        kept = scraper._dedupe_and_cap(list(jobs))
+        stages["dedup"] = time.perf_counter() - start
+
+        if collection is not None:
+            collection.delete_many({})
+            start = time.perf_counter()
+            upsert_new_jobs(collection, kept)
+            stages["persist"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for job in kept:
+            create_job_embed(job)
+        stages["embed"] = time.perf_counter() - start
+        await scraper.aclose()
+
+        # Streaming fetch + parse + filter + map + dedup as the bot runs it, then again revalidated
+        pipeline = new_scraper(os.path.join(work_dir, name), sources={name: config}, cap=cap)
+        for stage in ("end_to_end_cold", "end_to_end_warm"):
+            start = time.perf_counter()
+            await pipeline.afetch_all_jobs(days=DAYS, timeout=600)
+            stages[stage] = time.perf_counter() - start
+        await pipeline.aclose()
+
+    counts.update(body_bytes=len(body), rows_parsed=len(rows), rows_recent=len(recent), jobs_kept=len(kept))
+    return {"stages": stages, **counts}
+
+
+async def run(cases, repeat: int, mongo_uri: str) -> list:
+    server = StubServer()
+    await server.start()
+    collection = open_collection(mongo_uri)
+    if collection is None:
+        print("mongomock is not installed and no --mongo-uri given, skipping the persist stage", file=sys.stderr)
+    results = []
+    try:
+        for name, config, body, cap in cases:
+            best = None
+            for attempt in range(repeat):
+                with tempfile.TemporaryDirectory() as work_dir:
+                    result = await run_case(server, name, config, body, cap, collection, work_dir)
+                if best is None:
+                    best = result
+                else:
+                    best["stages"] = {stage: min(seconds, result["stages"][stage]) for stage, seconds in best["stages"].items()}
+            results.append({"name": name, "type": config["type"], **best})
+            stage_text = "  ".join(f"{stage} {seconds * 1000:.1f}" for stage, seconds in best["stages"].items())
+            print(f"{name:<22} {best['rows_parsed']:>7} rows  {stage_text} (ms)", file=sys.stderr)
+    finally:
+        await server.stop()
+    return results
+
+
+def compare(results: list, baseline_path: str):
+    """Print per-stage time ratios against an earlier run (>1 means slower now)"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {case["name"]: case for case in json.load(f)["cases"]}
+    for case in results:
+        previous = baseline.get(case["name"])
+        if previous is None:
+            continue
+        ratios = "  ".join(
+            f"{stage} x{seconds / previous['stages'][stage]:.2f}"
+            for stage, seconds in case["stages"].items()
+            if previous["stages"].get(stage)
+        )
+        print(f"{case['name']:<22} {ratios}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Synthetic feed sizes, comma separated")
+    parser.add_argument("--fixtures", help="Replay recorded fixtures from this directory instead of synthetic feeds")
+    parser.add_argument("--record", help="Record the live sources into this directory and exit")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, the fastest time per stage is kept")
+    parser.add_argument("--mongo-uri", default=os.getenv("BENCH_MONGO_URI", ""), help="Persist into this MongoDB instead of mongomock")
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout")
+    parser.add_argument("--compare", help="Earlier JSON results to compare against")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+
+    if args.fixtures:
+        cases = list(recorded_cases(args.fixtures))
+    else:
+        cases = list(synthetic_cases(int(size) for size in args.sizes.split(",")))
+
+    results = asyncio.run(run(cases, args.repeat, args.mongo_uri))
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "json_decoder": decoder_name(),
+        "persist_backend": "mongodb" if args.mongo_uri else "mongomock",
+        "stages": STAGES,
+        "cases": results,
+    }
+    if args.compare:
+        compare(results, args.compare)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
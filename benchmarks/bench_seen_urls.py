@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the seen-URL filter.
+Fills data.seen_urls.SeenURLs with stored URLs, checks the measured Bloom
+false-positive rate against the configured one, times lookups for a cycle
+where most jobs are already stored, and round-trips the on-disk snapshot.
+
+    python -m benchmarks.bench_seen_urls [--stored 100000] [--probes 200000] [--error-rate 0.001]
+"""
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from data.seen_urls import SeenURLs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stored", type=int, default=100000)
+    parser.add_argument("--probes", type=int, default=200000)
+    parser.add_argument("--error-rate", type=float, default=0.001)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "seen_urls.bin")
+    seen = SeenURLs(path=path, capacity=args.stored, error_rate=args.error_rate)
+
+    stored = [f"https://boards.greenhouse.io/c/jobs/{i}" for i in range(args.stored)]
+    start = time.perf_counter()
+    seen.mark_stored(stored, len(stored))
+    fill_time = time.perf_counter() - start
+    print(f"Added {len(stored)} URLs: {fill_time:.2f} s; bloom {seen.bloom.bits // 8 // 1024} KiB, k={seen.bloom.hashes}")
+
+    # Nothing here was stored, so every Bloom positive is a false positive
+    start = time.perf_counter()
+    for i in range(args.probes):
+        seen.is_known(f"https://jobs.lever.co/new/{i}")
+    probe_time = time.perf_counter() - start
+    measured = seen.stats["false_positives"] / args.probes
+    expected = seen.bloom.expected_error_rate(len(seen))
+    print(f"False-positive rate: measured {measured:.5f}, expected {expected:.5f}, configured {args.error_rate}")
+    print(f"Unseen lookups: {probe_time / args.probes * 1e6:.2f} us/url")
+    if measured > args.error_rate * 2:
+        print("FAIL: false-positive rate is more than twice the configured rate")
+
+    # A typical cycle: most scraped jobs are already stored
+    cycle = stored[:900] + [f"https://jobright.ai/jobs/info/{i}" for i in range(100)]
+    seen.stats = {"hits": 0, "misses": 0, "false_positives": 0}
+    start = time.perf_counter()
+    new_urls = [url for url in cycle if not seen.is_known(url)]
+    cycle_time = time.perf_counter() - start
+    print(f"Cycle of {len(cycle)}: {len(new_urls)} sent to Mongo in {cycle_time * 1000:.2f} ms; stats {seen.stats}")
+
+    start = time.perf_counter()
+    seen.save()
+    restored = SeenURLs(path=path)
+    loaded = restored.load()
+    restore_time = time.perf_counter() - start
+    ok = loaded and restored.exact == seen.exact and restored.bloom.array == seen.bloom.array
+    print(f"Snapshot {os.path.getsize(path) // 1024} KiB saved and loaded in {restore_time * 1000:.1f} ms: {'ok' if ok else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
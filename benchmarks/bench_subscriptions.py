@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the guild subscription matcher.
+Compiles a bot.subscriptions.SubscriptionIndex over random subscriptions,
+checks every match against a plain per-subscription scan, and times both.
+
+    python -m benchmarks.bench_subscriptions [--subscriptions 5000] [--jobs 1000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from data.models import JobPosting
+from data.subscriptions import Subscription
+from bot.subscriptions import SubscriptionIndex, tokenize, normalize_company
+
+COMPANIES = [f"Company {i}" for i in range(300)]
+CITIES = ["New York, NY", "San Francisco, CA", "Seattle, WA", "Austin, TX", "Remote", "Boston, MA", "Chicago, IL"]
+WORDS = ["software", "backend", "frontend", "data", "machine learning", "security", "mobile", "embedded", "cloud"]
+
+
+def random_subscription(rng: random.Random, i: int) -> Subscription:
+    return Subscription(
+        guild_id=i // 3, channel_id=i,
+        role_types=rng.sample(["Internship", "New Grad"], rng.choice([0, 1, 1])),
+        locations=[rng.choice(CITIES).split(",")[0]] if rng.random() < 0.5 else [],
+        companies=rng.sample(COMPANIES, 3) if rng.random() < 0.2 else [],
+        exclude_companies=rng.sample(COMPANIES, 2) if rng.random() < 0.2 else [],
+        keywords=[rng.choice(WORDS)] if rng.random() < 0.4 else [],
+    )
+
+
+def random_job(rng: random.Random, i: int) -> JobPosting:
+    return JobPosting(
+        title=f"{rng.choice(WORDS).title()} Engineer Intern",
+        company=rng.choice(COMPANIES),
+        location=rng.choice(CITIES),
+        url=f"https://example.com/jobs/{i}",
+        date_posted=datetime.now(),
+        role_type=rng.choice(["Internship", "New Grad"]),
+    )
+
+
+def _contains(text: str, phrase: str) -> bool:
+    tokens, wanted = tokenize(text), tokenize(phrase)
+    return any(tokens[i:i + len(wanted)] == wanted for i in range(len(tokens)))
+
+
+def scan_matches(subscriptions, job: JobPosting):
+    """Reference: test every subscription's filters one by one"""
+    company = normalize_company(job.company)
+    matched = set()
+    for i, s in enumerate(subscriptions):
+        if s.role_types and job.role_type not in s.role_types:
+            continue
+        if s.companies and company not in {normalize_company(c) for c in s.companies}:
+            continue
+        if company in {normalize_company(c) for c in s.exclude_companies}:
+            continue
+        if s.locations and not any(_contains(job.location, location) for location in s.locations):
+            continue
+        if s.keywords and not any(_contains(job.title, keyword) for keyword in s.keywords):
+            continue
+        matched.add(i)
+    return matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscriptions", type=int, default=5000)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    subscriptions = [random_subscription(rng, i) for i in range(args.subscriptions)]
+    jobs = [random_job(rng, i) for i in range(args.jobs)]
+
+    start = time.perf_counter()
+    index = SubscriptionIndex(subscriptions)
+    print(f"Compiled {len(index)} subscriptions in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    indexed = [index.match_ids(job) for job in jobs]
+    index_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scanned = [scan_matches(subscriptions, job) for job in jobs]
+    scan_time = time.perf_counter() - start
+
+    deliveries = sum(len(matched) for matched in indexed)
+    print(f"Indexed: {index_time / args.jobs * 1e6:.0f} us/job, scan: {scan_time / args.jobs * 1e6:.0f} us/job "
+          f"({scan_time / index_time:.1f}x), {deliveries / args.jobs:.0f} matches/job")
+    if indexed != scanned:
+        mismatches = sum(1 for a, b in zip(indexed, scanned) if a != b)
+        print(f"FAIL: {mismatches} jobs matched differently from the scan")
+
+
+if __name__ == "__main__":
+    main()
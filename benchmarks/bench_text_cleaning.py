@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for table cell cleaning.
+Checks scrapers.text_cleaning against the previous BeautifulSoup-based cleaner
+on a golden corpus of README cells, then times both.
+
+    python -m benchmarks.bench_text_cleaning
+"""
+import os
+import re
+import sys
+import timeit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.text_cleaning import clean_text
+
+# Company and position cells as they appear in the JobRight and SimplifyJobs READMEs
+GOLDEN_CELLS = [
+    "**[Google](https://www.google.com)**",
+    "**[Software Engineering Intern, BS, Summer 2026](https://jobright.ai/jobs/info/686b3f1a?utm_campaign=Software%20Engineer%20Internship&utm_source=1&utm_medium=github)**",
+    "↳",
+    "**[AT&T Inc](https://www.att.com)**",
+    "**[Procter & Gamble](https://us.pg.com)**",
+    "<strong><a href=\"https://simplify.jobs/c/Stripe\">Stripe</a></strong>",
+    "<a href=\"https://boards.greenhouse.io/x\"><img src=\"https://i.imgur.com/u1KNU8z.png\" width=\"118\" alt=\"Apply\"></a>",
+    "Machine Learning Engineer Intern 🎓",
+    "Backend Engineer Intern <br> Summer 2026",
+    "SWE Intern &amp; Data Platform",
+    "`Quant` Researcher _Intern_ #1",
+    "[Jane Street](https://www.janestreet.com) - Trading",
+    "Hardware Engineering Intern – Silicon (Fall 2026)",
+    "Co-op&nbsp;Software Developer",
+    "<details><summary>**5 locations**</summary>San Francisco, CA</br>New York, NY</br>Seattle, WA</details>",
+    "",
+    "   ",
+]
+
+
+def legacy_clean_text(text: str) -> str:
+    """The cleaner this module replaced, kept here as the reference implementation"""
+    from bs4 import BeautifulSoup
+    text = BeautifulSoup(text, "html.parser").get_text(separator=", ")
+    if not text:
+        return ""
+    cleaned = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
+    cleaned = re.sub(r'[*_`#]', '', cleaned)
+    return cleaned.strip()
+
+
+def main():
+    try:
+        import bs4  # noqa: F401
+    except ImportError:
+        print("beautifulsoup4 is not installed, only timing the new cleaner")
+        bs4 = None
+
+    if bs4 is not None:
+        mismatches = [
+            (cell, legacy_clean_text(cell), clean_text(cell))
+            for cell in GOLDEN_CELLS
+            if legacy_clean_text(cell) != clean_text(cell)
+        ]
+        for cell, expected, got in mismatches:
+            print(f"MISMATCH {cell!r}: expected {expected!r}, got {got!r}")
+        print(f"Golden corpus: {len(GOLDEN_CELLS) - len(mismatches)}/{len(GOLDEN_CELLS)} cells match")
+
+    number = 200
+    new_time = timeit.timeit(lambda: [clean_text(cell) for cell in GOLDEN_CELLS], number=number)
+    per_cell = new_time / (number * len(GOLDEN_CELLS)) * 1e6
+    print(f"clean_text:        {per_cell:8.2f} us/cell")
+
+    if bs4 is not None:
+        old_time = timeit.timeit(lambda: [legacy_clean_text(cell) for cell in GOLDEN_CELLS], number=number)
+        old_per_cell = old_time / (number * len(GOLDEN_CELLS)) * 1e6
+        print(f"legacy_clean_text: {old_per_cell:8.2f} us/cell")
+        print(f"Speedup: {old_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Synthetic source fixtures shaped like the SimplifyJobs/vanshb listings.json and JobRight READMEs"""
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+COMPANIES = [
+    "Google", "Meta", "Amazon", "Microsoft", "Apple", "Stripe", "Jane Street", "Citadel",
+    "Databricks", "Snowflake", "NVIDIA", "AT&T", "Procter & Gamble", "Two Sigma", "Palantir",
+    "Robinhood", "Airbnb", "Uber", "Lyft", "Pinterest", "Salesforce", "Adobe", "IBM", "Intel",
+]
+TITLES = [
+    "Software Engineering Intern", "Software Engineer Intern, Summer 2026", "Backend Engineer Intern",
+    "Machine Learning Engineer Intern", "Data Engineering Intern", "Quantitative Developer Intern",
+    "Hardware Engineering Intern", "Product Manager Intern", "New Grad Software Engineer",
+    "Site Reliability Engineer Intern", "Frontend Engineer Intern - Fall 2026",
+]
+LOCATIONS = ["New York, NY", "San Francisco, CA", "Seattle, WA", "Austin, TX", "Remote", "Chicago, IL"]
+
+
+def make_listings(n: int, recent_fraction: float = 0.05, seed: int = 7) -> bytes:
+    """A listings.json body with n entries, newest recent_fraction of them inside the last week"""
+    rng = random.Random(seed)
+    now = int(time.time())
+    entries = []
+    for i in range(n):
+        recent = rng.random() < recent_fraction
+        age_days = rng.uniform(0, 6.5) if recent else rng.uniform(8, 400)
+        company = rng.choice(COMPANIES)
+        entries.append({
+            "source": "Simplify",
+            "company_name": company,
+            "id": f"{i:08x}-0000-4000-8000-{i:012x}",
+            "title": rng.choice(TITLES),
+            "active": rng.random() > 0.3,
+            "terms": ["Summer 2026"],
+            "date_updated": now - int(age_days * 86400) + 3600,
+            "url": f"https://boards.greenhouse.io/{company.lower().replace(' ', '')}/jobs/{i}?utm_source=Simplify&ref=Simplify",
+            "locations": rng.sample(LOCATIONS, rng.randint(1, 3)),
+            "season": "Summer",
+            "company_url": f"https://simplify.jobs/c/{company.replace(' ', '-')}",
+            "date_posted": now - int(age_days * 86400),
+            "is_visible": rng.random() > 0.05,
+            "sponsorship": "Offers Sponsorship",
+            "degrees": ["Bachelor's", "Master's"],
+            "category": "Software Engineering",
+        })
+    return json.dumps(entries).encode("utf-8")
+
+
+def make_readme(n: int, seed: int = 7, rows_per_day: int = 100) -> bytes:
+    """A JobRight README body with n rows, newest first, rows_per_day rows per day"""
+    rng = random.Random(seed)
+    lines = [
+        "# 2026 Software Engineer Internship",
+        "",
+        "| Company | Job Title | Location | Work Model | Date Posted |",
+        "| ----- | --------- | --------- | ---- | ------- |",
+    ]
+    today = datetime.now()
+    previous_company = None
+    for i in range(n):
+        company = rng.choice(COMPANIES)
+        company_cell = "↳" if company == previous_company else f"**[{company}](https://www.{company.lower().replace(' ', '')}.com)**"
+        previous_company = company
+        posted = (today - timedelta(days=i // rows_per_day)).strftime("%b %d")
+        lines.append(
+            f"| {company_cell} | **[{rng.choice(TITLES)}](https://jobright.ai/jobs/info/{i:024x}?utm_campaign=github)** "
+            f"| {rng.choice(LOCATIONS)} | {rng.choice(['On Site', 'Hybrid', 'Remote'])} | {posted} |"
+        )
+    return "\n".join(lines).encode("utf-8")
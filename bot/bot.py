@@ -7,7 +7,7 @@ import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from bot.embed_utils import create_job_embed, create_error_embed, create_success_embed
+from bot.embed_utils import create_job_embed, create_compact_job_embed, create_error_embed, create_success_embed, COMPACT_EMBED_THRESHOLD
 from datetime import datetime
 
 
@@ -17,138 +17,292 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
 from scrapers.multi_source import JobScraper
-from data.db import get_software_jobs_collection, get_engineering_jobs_collection, ensure_indexes, get_newgrad_engineering_jobs_collection, get_newgrad_software_jobs_collection
+from scrapers.snapshot import RowSnapshot
+from scrapers.source_registry import SourceSchedule, load_destinations
+from data.db import ensure_indexes, close_clients
+from data.persistence import store_new_jobs, mark_posted
+from data.seen_urls import SeenURLs
+from bot.send_queue import SendDispatcher
+from bot.repost import resume_pending
+from bot.routing import RoutingTable
+from bot.producer import warm_scraper_state
+from bot.subscriptions import SubscriptionIndex
+from data.subscriptions import load_subscriptions
+from monitoring.metrics import CYCLE_SECONDS, JOBS_POSTED, start_http_server
 from bot.commands import setup_commands
 
 # Load environment variables
 load_dotenv(dotenv_path="config/.env")
 TOKEN = os.getenv("BOT_TOKEN")
-SOFTWARE_INTERN_CHANNEL_ID = int(os.getenv("SOFTWARE_INTERN_CHANNEL_ID", ""))
-ENGINEER_INTERN_CHANNEL_ID = int(os.getenv("ENGINEER_INTERN_CHANNEL_ID", ""))
-SOFTWARE_NEWGRAD_CHANNEL_ID = int(os.getenv("SOFTWARE_NEWGRAD_CHANNEL_ID", ""))
-ENGINEERING_NEWGRAD_CHANNEL_ID = int(os.getenv("ENGINEERING_NEWGRAD_CHANNEL_ID", ""))
+
+# Cycle summaries and errors are posted to this destination's channel
+STATUS_DESTINATION = "software_internship"
 
 # Bot setup
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
-scheduler = AsyncIOScheduler()
 
-async def fetch_and_post_new_jobs():
-    """Fetch new jobs and post to appropriate channels using embeds"""
-    software_channel = bot.get_channel(SOFTWARE_INTERN_CHANNEL_ID)
-    engineer_channel = bot.get_channel(ENGINEER_INTERN_CHANNEL_ID)
-    newgrad_swe_channel = bot.get_channel(SOFTWARE_NEWGRAD_CHANNEL_ID)
-    newgrad_eng_channel = bot.get_channel(ENGINEERING_NEWGRAD_CHANNEL_ID)
+# How often the scheduler checks which sources are due
+SCHEDULER_TICK_SECONDS = int(os.getenv("SCHEDULER_TICK_SECONDS", "60"))
 
-    if not software_channel or not engineer_channel:
-        print("Error: Could not find one or more channels")
-        return
 
-    posted_count = 0
-    scraper = JobScraper()
-    
-    try:
-        print("Fetching all jobs (7-day window, capped to 300) using multithreaded scraping...")
-        start_time = time.time()
-        all_jobs = scraper.fetch_all_jobs(days=7, max_workers=5)
-        end_time = time.time()
-        print(f"⚡ Scraping completed in {end_time - start_time:.2f} seconds")
-        
-        # Send a summary to the first channel if jobs are found
-        if all_jobs:
-            summary_embed = discord.Embed(
-                title="Automated Job Update",
-                description=f"Found {len(all_jobs)} jobs to process",
-                color=0x3498db,
-                timestamp=datetime.now()
-            )
-            summary_embed.set_footer(text="Jobs will be posted to appropriate channels")
-            await software_channel.send(embed=summary_embed)
-        
-        for job in all_jobs:
-            # Pick collection & channel by role_type + source
-            if job["role_type"] == "New Grad":
-                if "Engineering" in job["source"] or "Product" in job["source"]:
-                    collection = get_newgrad_engineering_jobs_collection()
-                    channel = bot.get_channel(ENGINEERING_NEWGRAD_CHANNEL_ID)
-                else:
-                    collection = get_newgrad_software_jobs_collection()
-                    channel = bot.get_channel(SOFTWARE_NEWGRAD_CHANNEL_ID)
+class JobBot(commands.Bot):
+    """Bot that owns the shared job scraper and send queues, and releases them and the MongoDB pool on close"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Kept for the lifetime of the bot so unchanged sources are not re-parsed every cycle,
+        # and only rows that changed since the last stored cycle are emitted
+        self.scraper = JobScraper(snapshot=RowSnapshot())
+        # Each source is polled on its own adaptive interval
+        self.source_schedule = SourceSchedule(self.scraper.sources)
+        self.send_dispatcher = SendDispatcher()
+        # URLs already stored in MongoDB, checked before any database I/O
+        self.seen_urls = SeenURLs()
+        # (source, role type) -> collection and channel, built once the channels are visible in on_ready
+        self.routes = None
+        # Guild channels subscribed to jobs, compiled for matching
+        self.subscriptions = SubscriptionIndex()
+        self.metrics_runner = None
+        # Held for a whole fetch cycle, so the scheduler tick and !fetchnewjobs never interleave
+        self.fetch_lock = None
+        # Set by the first on_ready; later ones come from reconnects
+        self._started = False
+
+    async def setup_hook(self):
+        # Fork the parse workers while the process is still single-threaded
+        self.scraper.parse_pool.start()
+        # Created here so it belongs to the running loop
+        self.fetch_lock = asyncio.Lock()
+        # Prometheus endpoint, started once per process rather than on every on_ready
+        self.metrics_runner = await start_http_server()
+
+    async def reload_subscriptions(self):
+        """Recompile the subscription index from MongoDB"""
+        subscriptions = await asyncio.to_thread(lambda: list(load_subscriptions()))
+        self.subscriptions = SubscriptionIndex(subscriptions)
+        print(f"Loaded {len(self.subscriptions)} guild subscription(s)")
+
+    async def deliver_to_subscribers(self, jobs, exclude_channel=None):
+        """
+        Send jobs to every subscribed channel whose filters match them.
+        Returns:
+            set: URLs delivered to at least one subscribed channel
+        """
+        if not jobs or not len(self.subscriptions):
+            return set()
+        by_channel = self.subscriptions.group(jobs)
+        if exclude_channel is not None:
+            by_channel.pop(exclude_channel.id, None)
+
+        sends = []
+        for channel_id, channel_jobs in by_channel.items():
+            channel = self.get_channel(channel_id)
+            if channel is None:
+                print(f"Subscribed channel {channel_id} is not visible to the bot, skipping")
+                continue
+            build_embed = create_compact_job_embed if len(channel_jobs) > COMPACT_EMBED_THRESHOLD else create_job_embed
+            sends.append((channel_jobs, self.send_dispatcher.send_all(channel, [build_embed(job) for job in channel_jobs])))
+
+        # Every channel has its own queue and all of them share the bot-wide budget
+        results = await asyncio.gather(*[send for _, send in sends])
+        delivered = set()
+        for (channel_jobs, _), flags in zip(sends, results):
+            delivered.update(job.url for job, ok in zip(channel_jobs, flags) if ok)
+        return delivered
+
+    async def post_new_jobs(self, collection, channel, jobs):
+        """
+        Store jobs and post the ones that were new to the destination's channel
+        and to every matching guild subscription.
+        Args:
+            channel: Home channel of the destination, or None when it only serves subscriptions
+        Returns:
+            list: Jobs that were inserted and delivered
+        """
+        # Insert only unseen URLs and get back exactly which ones were new, off the event loop
+        new_jobs = await asyncio.to_thread(store_new_jobs, collection, jobs, self.seen_urls)
+        if not new_jobs:
+            return []
+
+        build_embed = create_compact_job_embed if len(new_jobs) > COMPACT_EMBED_THRESHOLD else create_job_embed
+        home_send = self.send_dispatcher.send_all(channel, [build_embed(job) for job in new_jobs]) if channel else asyncio.sleep(0, [])
+        delivered, subscribed_urls = await asyncio.gather(home_send, self.deliver_to_subscribers(new_jobs, channel))
+        if channel is None:
+            posted_jobs = [job for job in new_jobs if job.url in subscribed_urls]
+        else:
+            posted_jobs = [job for job, ok in zip(new_jobs, delivered) if ok]
+        JOBS_POSTED.inc(len(posted_jobs), collection=collection.name)
+
+        # Update posted status for everything that actually went out
+        await asyncio.to_thread(mark_posted, collection, [job.url for job in posted_jobs])
+        return posted_jobs
+
+    async def fetch_and_post_new_jobs(self, source_keys=None):
+        """
+        Run one fetch cycle for !fetchnewjobs, after any cycle already running.
+        Returns:
+            list: Jobs posted in this cycle
+        """
+        async with self.fetch_lock:
+            return await self.run_fetch_cycle(source_keys)
+
+    async def run_fetch_cycle(self, source_keys=None):
+        """
+        Fetch new jobs from the given sources (all by default) and post to appropriate channels using embeds.
+        The caller holds fetch_lock, since cycles share the scraper's snapshot delta and source_changes.
+        Returns:
+            list: Jobs posted in this cycle
+        Raises:
+            Exception: Whatever failed the cycle, once it has been reported to the status channel
+        """
+        status_route = self.routes.get(STATUS_DESTINATION)
+        status_channel = status_route.channel if status_route else None
+        for route in self.routes.missing_channels():
+            print(f"Error: Could not find the channel for {route.name}, its jobs are held until it is configured")
+
+        posted_jobs = []
+
+        try:
+            print("Fetching jobs (per-destination window and cap) using async scraping...")
+            start_time = time.time()
+            all_jobs = await self.scraper.afetch_all_jobs(max_concurrency=5, source_keys=source_keys)
+            end_time = time.time()
+            CYCLE_SECONDS.observe(end_time - start_time)
+            print(f"⚡ Scraping completed in {end_time - start_time:.2f} seconds")
+            
+            # Send a summary to the first channel if jobs are found
+            if all_jobs:
+                summary_embed = discord.Embed(
+                    title="Automated Job Update",
+                    description=f"Found {len(all_jobs)} jobs to process",
+                    color=0x3498db,
+                    timestamp=datetime.now()
+                )
+                summary_embed.set_footer(text="Jobs will be posted to appropriate channels")
+                if status_channel:
+                    await status_channel.send(embed=summary_embed)
+
+            # Group jobs by destination so each collection gets one bulk write
+            batches, unrouted = self.routes.group(all_jobs)
+
+            # Each channel has its own send queue, so destinations are posted concurrently
+            results = await asyncio.gather(*[
+                self.post_new_jobs(route.collection, route.channel, jobs)
+                for route, jobs in batches.values()
+            ])
+            for route_posted in results:
+                posted_jobs.extend(route_posted)
+            if unrouted:
+                # Emit the held jobs again next cycle, once their channel is back
+                self.scraper.snapshot.discard({job.source for job in unrouted})
+            # Every other source's delta is stored now, so the next cycle can skip it
+            await asyncio.to_thread(self.scraper.snapshot.commit)
+            await asyncio.to_thread(self.seen_urls.save)
+            print(f"Seen URL filter: {len(self.seen_urls)} URLs, {self.seen_urls.stats}")
+
+            if posted_jobs:
+                print(f"Posted {len(posted_jobs)} new job(s) with embeds")
+                for channel_id, stats in self.send_dispatcher.stats().items():
+                    print(f"Send queue {channel_id}: {stats}")
             else:
-                if "Engineering" in job["source"] or "Product-Management" in job["source"]:
-                    collection = get_engineering_jobs_collection()
-                    channel = bot.get_channel(ENGINEER_INTERN_CHANNEL_ID)
-                else:
-                    collection = get_software_jobs_collection()
-                    channel = bot.get_channel(SOFTWARE_INTERN_CHANNEL_ID)
-
-            # Check if job already exists
-            exists = collection.find_one({"url": job["url"]})
-            if not exists:
-                # Insert into database
-                result = collection.insert_one(job)
-                job_id = result.inserted_id
-
-                # Create and send job embed
-                job_embed = create_job_embed(job)
-                await channel.send(embed=job_embed)
-
-                # Update posted status
-                collection.update_one(
-                    {"_id": job_id},
-                    {"$set": {"posted_to_discord": True}}
+                print("No new jobs to post")
+
+        except Exception as e:
+            # Emit the same delta again next cycle
+            self.scraper.snapshot.discard()
+            error_msg = f"ERROR fetching jobs: {str(e)}"
+            print(error_msg)
+            
+            # Send error embed to the status channel
+            if status_channel:
+                error_embed = discord.Embed(
+                    title="Automated Job Fetch Error",
+                    description=error_msg,
+                    color=0xff0000,
+                    timestamp=datetime.now()
                 )
-                posted_count += 1
+                error_embed.set_footer(text="Please check the bot logs for more details")
+                await status_channel.send(embed=error_embed)
+            raise
 
-        if posted_count > 0:
-            print(f"Posted {posted_count} new job(s) with embeds")
-        else:
-            print("No new jobs to post")
+        return posted_jobs
 
-    except Exception as e:
-        error_msg = f"ERROR fetching jobs: {str(e)}"
-        print(error_msg)
-        
-        # Send error embed to software channel
-        if software_channel:
-            error_embed = discord.Embed(
-                title="Automated Job Fetch Error",
-                description=error_msg,
-                color=0xff0000,
-                timestamp=datetime.now()
-            )
-            error_embed.set_footer(text="Please check the bot logs for more details")
-            await software_channel.send(embed=error_embed)
+    async def close(self):
+        await self.scraper.aclose()
+        await self.send_dispatcher.close()
+        close_clients()
+        if self.metrics_runner is not None:
+            await self.metrics_runner.cleanup()
+        await super().close()
+
+
+bot = JobBot(command_prefix="!", intents=intents)
+scheduler = AsyncIOScheduler()
+
+async def poll_due_sources():
+    """Scheduler tick: fetch and post only the sources whose polling interval has elapsed"""
+    due = bot.source_schedule.due()
+    if not due:
+        return
+    async with bot.fetch_lock:
+        bot.scraper.source_changes = {}
+        try:
+            await bot.run_fetch_cycle(due)
+        except Exception:
+            # Already logged and reported to the status channel. A failed poll says nothing
+            # about whether the sources changed, so they stay due and are retried next tick
+            return
+        for key in due:
+            bot.source_schedule.record(key, bot.scraper.source_changes.get(key, False))
+    bot.source_schedule.save()
+    print(f"Source intervals (minutes): {bot.source_schedule.summary()}")
 
 
 @bot.event
 async def on_ready():
     """Bot startup event"""
     print(f"Logged in as {bot.user}")
-    print(f"Software Channel ID: {SOFTWARE_INTERN_CHANNEL_ID}")
-    print(f"Engineer Channel ID: {ENGINEER_INTERN_CHANNEL_ID}")
-    print(f"Software New Grad Channel ID: {SOFTWARE_NEWGRAD_CHANNEL_ID}")
-    print(f"Engineer New Grad Channel ID: {ENGINEERING_NEWGRAD_CHANNEL_ID}")
-    
+
+    # Resolve every destination's collection and channel, again after a reconnect in case channels changed
+    bot.routes = RoutingTable(bot.scraper.sources, load_destinations(), bot.get_channel)
+    for route in bot.routes.routes.values():
+        print(f"{route.name}: collection {route.collection.name}, channel {route.channel_id or 'none (subscriptions only)'}")
+
+    # on_ready fires after every reconnect; commands, the scheduler and resumed reposts are set up once
+    if bot._started:
+        return
+    bot._started = True
+
     # Ensure MongoDB indexes
     ensure_indexes()
-    
+
+    # Seed the duplicate index and the seen-URL filter with what is already stored
+    await warm_scraper_state(bot.scraper, bot.seen_urls)
+
+    # Guild subscriptions are matched against every new job
+    await bot.reload_subscriptions()
+
     # Set up commands
     setup_commands(bot)
+
+    # Pick up !postalljobs runs that a restart interrupted
+    resumed = await resume_pending(bot)
+    if resumed:
+        print(f"Resumed {resumed} interrupted job repost(s)")
     
-    # Schedule job fetching every hour
+    # Check for due sources every tick, each source keeps its own interval
     scheduler.add_job(
-        fetch_and_post_new_jobs,
+        poll_due_sources,
         'interval',
-        hours=0.5,
+        seconds=SCHEDULER_TICK_SECONDS,
         id='job_fetcher'
     )
     scheduler.start()
-    print("Scheduler started - checking for new jobs every hour")
+    print(f"Scheduler started - checking for due sources every {SCHEDULER_TICK_SECONDS} seconds")
     
     # Run initial job fetch
-    await fetch_and_post_new_jobs()
+    await poll_due_sources()
 
 def main():
     if not TOKEN:
@@ -1,84 +1,44 @@
 import os
+import re
 import sys
 import asyncio
 import discord
 from discord.ext import commands
+from datetime import datetime
 
 # Ensure absolute imports work
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
-from data.db import get_software_jobs_collection, get_engineering_jobs_collection, get_newgrad_software_jobs_collection, get_newgrad_engineering_jobs_collection
-from scrapers.multi_source import JobScraper
-
-# Define your Discord channel IDs
-ENGINEER_CHANNEL_ID = 
-SOFTWARE_CHANNEL_ID = 
-SOFTWARE_NEWGRAD_CHANNEL_ID = 
-ENGINEERING_NEWGRAD_CHANNEL_ID = 
+from data.db import get_job_collections
+from data.models import to_utc
+from data.queries import find_jobs, cursor_for_page, PAGE_SIZE
+from scrapers.date_parsing import parse_date
+from data.subscriptions import Subscription, save_subscription, delete_subscription
+from bot.repost import RepostEngine, is_running
+from bot.embed_utils import create_compact_job_embed, create_stats_embed, create_error_embed, create_success_embed, EMBED_CACHE
 
 @commands.command(name='postalljobs')
-async def postalljobs(ctx):
-    """Post all jobs from both databases using embeds"""
-    software_collection = get_software_jobs_collection()
-    engineering_collection = get_engineering_jobs_collection()
-    newgrad_swe_channel = get_newgrad_software_jobs_collection()
-    newgrad_eng_channel = get_newgrad_engineering_jobs_collection()
-
-    # Combine jobs from all collections
-    software_jobs = list(software_collection.find({}).sort("date_posted", 1))
-    engineering_jobs = list(engineering_collection.find({}).sort("date_posted", 1))
-    newgrad_software_jobs = list(newgrad_swe_channel.find({}).sort("date_posted", 1))
-    newgrad_engineering_jobs = list(newgrad_eng_channel.find({}).sort("date_posted", 1))
-
-    all_jobs = software_jobs + engineering_jobs + newgrad_software_jobs + newgrad_engineering_jobs
-    all_jobs.sort(key=lambda x: x['date_posted'])
-
-    if not all_jobs:
+async def postalljobs(ctx, option: str = ""):
+    """Post every stored job not posted yet, oldest first; resumes an interrupted run ("!postalljobs restart" starts over)"""
+    if is_running(ctx.channel.id):
+        await ctx.send(embed=create_error_embed("Already Running", "Jobs are already being posted in this channel.", "warning"))
+        return
+
+    engine = RepostEngine(ctx.bot, ctx.channel)
+    if option.lower() == "restart":
+        await asyncio.to_thread(engine.clear_checkpoint)
+
+    checkpoint = await engine.run()
+    if not checkpoint["total"]:
         # Create an embed for "no jobs found"
         embed = discord.Embed(
             title="No Jobs Found",
-            description="There are currently no job postings available.",
+            description="Every stored job has already been posted.",
             color=0xff6b6b
         )
         embed.set_footer(text="Try again later or check back soon!")
         await ctx.send(embed=embed)
-        return
-
-    # Send summary embed first
-    summary_embed = discord.Embed(
-        title="Job Posting Summary",
-        description=f"Posting **{len(all_jobs)}** jobs (oldest first)",
-        color=0x00d2d3,
-        timestamp=datetime.now()
-    )
-    summary_embed.add_field(
-        name="Breakdown",
-        value=f"Software: {len(software_jobs)}\n"
-              f"Engineering: {len(engineering_jobs)}\n"
-              f"New Grad SWE: {len(newgrad_software_jobs)}\n"
-              f"New Grad ENG: {len(newgrad_engineering_jobs)}",
-        inline=False
-    )
-    summary_embed.set_footer(text="Job postings will be sent below")
-    await ctx.send(embed=summary_embed)
-
-    # Send individual job embeds
-    for job in all_jobs:
-        # Determine source collection for update
-        collection = (engineering_collection if "JobRight-AI-Engineering" in job.get("source", "")
-                     else software_collection)
-        
-        # Create job embed
-        job_embed = create_job_embed(job)
-        
-        await ctx.send(embed=job_embed)
-        
-        # Update posted status
-        collection.update_one(
-            {"_id": job["_id"]},
-            {"$set": {"posted_to_discord": True}}
-        )
 
 @commands.command(name='fetchnewjobs')
 async def fetchnewjobs(ctx):
@@ -93,48 +53,19 @@ async def fetchnewjobs(ctx):
     status_embed.set_footer(text="This may take a moment")
     status_msg = await ctx.send(embed=status_embed)
     
-    scraper = JobScraper()
+    missing = ", ".join(route.name for route in ctx.bot.routes.missing_channels())
+    if missing:
+        error_embed = discord.Embed(
+            title="Error",
+            description=f"Target channel not found for {missing}",
+            color=0xff0000
+        )
+        await ctx.send(embed=error_embed)
+
     try:
-        jobs = scraper.fetch_all_jobs(days=7)
-        new_jobs = []
-        
-        for job in jobs:
-            # Select appropriate collection
-            if "JobRight-AI-Engineering" in job.get("source", ""):
-                collection = get_engineering_jobs_collection()
-            else:
-                collection = get_software_jobs_collection()
-            
-            if not collection.find_one({"url": job["url"]}):
-                result = collection.insert_one(job)
-                job_id = result.inserted_id
-                new_jobs.append(job)
-                
-                # Determine target channel
-                if "JobRight-AI-Engineering" in job.get("source", ""):
-                    target_channel = ctx.bot.get_channel(ENGINEER_CHANNEL_ID)
-                else:
-                    target_channel = ctx.bot.get_channel(SOFTWARE_CHANNEL_ID)
-                
-                if not target_channel:
-                    error_embed = discord.Embed(
-                        title="Error",
-                        description="Target channel not found",
-                        color=0xff0000
-                    )
-                    await ctx.send(embed=error_embed)
-                    continue
-                
-                # Send job embed to target channel
-                job_embed = create_job_embed(job)
-                await target_channel.send(embed=job_embed)
-                
-                # Update posted status
-                collection.update_one(
-                    {"_id": job_id},
-                    {"$set": {"posted_to_discord": True}}
-                )
-        
+        # Same cycle as the scheduler, queued behind it if one is running
+        new_jobs = await ctx.bot.fetch_and_post_new_jobs()
+
         # Update status embed with results
         if new_jobs:
             result_embed = discord.Embed(
@@ -169,13 +100,178 @@ async def fetchnewjobs(ctx):
         await status_msg.edit(embed=error_embed)
 
 
-def setup_commands(bot):
-    """Add commands to bot instance"""
+# key:value arguments understood by !jobs
+JOB_QUERY_KEY_RE = re.compile(r'\b(company|since|location|role|q|page|after):', re.IGNORECASE)
+ROLE_ALIASES = {
+    'intern': 'Internship', 'internship': 'Internship',
+    'newgrad': 'New Grad', 'new grad': 'New Grad', 'new-grad': 'New Grad',
+}
+# (channel, search arguments) -> {page: cursor}, so paging forward does not re-walk earlier pages
+_page_cursors = {}
+MAX_CACHED_QUERIES = 500
+
+
+def parse_key_values(pattern, text: str):
+    """Split "key:value key:value" arguments on the keys pattern matches"""
+    parts = pattern.split(text or "")
+    if parts[0].strip():
+        raise ValueError(f"Expected key:value arguments, got \"{parts[0].strip()}\"")
+    return {key.lower(): value.strip() for key, value in zip(parts[1::2], parts[2::2])}
+
+
+def parse_job_query(text: str):
+    """
+    Parse "company:<x> since:<date> location:<x> role:<intern|newgrad> q:<words> page:<n>".
+    Returns:
+        tuple: (filters for find_jobs, page number, explicit cursor or None, cache key of the search)
+    """
+    args = parse_key_values(JOB_QUERY_KEY_RE, text)
+    # The raw arguments rather than the filters, since a relative since: resolves differently on every call
+    search_key = tuple(sorted((key, value.lower()) for key, value in args.items() if key not in ('page', 'after')))
+
+    filters = {}
+    if args.get('company'):
+        filters['company'] = args['company']
+    if args.get('location'):
+        filters['location'] = args['location']
+    if args.get('q'):
+        filters['text'] = args['q']
+    if args.get('role'):
+        role = ROLE_ALIASES.get(args['role'].lower())
+        if role is None:
+            raise ValueError("role must be intern or newgrad")
+        filters['role_type'] = role
+    if args.get('since'):
+        filters['since'] = to_utc(parse_date(args['since'], strict=True))
+    page = args.get('page') or "1"
+    if not page.isdigit() or int(page) < 1:
+        raise ValueError("page must be a positive number")
+    return filters, int(page), args.get('after') or None, search_key
+
+
+@commands.command(name='jobs')
+async def jobs(ctx, *, query: str = ""):
+    """Search stored jobs: !jobs company:<x> since:<date> location:<x> role:<intern|newgrad> q:<title words> page:<n>"""
+    try:
+        filters, page, after, search_key = parse_job_query(query)
+    except ValueError as e:
+        await ctx.send(embed=create_error_embed("Invalid search", str(e), "warning"))
+        return
+
+    collections = get_job_collections()
+    cache_key = (ctx.channel.id, search_key)
+    cached = _page_cursors.setdefault(cache_key, {})
+    if after is None and page > 1:
+        after = cached.get(page)
+        if after is None:
+            after = await asyncio.to_thread(cursor_for_page, collections, page, PAGE_SIZE, **filters)
+            if after is None:
+                await ctx.send(embed=create_error_embed("No Jobs Found", f"There is no page {page} for this search.", "info"))
+                return
+
+    results, next_cursor = await asyncio.to_thread(find_jobs, collections, PAGE_SIZE, after, **filters)
+    if not results:
+        await ctx.send(embed=create_error_embed("No Jobs Found", "No stored jobs match this search.", "info"))
+        return
+
+    if next_cursor is not None:
+        if len(_page_cursors) > MAX_CACHED_QUERIES:
+            _page_cursors.clear()
+            _page_cursors[cache_key] = cached
+        cached[page + 1] = next_cursor
+
+    await ctx.bot.send_dispatcher.send_all(ctx.channel, [create_compact_job_embed(job) for job in results])
+    footer = f"Page {page}"
+    if next_cursor is not None:
+        base = re.sub(r'\b(page|after):\s*\S*', '', query, flags=re.IGNORECASE).strip()
+        footer += f" • next page: `!jobs {base} page:{page + 1}`".replace("  ", " ")
+    await ctx.send(footer)
+
+
+# key:value arguments understood by !subscribe; every value is a comma-separated list
+SUBSCRIBE_KEY_RE = re.compile(r'\b(role|location|company|exclude|keywords):', re.IGNORECASE)
+
+
+def parse_subscription(guild_id: int, channel_id: int, text: str) -> Subscription:
+    """
+    Parse "role:<intern,newgrad> location:<a,b> company:<a,b> exclude:<a,b> keywords:<a,b>".
+    Returns:
+        Subscription: Filters for the channel; omitted keys match everything
+    """
+    args = parse_key_values(SUBSCRIBE_KEY_RE, text)
+    lists = {key: [item.strip() for item in value.split(',') if item.strip()] for key, value in args.items()}
+    role_types = []
+    for role in lists.get('role', []):
+        role_type = ROLE_ALIASES.get(role.lower())
+        if role_type is None:
+            raise ValueError("role must be intern or newgrad")
+        role_types.append(role_type)
+    return Subscription(
+        guild_id, channel_id,
+        role_types=role_types,
+        locations=lists.get('location'),
+        companies=lists.get('company'),
+        exclude_companies=lists.get('exclude'),
+        keywords=lists.get('keywords'),
+    )
+
+
+@commands.command(name='subscribe')
+@commands.guild_only()
+@commands.has_permissions(manage_guild=True)
+async def subscribe(ctx, *, filters: str = ""):
+    """Post new jobs to this channel: !subscribe role:<intern,newgrad> location:<a,b> company:<a,b> exclude:<a,b> keywords:<a,b>"""
+    try:
+        subscription = parse_subscription(ctx.guild.id, ctx.channel.id, filters)
+    except ValueError as e:
+        await ctx.send(embed=create_error_embed("Invalid subscription", str(e), "warning"))
+        return
+
+    await asyncio.to_thread(save_subscription, subscription)
+    await ctx.bot.reload_subscriptions()
+    await ctx.send(embed=create_success_embed("Subscribed", f"New jobs will be posted here.\n{subscription.describe()}"))
+
+
+@commands.command(name='unsubscribe')
+@commands.guild_only()
+@commands.has_permissions(manage_guild=True)
+async def unsubscribe(ctx):
+    """Stop posting new jobs to this channel"""
+    removed = await asyncio.to_thread(delete_subscription, ctx.channel.id)
+    if not removed:
+        await ctx.send(embed=create_error_embed("Not subscribed", "This channel has no job subscription.", "info"))
+        return
+    await ctx.bot.reload_subscriptions()
+    await ctx.send(embed=create_success_embed("Unsubscribed", "New jobs will no longer be posted here."))
+
+
+@commands.command(name='stats')
+async def stats(ctx):
+    """Show fetch, database, dedup and send metrics for this process"""
+    seen_urls = ctx.bot.seen_urls
+    extra_fields = {
+        "Seen URL filter": f"{len(seen_urls)} URLs • {seen_urls.stats}",
+        "Guild subscriptions": str(len(ctx.bot.subscriptions)),
+        "Embed cache": ", ".join(f"{name} {value}" for name, value in EMBED_CACHE.info().items()),
+        "Source intervals (min)": ", ".join(
+            f"{key} {minutes}" for key, minutes in ctx.bot.source_schedule.summary().items()
+        )[:1024],
+    }
+    await ctx.send(embed=create_stats_embed(extra_fields))
+
+
+def setup_commands(bot, names=None):
+    """Add commands to bot instance, only the named ones when names is given"""
     commands = [
         postalljobs,
         fetchnewjobs,
+        jobs,
+        subscribe,
+        unsubscribe,
+        stats,
         # ... (add other command references here) ...
     ]
     for command in commands:
-        bot.add_command(command)
+        if names is None or command.name in names:
+            bot.add_command(command)
     print("All commands registered")
@@ -1,84 +1,168 @@
+import os
 import discord
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from data.models import JobPosting
+from monitoring import metrics
 
-def create_job_embed(job):
+# Static parts of the job embeds, built once
+ROLE_COLORS = {
+    'New Grad': 0x00ff7f,      # Spring Green
+    'Internship': 0x1e90ff     # Dodger Blue
+}
+DEFAULT_COLOR = 0x1e90ff
+THUMBNAIL_URL = "https://cdn.discordapp.com/attachments/1387856625364238508/1392205237363933244/Vertical_version.png?ex=686eafaa&is=686d5e2a&hm=55a56c825ba02837b34fb5d7eaf91729866858e9edf63e77b370b6cec0967714&"
+
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "5000"))
+
+# Bursts larger than this are posted with the compact embed layout
+COMPACT_EMBED_THRESHOLD = 20
+
+
+class EmbedCache:
     """
-    Create a professional embed for job postings with improved formatting.
-    Args:
-        job (dict): Job data containing title, company, location, etc.
-    Returns:
-        discord.Embed: Formatted embed ready to send
+    LRU of rendered job embeds keyed by (job url, layout).
+    Each entry remembers the job fields it was rendered from, so an edited
+    posting is rendered again instead of served stale.
     """
-    # Choose colors based on job type
-    color_mapping = {
-        'New Grad': 0x00ff7f,      # Spring Green
-        'Internship': 0x1e90ff     # Dodger Blue
-    }
-    embed_color = color_mapping.get(job.get('role_type', 'Internship'), 0x1e90ff)
 
-    # Format the date
-    if isinstance(job['date_posted'], datetime):
-        formatted_date = job['date_posted'].strftime('%B %d, %Y')
-    else:
-        formatted_date = datetime.fromtimestamp(job['date_posted']).strftime('%B %d, %Y')
+    def __init__(self, maxsize: int = EMBED_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Tuple, discord.Embed]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
 
-    # Create the main embed
-    embed = discord.Embed(
-        title=f"{job.get('emoji', '')} {job['title']}".strip(),
-        color=embed_color,
-        timestamp=datetime.now()
-    )
+    def get(self, key: Tuple[str, str], signature: Tuple) -> Optional[discord.Embed]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != signature:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Tuple[str, str], signature: Tuple, embed: discord.Embed):
+        self._entries[key] = (signature, embed)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+EMBED_CACHE = EmbedCache()
 
-    # Add thumbnail if provided
-    embed.set_thumbnail(url="https://cdn.discordapp.com/attachments/1387856625364238508/1392205237363933244/Vertical_version.png?ex=686eafaa&is=686d5e2a&hm=55a56c825ba02837b34fb5d7eaf91729866858e9edf63e77b370b6cec0967714&")
+
+def _signature(job: JobPosting) -> Tuple:
+    return (job.title, job.company, job.location, job.date_posted, job.role_type, job.source)
+
+
+def _render_full(job: JobPosting) -> discord.Embed:
+    embed = discord.Embed(title=job.title, color=ROLE_COLORS.get(job.role_type, DEFAULT_COLOR))
+    embed.set_thumbnail(url=THUMBNAIL_URL)
 
     # Add fields for better spacing and alignment
-    embed.add_field(name="Company", value=job['company'], inline=False)
-    embed.add_field(name="Location", value=job['location'] or 'Remote/Not specified', inline=False)
-    embed.add_field(name="Posted", value=formatted_date, inline=False) 
+    embed.add_field(name="Company", value=job.company, inline=False)
+    embed.add_field(name="Location", value=job.location or 'Remote/Not specified', inline=False)
+    # date_posted is UTC; the posted day is shown in the bot's local time, as before
+    embed.add_field(name="Posted", value=job.date_posted.astimezone().strftime('%B %d, %Y'), inline=False)
 
     # Add a field for the apply link (not inline to keep it prominent)
-    embed.add_field(name="\u200B", value=f"[Apply Here]({job['url']})", inline=False)
+    embed.add_field(name="\u200B", value=f"[Apply Here]({job.url})", inline=False)
 
     # Add footer with source information
-    source_name = job.get('source', 'Unknown')
-    embed.set_footer(text=f"{source_name}")
+    embed.set_footer(text=job.source or 'Unknown')
+    return embed
+
+
+def _render_compact(job: JobPosting) -> discord.Embed:
+    # Super compact format
+    description = (
+        f"**{job.company}**\n"
+        f"📍 {job.location or 'Remote'} • 📅 {job.date_posted.astimezone().strftime('%m/%d/%Y')}\n"
+        f"🔗 [Apply Here]({job.url})"
+    )
+    embed = discord.Embed(title=job.title, description=description, color=ROLE_COLORS.get(job.role_type, DEFAULT_COLOR))
 
+    # Minimal footer
+    embed.set_footer(text=f"💡 {job.source or 'Unknown'}")
     return embed
 
-def create_compact_job_embed(job):
+
+RENDERERS = {"full": _render_full, "compact": _render_compact}
+
+
+def render_job_embed(job: JobPosting, layout: str = "full") -> discord.Embed:
     """
-    Create an even more compact version for bulk posting.
+    Return the cached embed for a job, rendering it on first use.
+    Args:
+        job (JobPosting): Job to render
+        layout (str): "full" or "compact"
+    Returns:
+        discord.Embed: Shared with later calls for the same job, so callers
+        that change it must work on a copy()
     """
-    color_mapping = {
-        'New Grad': 0x00ff7f,
-        'Internship': 0x1e90ff
-    }
-    embed_color = color_mapping.get(job.get('role_type', 'Internship'), 0x1e90ff)
+    key = (job.url, layout)
+    signature = _signature(job)
+    embed = EMBED_CACHE.get(key, signature)
+    if embed is None:
+        embed = RENDERERS[layout](job)
+        EMBED_CACHE.put(key, signature, embed)
+    return embed
 
-    # Format the date
-    if isinstance(job['date_posted'], datetime):
-        formatted_date = job['date_posted'].strftime('%m/%d/%Y')
-    else:
-        formatted_date = datetime.fromtimestamp(job['date_posted']).strftime('%m/%d/%Y')
 
-    # Super compact format
-    description = (
-        f"**{job['company']}**\n"
-        f"📍 {job['location'] or 'Remote'} • 📅 {formatted_date}\n"
-        f"🔗 [Apply Here]({job['url']})"
-    )
+def create_job_embed(job: JobPosting):
+    """
+    Create a professional embed for job postings with improved formatting.
+    Args:
+        job (JobPosting): Job containing title, company, location, etc.
+    Returns:
+        discord.Embed: Formatted embed ready to send
+    """
+    # The cached embed may still be queued for another channel, so the send time goes on a copy
+    embed = render_job_embed(job, "full").copy()
+    # Aware UTC skips the local-time conversion discord.py does for naive datetimes
+    embed.timestamp = datetime.now(timezone.utc)
+    return embed
 
-    embed = discord.Embed(
-        title=job['title'],
-        description=description,
-        color=embed_color
-    )
+def create_compact_job_embed(job: JobPosting):
+    """
+    Create an even more compact version for bulk posting.
+    """
+    return render_job_embed(job, "compact")
 
-    # Minimal footer
-    source_name = job.get('source', 'Unknown')
-    embed.set_footer(text=f"💡 {source_name}")
+def create_repost_progress_embed(checkpoint):
+    """
+    Live progress of a !postalljobs run.
+    Args:
+        checkpoint (dict): The run's checkpoint (status, total, sent, failed, breakdown)
+    Returns:
+        discord.Embed: Progress bar with per-collection totals
+    """
+    done = checkpoint["sent"] + checkpoint["failed"]
+    total = max(checkpoint["total"], done)
+    filled = round(20 * done / total) if total else 20
+    finished = checkpoint.get("status") == "done"
 
+    embed = discord.Embed(
+        title="Job Posting Complete" if finished else "Posting Jobs",
+        description=f"`{'█' * filled}{'░' * (20 - filled)}` **{done}/{total}** (oldest first)",
+        color=0x00ff00 if finished else 0x00d2d3,
+        timestamp=datetime.now()
+    )
+    embed.add_field(
+        name="Breakdown",
+        value="\n".join(f"{name}: {count}" for name, count in checkpoint.get("breakdown", {}).items()) or "none",
+        inline=True
+    )
+    embed.add_field(name="Sent", value=str(checkpoint["sent"]), inline=True)
+    embed.add_field(name="Failed", value=str(checkpoint["failed"]), inline=True)
+    embed.set_footer(text="Failed jobs stay unposted for the next run" if finished else "Resumes from here if the bot restarts")
     return embed
 
 def create_error_embed(title, description, error_type="general"):
@@ -108,3 +192,50 @@ def create_success_embed(title, description):
     )
     embed.set_footer(text="Operation completed successfully")
     return embed
+
+def create_stats_embed(extra_fields=None):
+    """
+    Summarize the process metrics for the !stats command.
+    Args:
+        extra_fields (dict): Additional name -> value fields to append
+    Returns:
+        discord.Embed: Per-source fetch latency and outcomes, plus Mongo, dedup and Discord totals
+    """
+    embed = discord.Embed(title="Bot Stats", color=0x3498db, timestamp=datetime.now())
+
+    cycles, cycle_total = metrics.CYCLE_SECONDS.summary().get((), (0, 0.0))
+    if cycles:
+        embed.add_field(name="Scrape cycles", value=f"{cycles} (avg {cycle_total / cycles:.2f}s)", inline=False)
+
+    outcomes = {}
+    for key, count in metrics.FETCH_RESULTS.values().items():
+        labels = dict(key)
+        outcomes.setdefault(labels["source"], {})[labels["outcome"]] = int(count)
+    for key, (count, total) in sorted(metrics.FETCH_SECONDS.summary().items()):
+        source = dict(key)["source"]
+        bytes_read = metrics.FETCH_BYTES.value(source=source)
+        not_modified = int(metrics.NOT_MODIFIED.value(source=source))
+        results = ", ".join(f"{outcome} {n}" for outcome, n in sorted(outcomes.get(source, {}).items()))
+        embed.add_field(
+            name=source,
+            value=f"avg {total / count:.2f}s • {bytes_read / 1024:.0f} KiB • 304s {not_modified}\n{results}",
+            inline=False
+        )
+        if len(embed.fields) >= 20:
+            break
+
+    mongo = ", ".join(f"{dict(key)['operation']} {int(n)}" for key, n in sorted(metrics.MONGO_ROUND_TRIPS.values().items()))
+    embed.add_field(name="Mongo round trips", value=mongo or "none", inline=True)
+    dedup = ", ".join(f"{dict(key)['kind']} {int(n)}" for key, n in sorted(metrics.DEDUP_HITS.values().items()) if n)
+    embed.add_field(name="Dedup hits", value=dedup or "none", inline=True)
+
+    sends, send_total = metrics.SEND_SECONDS.summary().get((), (0, 0.0))
+    send_results = ", ".join(f"{dict(key)['outcome']} {int(n)}" for key, n in sorted(metrics.SEND_RESULTS.values().items()))
+    send_value = f"{send_results} (avg {send_total / sends:.2f}s)" if sends else "none"
+    embed.add_field(name="Discord sends", value=send_value, inline=True)
+
+    for name, value in (extra_fields or {}).items():
+        embed.add_field(name=name, value=value, inline=False)
+
+    embed.set_footer(text="Full metrics are served in Prometheus format on /metrics")
+    return embed
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Elected scraper for the sharded deployment.
+Every producer instance competes for the "scraper" lease in MongoDB; only the
+holder polls the sources, stores new jobs and queues one delivery per
+(channel, job) for the shard workers. The others stand by and take over when
+the holder stops renewing.
+
+    python -m bot.producer
+"""
+import os
+import sys
+import time
+import socket
+import asyncio
+from typing import Dict, List
+
+from dotenv import load_dotenv
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.multi_source import JobScraper
+from scrapers.snapshot import RowSnapshot
+from scrapers.source_registry import SourceSchedule, load_destinations
+from data.db import ensure_indexes, close_clients, get_job_collections
+from data.persistence import store_new_jobs, iter_recent_jobs
+from data.seen_urls import SeenURLs
+from data.subscriptions import load_subscriptions
+from data.lease import Lease, LEASE_TTL_SECONDS
+from data.job_queue import JobQueue, delivery
+from bot.routing import RoutingTable
+from bot.subscriptions import SubscriptionIndex
+from monitoring.metrics import CYCLE_SECONDS, start_http_server
+
+load_dotenv(dotenv_path="config/.env")
+
+LEASE_NAME = "scraper"
+# Shard count of the worker fleet, used to assign each delivery to a shard
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "1"))
+# Guild of the channels configured in the registry destinations; their deliveries
+# are sharded by it, so it is required as soon as there is more than one shard
+HOME_GUILD_ID = int(os.getenv("HOME_GUILD_ID", "0")) or None
+# How often the leader checks which sources are due
+SCHEDULER_TICK_SECONDS = int(os.getenv("SCHEDULER_TICK_SECONDS", "60"))
+
+
+async def warm_scraper_state(scraper: JobScraper, seen_urls: SeenURLs):
+    """Seed the dedup index and the seen-URL filter with what is already stored"""
+    job_collections = get_job_collections()
+
+    # Reposts from other sources of already stored jobs are caught
+    dedup_index = scraper.dedup_index
+    warmed = await asyncio.to_thread(dedup_index.warm, iter_recent_jobs(job_collections, days=dedup_index.max_age_days))
+    print(f"Dedup index warmed with {warmed} stored jobs")
+
+    # Load every stored URL, from the disk snapshot when it is still current
+    origin = await asyncio.to_thread(seen_urls.warm_or_load, job_collections)
+    print(f"Seen URL filter loaded {len(seen_urls)} URLs from {origin}")
+
+
+class Producer:
+    """
+    Scrapes and queues deliveries while holding the scraper lease.
+    The lease only decides who scrapes; the queue's unique (channel, url) key is
+    what keeps a job from being delivered twice, even if two leaders overlap.
+    """
+
+    def __init__(self, instance_id: str = None, shard_count: int = SHARD_COUNT,
+                 tick_seconds: int = SCHEDULER_TICK_SECONDS, lease: Lease = None, queue: JobQueue = None):
+        self.instance_id = instance_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.shard_count = shard_count
+        self.tick_seconds = tick_seconds
+        self.lease = lease or Lease(LEASE_NAME, self.instance_id)
+        self.queue = queue or JobQueue()
+        self.scraper = JobScraper(snapshot=RowSnapshot())
+        self.schedule = SourceSchedule(self.scraper.sources)
+        self.seen_urls = SeenURLs()
+        # No Discord connection here: only the channel ids of the routes are used
+        self.routes = RoutingTable(self.scraper.sources, load_destinations(), lambda channel_id: None)
+        self._warmed_term = None
+        # Deliveries of jobs already stored but not queued yet, kept until an enqueue succeeds
+        self._unqueued: List[Dict] = []
+
+    def deliveries_for(self, route, jobs, subscriptions: SubscriptionIndex) -> List[Dict]:
+        """One delivery per (channel, job): the route's home channel plus every matching subscription"""
+        deliveries = []
+        collection = route.collection.name
+        for job in jobs:
+            if route.channel_id is not None:
+                deliveries.append(delivery(job, route.channel_id, HOME_GUILD_ID, self.shard_count, collection, True))
+            for subscription in subscriptions.match(job):
+                if subscription.channel_id != route.channel_id:
+                    # Destinations without a home channel count as posted once a subscriber gets the job
+                    deliveries.append(delivery(job, subscription.channel_id, subscription.guild_id, self.shard_count,
+                                               collection, route.channel_id is None))
+        return deliveries
+
+    async def cycle(self):
+        due = self.schedule.due()
+        if not due:
+            return
+        self.scraper.source_changes = {}
+        try:
+            start_time = time.time()
+            jobs = await self.scraper.afetch_all_jobs(max_concurrency=5, source_keys=due)
+            CYCLE_SECONDS.observe(time.time() - start_time)
+
+            # Recompiled every cycle so subscription changes from any worker are picked up
+            subscriptions = SubscriptionIndex(await asyncio.to_thread(lambda: list(load_subscriptions())))
+
+            batches = {}
+            for job in jobs:
+                route = self.routes.route(job)
+                if route is not None:
+                    batches.setdefault(route.name, (route, []))[1].append(job)
+
+            # Stored jobs are no longer new, so their deliveries are held here until they are queued
+            for route, batch in batches.values():
+                new_jobs = await asyncio.to_thread(store_new_jobs, route.collection, batch, self.seen_urls)
+                self._unqueued.extend(self.deliveries_for(route, new_jobs, subscriptions))
+
+            # Stored jobs are queued even if the lease was lost meanwhile, nobody else will see them as new
+            queued = await asyncio.to_thread(self.queue.enqueue, self._unqueued, self.lease.term)
+            self._unqueued = []
+            await asyncio.to_thread(self.scraper.snapshot.commit)
+            await asyncio.to_thread(self.seen_urls.save)
+            print(f"Queued {queued} deliveries from {len(jobs)} jobs (term {self.lease.term})")
+        except Exception as e:
+            # Emit the same delta again next cycle
+            self.scraper.snapshot.discard()
+            print(f"ERROR in scrape cycle: {str(e)}")
+            # Not a poll result, so the due sources keep their interval and are retried next tick
+            return
+
+        for key in due:
+            self.schedule.record(key, self.scraper.source_changes.get(key, False))
+        self.schedule.save()
+
+    async def keep_lease(self):
+        """Acquire or renew the lease every third of its TTL"""
+        was_leader = False
+        while True:
+            try:
+                leader = await asyncio.to_thread(self.lease.acquire)
+            except Exception as e:
+                print(f"ERROR renewing the scraper lease: {str(e)}")
+                leader = False
+            if leader and not was_leader:
+                print(f"{self.instance_id} is now the scraper leader (term {self.lease.term})")
+            elif was_leader and not leader:
+                print(f"{self.instance_id} lost the scraper lease")
+            was_leader = leader
+            await asyncio.sleep(self.lease.ttl.total_seconds() / 3)
+
+    async def run(self):
+        ensure_indexes()
+        self.scraper.parse_pool.start()
+        metrics_runner = await start_http_server()
+        lease_task = asyncio.create_task(self.keep_lease())
+        try:
+            while True:
+                if self.lease.held():
+                    if self._warmed_term != self.lease.term:
+                        # Another leader may have stored jobs since this instance last led
+                        await warm_scraper_state(self.scraper, self.seen_urls)
+                        self._warmed_term = self.lease.term
+                    await self.cycle()
+                await asyncio.sleep(self.tick_seconds)
+        finally:
+            lease_task.cancel()
+            await asyncio.to_thread(self.lease.release)
+            await self.scraper.aclose()
+            if metrics_runner is not None:
+                await metrics_runner.cleanup()
+
+
+def main():
+    if SHARD_COUNT > 1 and HOME_GUILD_ID is None:
+        # Home deliveries would all go to shard 0 and be parked as failed if the guild is elsewhere
+        print("ERROR: HOME_GUILD_ID must be set when SHARD_COUNT is greater than 1")
+        return
+
+    print(f"Starting scraper producer (lease TTL {LEASE_TTL_SECONDS}s, {SHARD_COUNT} shard(s))...")
+    try:
+        asyncio.run(Producer().run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_clients()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import os
+import heapq
+import asyncio
+import discord
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from data.db import get_job_collections, get_repost_checkpoints_collection
+from data.models import JobPosting
+from data.persistence import mark_posted
+from monitoring.metrics import JOBS_POSTED, mongo_op
+from bot.embed_utils import create_job_embed, create_repost_progress_embed
+
+# Jobs pulled from the merged cursors, then sent, marked and checkpointed together
+REPOST_CHUNK_SIZE = int(os.getenv("REPOST_CHUNK_SIZE", "25"))
+# Documents each collection cursor fetches per round trip
+CURSOR_BATCH_SIZE = 200
+# Oldest first; _id orders jobs posted at the same instant (served by the unposted_date index)
+REPOST_SORT = [("date_posted", 1), ("_id", 1)]
+
+# Channels with a repost running in this process
+_running = set()
+# Channel id -> resumed repost task, kept referenced until it finishes
+_resumed_tasks = {}
+
+
+def is_running(channel_id: int) -> bool:
+    return channel_id in _running
+
+
+def unposted_filter(checkpoint: Optional[Dict] = None) -> Dict:
+    """Jobs not posted yet, after the checkpoint's last (date_posted, _id) when there is one"""
+    query = {"posted_to_discord": False}
+    if checkpoint and checkpoint.get("last_date") is not None:
+        last_date, last_id = checkpoint["last_date"], checkpoint["last_id"]
+        query["$or"] = [
+            {"date_posted": {"$gt": last_date}},
+            {"date_posted": last_date, "_id": {"$gt": last_id}},
+        ]
+    return query
+
+
+def merge_unposted(cursors: List) -> Iterator[Tuple[Dict, object]]:
+    """
+    Lazily k-way merge date-sorted cursors into one oldest-first stream.
+    Only one batch per cursor is held in memory at a time.
+    Yields:
+        tuple: (document, collection it came from)
+    """
+    return heapq.merge(*[_tagged(cursor) for cursor in cursors], key=lambda pair: (pair[0]["date_posted"], pair[0]["_id"]))
+
+
+def _tagged(cursor) -> Iterator[Tuple[Dict, object]]:
+    for doc in cursor:
+        yield doc, cursor.collection
+
+
+class RepostEngine:
+    """
+    Posts every stored job that has not been posted yet to one channel, oldest
+    first, across all job collections.
+    After each chunk the delivered jobs are marked posted in their own
+    collection and the position is checkpointed in Mongo, so an interrupted run
+    resumes where it stopped instead of starting over. At most one chunk can be
+    sent twice, when the process dies between sending it and marking it.
+    """
+
+    def __init__(self, bot, channel, collections: Optional[List] = None, checkpoints=None,
+                 chunk_size: int = REPOST_CHUNK_SIZE):
+        self.bot = bot
+        self.channel = channel
+        self.collections = collections if collections is not None else get_job_collections()
+        self.checkpoints = checkpoints if checkpoints is not None else get_repost_checkpoints_collection()
+        self.chunk_size = chunk_size
+        self.progress_message = None
+
+    def load_checkpoint(self) -> Optional[Dict]:
+        with mongo_op("find_one"):
+            return self.checkpoints.find_one({"_id": self.channel.id})
+
+    def clear_checkpoint(self):
+        with mongo_op("delete_one"):
+            self.checkpoints.delete_one({"_id": self.channel.id})
+
+    def _save_checkpoint(self, checkpoint: Dict):
+        checkpoint["updated_at"] = datetime.now(timezone.utc)
+        with mongo_op("replace_one"):
+            self.checkpoints.replace_one({"_id": checkpoint["_id"]}, checkpoint, upsert=True)
+
+    def _new_checkpoint(self) -> Dict:
+        breakdown = {}
+        for collection in self.collections:
+            with mongo_op("count_documents"):
+                breakdown[collection.name] = collection.count_documents({"posted_to_discord": False})
+        now = datetime.now(timezone.utc)
+        return {
+            "_id": self.channel.id,
+            "status": "running",
+            "breakdown": breakdown,
+            "total": sum(breakdown.values()),
+            "sent": 0,
+            "failed": 0,
+            "last_date": None,
+            "last_id": None,
+            "message_id": None,
+            "started_at": now,
+            "updated_at": now,
+        }
+
+    def _open_cursors(self, checkpoint: Dict) -> List:
+        query = unposted_filter(checkpoint)
+        return [
+            collection.find(query).sort(REPOST_SORT).batch_size(CURSOR_BATCH_SIZE)
+            for collection in self.collections
+        ]
+
+    def _mark_posted(self, posted: Dict[str, Tuple[object, List[str]]]):
+        for collection, urls in posted.values():
+            mark_posted(collection, urls)
+            JOBS_POSTED.inc(len(urls), collection=collection.name)
+
+    async def _show_progress(self, checkpoint: Dict):
+        embed = create_repost_progress_embed(checkpoint)
+        if self.progress_message is None and checkpoint.get("message_id"):
+            try:
+                self.progress_message = await self.channel.fetch_message(checkpoint["message_id"])
+            except discord.HTTPException:
+                self.progress_message = None
+        try:
+            if self.progress_message is None:
+                self.progress_message = await self.channel.send(embed=embed)
+                checkpoint["message_id"] = self.progress_message.id
+            else:
+                await self.progress_message.edit(embed=embed)
+        except discord.HTTPException as e:
+            # Progress is cosmetic, the repost itself carries on
+            print(f"Failed to update repost progress in channel {self.channel.id}: {str(e)}")
+
+    async def run(self) -> Dict:
+        """
+        Post, resuming from this channel's checkpoint when one exists.
+        Returns:
+            dict: The final checkpoint (total, sent, failed, breakdown)
+        """
+        if is_running(self.channel.id):
+            raise RuntimeError("A repost is already running in this channel")
+        _running.add(self.channel.id)
+        cursors = []
+        try:
+            checkpoint = await asyncio.to_thread(self.load_checkpoint)
+            if checkpoint is None:
+                checkpoint = await asyncio.to_thread(self._new_checkpoint)
+                if not checkpoint["total"]:
+                    return checkpoint
+            await self._show_progress(checkpoint)
+            await asyncio.to_thread(self._save_checkpoint, checkpoint)
+
+            cursors = await asyncio.to_thread(self._open_cursors, checkpoint)
+            merged = merge_unposted(cursors)
+            while True:
+                # Cursor batches are fetched with blocking I/O, keep it off the loop
+                chunk = await asyncio.to_thread(list, islice(merged, self.chunk_size))
+                if not chunk:
+                    break
+
+                jobs = [JobPosting.from_mongo(doc) for doc, _ in chunk]
+                delivered = await self.bot.send_dispatcher.send_all(self.channel, [create_job_embed(job) for job in jobs])
+
+                # Each job is marked in the collection it was read from
+                posted = {}
+                for (doc, collection), job, ok in zip(chunk, jobs, delivered):
+                    if ok:
+                        posted.setdefault(collection.name, (collection, []))[1].append(job.url)
+                await asyncio.to_thread(self._mark_posted, posted)
+
+                sent = sum(1 for ok in delivered if ok)
+                last_doc = chunk[-1][0]
+                checkpoint.update(
+                    sent=checkpoint["sent"] + sent,
+                    failed=checkpoint["failed"] + len(chunk) - sent,
+                    last_date=last_doc["date_posted"],
+                    last_id=last_doc["_id"],
+                )
+                await asyncio.to_thread(self._save_checkpoint, checkpoint)
+                await self._show_progress(checkpoint)
+
+            checkpoint["status"] = "done"
+            await self._show_progress(checkpoint)
+            # Jobs that failed to send are still unposted and are picked up by the next run
+            await asyncio.to_thread(self.clear_checkpoint)
+            return checkpoint
+        finally:
+            for cursor in cursors:
+                cursor.close()
+            _running.discard(self.channel.id)
+
+
+async def resume_pending(bot) -> int:
+    """
+    Restart every repost that was interrupted by a restart, in the background.
+    Returns:
+        int: Number of reposts resumed
+    """
+    checkpoints = get_repost_checkpoints_collection()
+    with mongo_op("find"):
+        pending = await asyncio.to_thread(list, checkpoints.find({"status": "running"}, {"_id": 1}))
+    resumed = 0
+    for checkpoint in pending:
+        channel = bot.get_channel(checkpoint["_id"])
+        # A resumed task only marks its channel running once it starts, so pending ones are checked too
+        if channel is None or is_running(channel.id) or channel.id in _resumed_tasks:
+            continue
+        task = asyncio.create_task(_run_resumed(RepostEngine(bot, channel)))
+        _resumed_tasks[channel.id] = task
+        task.add_done_callback(lambda _, channel_id=channel.id: _resumed_tasks.pop(channel_id, None))
+        resumed += 1
+    return resumed
+
+
+async def _run_resumed(engine: RepostEngine):
+    try:
+        checkpoint = await engine.run()
+        print(f"Resumed repost in channel {engine.channel.id} finished: {checkpoint['sent']} sent, {checkpoint['failed']} failed")
+    except Exception as e:
+        print(f"Resumed repost in channel {engine.channel.id} failed: {str(e)}")
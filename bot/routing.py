@@ -0,0 +1,89 @@
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from data.db import get_collection
+from data.models import JobPosting
+
+
+class Route:
+    """One destination: where its jobs are stored and which channel they are posted to"""
+
+    __slots__ = ("name", "role_type", "collection", "channel_id", "channel")
+
+    def __init__(self, name: str, role_type: str, collection, channel_id: Optional[int], channel):
+        self.name = name
+        self.role_type = role_type
+        self.collection = collection
+        self.channel_id = channel_id
+        self.channel = channel
+
+    def __repr__(self):
+        return f"Route({self.name!r}, {self.collection.name!r}, channel={self.channel_id})"
+
+
+def _channel_id(destination: Dict) -> Optional[int]:
+    value = os.getenv(destination.get("channel_env", ""), "")
+    return int(value) if value.strip().isdigit() else None
+
+
+class RoutingTable:
+    """
+    (source_name, role_type) -> Route, built once from the source registry.
+    Every destination's collection handle and channel are resolved when the
+    table is built, so routing a job is a single dict lookup. A job whose pair
+    is not in the table (an unregistered source, or a stored job from a source
+    that has since been removed) goes to the first destination declared for its
+    role type. A destination without a channel_env value has no home channel
+    and only delivers to guild subscriptions.
+    """
+
+    def __init__(self, sources: Dict[str, Dict], destinations: Dict[str, Dict], get_channel: Callable):
+        self.routes: Dict[str, Route] = {}
+        for name, destination in destinations.items():
+            channel_id = _channel_id(destination)
+            self.routes[name] = Route(
+                name,
+                destination.get("role_type", "Internship"),
+                get_collection(destination["collection"]),
+                channel_id,
+                get_channel(channel_id) if channel_id is not None else None,
+            )
+
+        self.by_role: Dict[str, Route] = {}
+        for route in self.routes.values():
+            self.by_role.setdefault(route.role_type, route)
+
+        self.table: Dict[Tuple[str, str], Route] = {}
+        for source_config in sources.values():
+            route = self.routes.get(source_config.get("destination"))
+            if route is not None:
+                self.table[(source_config["source_name"], route.role_type)] = route
+
+    def route(self, job: JobPosting) -> Optional[Route]:
+        route = self.table.get((job.source, job.role_type))
+        if route is None:
+            route = self.by_role.get(job.role_type)
+        return route
+
+    def get(self, destination: str) -> Optional[Route]:
+        return self.routes.get(destination)
+
+    def missing_channels(self) -> List[Route]:
+        """Destinations whose configured channel is not visible to the bot"""
+        return [route for route in self.routes.values() if route.channel_id is not None and route.channel is None]
+
+    def group(self, jobs: List[JobPosting]) -> Tuple[Dict[str, Tuple[Route, List[JobPosting]]], List[JobPosting]]:
+        """
+        Split a cycle's jobs into per-destination batches, keeping their order.
+        Returns:
+            tuple: (destination name -> (route, jobs), jobs with no usable route)
+        """
+        batches = {}
+        unrouted = []
+        for job in jobs:
+            route = self.route(job)
+            if route is None or (route.channel_id is not None and route.channel is None):
+                unrouted.append(job)
+                continue
+            batches.setdefault(route.name, (route, []))[1].append(job)
+        return batches, unrouted
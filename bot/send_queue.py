@@ -0,0 +1,265 @@
+import time
+import asyncio
+import discord
+from collections import deque
+from typing import Dict, List, Optional
+from monitoring.metrics import SEND_SECONDS, SEND_RESULTS
+
+# Discord limits: at most 10 embeds and 6000 embed characters per message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+# Default per-channel message budget (5 messages every 5 seconds)
+DEFAULT_RATE = 5
+DEFAULT_PER = 5.0
+
+# Bot-wide request budget shared by every channel queue (Discord's global limit is 50 per second)
+GLOBAL_RATE = 45
+GLOBAL_PER = 1.0
+
+
+class SendStats:
+    """Throughput counters for one channel queue"""
+
+    def __init__(self):
+        self.messages_sent = 0
+        self.embeds_sent = 0
+        self.rate_limited = 0
+        self.failures = 0
+        self.first_send = None
+        self.last_send = None
+
+    def record(self, embed_count: int):
+        now = time.monotonic()
+        if self.first_send is None:
+            self.first_send = now
+        self.last_send = now
+        self.messages_sent += 1
+        self.embeds_sent += embed_count
+
+    @property
+    def embeds_per_second(self) -> float:
+        if self.first_send is None or self.last_send == self.first_send:
+            return float(self.embeds_sent)
+        return self.embeds_sent / (self.last_send - self.first_send)
+
+    def as_dict(self) -> Dict:
+        return {
+            "messages_sent": self.messages_sent,
+            "embeds_sent": self.embeds_sent,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+            "embeds_per_second": round(self.embeds_per_second, 2),
+        }
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds to wait before retrying, read from a rate-limit error or its response headers"""
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+    if getattr(error, "status", None) != 429:
+        return None
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    for header in ("Retry-After", "X-RateLimit-Reset-After"):
+        if headers.get(header):
+            return float(headers[header])
+    return DEFAULT_PER
+
+
+class SharedBudget:
+    """Sliding-window budget shared by many queues; waiters are served in arrival order"""
+
+    def __init__(self, rate: int = GLOBAL_RATE, per: float = GLOBAL_PER):
+        self.rate = rate
+        self.per = per
+        self._sent_at = deque()
+        self._lock = None
+
+    async def acquire(self):
+        if self._lock is None:
+            # Created on first use so it belongs to the running loop
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._sent_at and now - self._sent_at[0] >= self.per:
+                    self._sent_at.popleft()
+                if len(self._sent_at) < self.rate:
+                    break
+                await asyncio.sleep(self.per - (now - self._sent_at[0]))
+            self._sent_at.append(time.monotonic())
+
+
+class ChannelSendQueue:
+    """
+    Async queue and worker for one channel.
+    Queued embeds are packed into messages of up to 10 embeds and sent while
+    staying inside the channel's message budget.
+    """
+
+    def __init__(self, channel, rate: int = DEFAULT_RATE, per: float = DEFAULT_PER,
+                 linger: float = 0.05, max_retries: int = 3, shared_budget: Optional[SharedBudget] = None):
+        self.channel = channel
+        self.rate = rate
+        self.per = per
+        self.shared_budget = shared_budget
+        self.linger = linger
+        self.max_retries = max_retries
+        self.queue = asyncio.Queue()
+        self.stats = SendStats()
+        self._sent_at = []
+        self._carry = None
+        self._worker = None
+
+    def start(self):
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    def enqueue(self, embed: discord.Embed) -> asyncio.Future:
+        """Queue an embed; the returned future resolves once the message carrying it is sent"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((embed, future))
+        return future
+
+    async def join(self):
+        await self.queue.join()
+
+    async def close(self):
+        """Stop the worker and resolve every embed it did not send as undelivered"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        leftover = [self._carry] if self._carry is not None else []
+        self._carry = None
+        while True:
+            try:
+                leftover.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        self._abandon(leftover)
+
+    def _abandon(self, items: List):
+        """Mark taken items done, resolving the futures nobody sent as False so no send_all waits forever"""
+        for _, future in items:
+            if not future.done():
+                future.set_result(False)
+            self.queue.task_done()
+
+    async def _next_batch(self) -> List:
+        """Collect up to 10 queued embeds that fit in one message"""
+        batch = []
+        try:
+            if self._carry is not None:
+                first, self._carry = self._carry, None
+            else:
+                first = await self.queue.get()
+            batch.append(first)
+            size = len(first[0])
+            while len(batch) < MAX_EMBEDS_PER_MESSAGE:
+                try:
+                    item = self.queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    try:
+                        item = await asyncio.wait_for(self.queue.get(), self.linger)
+                    except asyncio.TimeoutError:
+                        break
+                if size + len(item[0]) > MAX_EMBED_CHARS_PER_MESSAGE:
+                    # Too big for this message, it opens the next one
+                    self._carry = item
+                    break
+                batch.append(item)
+                size += len(item[0])
+        except asyncio.CancelledError:
+            # Closed while collecting, the embeds taken so far will not be sent
+            self._abandon(batch)
+            raise
+        return batch
+
+    async def _wait_for_budget(self):
+        """Sleep until another message fits in the channel's rate window and the bot-wide budget"""
+        now = time.monotonic()
+        self._sent_at = [t for t in self._sent_at if now - t < self.per]
+        if len(self._sent_at) >= self.rate:
+            await asyncio.sleep(self.per - (now - self._sent_at[0]))
+        self._sent_at.append(time.monotonic())
+        if self.shared_budget is not None:
+            await self.shared_budget.acquire()
+
+    async def _send_batch(self, batch: List):
+        embeds = [embed for embed, _ in batch]
+        for attempt in range(self.max_retries + 1):
+            await self._wait_for_budget()
+            try:
+                with SEND_SECONDS.time():
+                    await self.channel.send(embeds=embeds)
+                SEND_RESULTS.inc(outcome="ok")
+                self.stats.record(len(embeds))
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(True)
+                return
+            except Exception as e:
+                retry_after = _retry_after(e)
+                if retry_after is None or attempt == self.max_retries:
+                    SEND_RESULTS.inc(outcome="failed")
+                    self.stats.failures += 1
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    return
+                # Respect the bucket reset the server told us about
+                SEND_RESULTS.inc(outcome="rate_limited")
+                self.stats.rate_limited += 1
+                await asyncio.sleep(retry_after)
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._send_batch(batch)
+            finally:
+                # Every future is resolved after a send; after a cancel none of them is
+                self._abandon(batch)
+
+
+class SendDispatcher:
+    """Holds one ChannelSendQueue per channel, all drawing on one bot-wide budget"""
+
+    def __init__(self, global_rate: int = GLOBAL_RATE, global_per: float = GLOBAL_PER, **queue_options):
+        self.queue_options = queue_options
+        self.shared_budget = SharedBudget(global_rate, global_per)
+        self.queues: Dict[int, ChannelSendQueue] = {}
+
+    def queue_for(self, channel) -> ChannelSendQueue:
+        if channel.id not in self.queues:
+            self.queues[channel.id] = ChannelSendQueue(channel, shared_budget=self.shared_budget, **self.queue_options)
+        return self.queues[channel.id]
+
+    async def send_all(self, channel, embeds: List[discord.Embed]) -> List[bool]:
+        """
+        Queue embeds for a channel and wait for them to go out.
+        Returns:
+            list: True for every embed that was delivered, False otherwise
+        """
+        queue = self.queue_for(channel)
+        futures = [queue.enqueue(embed) for embed in embeds]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        delivered = []
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Failed to send embed to channel {channel.id}: {str(result)}")
+            delivered.append(result is True)
+        return delivered
+
+    def stats(self) -> Dict[int, Dict]:
+        return {channel_id: queue.stats.as_dict() for channel_id, queue in self.queues.items()}
+
+    async def close(self):
+        for queue in self.queues.values():
+            await queue.close()
@@ -0,0 +1,107 @@
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+from data.models import JobPosting
+from data.subscriptions import Subscription
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    return tuple(_TOKEN_RE.findall((text or "").lower()))
+
+
+def normalize_company(name: str) -> str:
+    return " ".join(tokenize(name))
+
+
+class _PhraseIndex:
+    """
+    Phrase filters (a location or a keyword) indexed by their first token.
+    A job's text is tokenized once and each token looks up only the phrases
+    starting with it, instead of every subscription testing its own phrases.
+    """
+
+    def __init__(self):
+        self.by_first_token: Dict[str, List[Tuple[Tuple[str, ...], int]]] = {}
+
+    def add(self, phrase: str, subscription_id: int):
+        tokens = tokenize(phrase)
+        if tokens:
+            self.by_first_token.setdefault(tokens[0], []).append((tokens, subscription_id))
+
+    def matches(self, text: str) -> Set[int]:
+        tokens = tokenize(text)
+        matched = set()
+        for i, token in enumerate(tokens):
+            for phrase, subscription_id in self.by_first_token.get(token, ()):
+                if tokens[i:i + len(phrase)] == phrase:
+                    matched.add(subscription_id)
+        return matched
+
+
+class SubscriptionIndex:
+    """
+    Subscriptions compiled into inverted indexes, one per filter.
+    Each filter keeps the ids constrained to a value plus the ids with no
+    constraint on that filter, so matching a job costs a few dict lookups and
+    set intersections sized by the matching subscriptions, not a pass over all
+    of them.
+    """
+
+    def __init__(self, subscriptions: Iterable[Subscription] = ()):
+        self.subscriptions: List[Subscription] = list(subscriptions)
+        everyone = set(range(len(self.subscriptions)))
+
+        # Role types are few, so each one precomputes "constrained to it or unconstrained"
+        role_any = {i for i, s in enumerate(self.subscriptions) if not s.role_types}
+        company_any = {i for i, s in enumerate(self.subscriptions) if not s.companies}
+        self.role_sets: Dict[str, Set[int]] = {}
+        self.company_sets: Dict[str, Set[int]] = {}
+        self.excluded: Dict[str, Set[int]] = {}
+        self.locations = _PhraseIndex()
+        self.keywords = _PhraseIndex()
+        for i, subscription in enumerate(self.subscriptions):
+            for role_type in subscription.role_types:
+                if role_type not in self.role_sets:
+                    self.role_sets[role_type] = set(role_any)
+                self.role_sets[role_type].add(i)
+            for company in subscription.companies:
+                self.company_sets.setdefault(normalize_company(company), set()).add(i)
+            for company in subscription.exclude_companies:
+                self.excluded.setdefault(normalize_company(company), set()).add(i)
+            for location in subscription.locations:
+                self.locations.add(location, i)
+            for keyword in subscription.keywords:
+                self.keywords.add(keyword, i)
+        self.role_any = role_any
+        self.company_any = company_any
+        self.location_any = everyone - {i for i, s in enumerate(self.subscriptions) if s.locations}
+        self.keyword_any = everyone - {i for i, s in enumerate(self.subscriptions) if s.keywords}
+
+    def __len__(self):
+        return len(self.subscriptions)
+
+    def match_ids(self, job: JobPosting) -> Set[int]:
+        company = normalize_company(job.company)
+        matched = self.role_sets.get(job.role_type, self.role_any)
+        # set & set iterates the smaller side
+        matched = (matched & self.company_any) | (matched & self.company_sets.get(company, set()))
+        matched -= self.excluded.get(company, set())
+        if not matched:
+            return matched
+        matched = (matched & self.location_any) | (matched & self.locations.matches(job.location))
+        if not matched:
+            return matched
+        return (matched & self.keyword_any) | (matched & self.keywords.matches(job.title))
+
+    def match(self, job: JobPosting) -> List[Subscription]:
+        return [self.subscriptions[i] for i in self.match_ids(job)]
+
+    def group(self, jobs: Iterable[JobPosting]) -> Dict[int, List[JobPosting]]:
+        """Channel id -> the jobs its subscription matches, in job order"""
+        by_channel: Dict[int, List[JobPosting]] = {}
+        for job in jobs:
+            for i in self.match_ids(job):
+                by_channel.setdefault(self.subscriptions[i].channel_id, []).append(job)
+        return by_channel
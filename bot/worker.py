@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Discord shard worker for the sharded deployment.
+Connects the given shards, claims the queued deliveries for channels in
+those shards' guilds and posts them through the shared send pipeline. Also
+serves the commands that do not need the scraper.
+
+    SHARD_COUNT=2 SHARD_IDS=0 python -m bot.worker
+"""
+import os
+import sys
+import socket
+import asyncio
+from typing import Dict, List
+
+import discord
+from discord.ext import commands
+from dotenv import load_dotenv
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from data.db import get_collection, close_clients, ensure_indexes
+from data.job_queue import JobQueue
+from data.models import JobPosting
+from data.persistence import mark_posted
+from bot.send_queue import SendDispatcher
+from bot.subscriptions import SubscriptionIndex
+from bot.embed_utils import create_job_embed, create_compact_job_embed, COMPACT_EMBED_THRESHOLD
+from bot.commands import setup_commands
+from bot.repost import resume_pending
+from monitoring.metrics import JOBS_POSTED, start_http_server
+
+load_dotenv(dotenv_path="config/.env")
+TOKEN = os.getenv("BOT_TOKEN")
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "1"))
+SHARD_IDS = [int(shard) for shard in os.getenv("SHARD_IDS", "0").split(",") if shard.strip()]
+
+# Commands that work without the scraper; !fetchnewjobs and !stats stay with the single-process bot
+WORKER_COMMANDS = ("postalljobs", "jobs", "subscribe", "unsubscribe")
+# Deliveries claimed per round, and the wait when the queue is empty
+CLAIM_BATCH = int(os.getenv("QUEUE_CLAIM_BATCH", "50"))
+QUEUE_POLL_SECONDS = float(os.getenv("QUEUE_POLL_SECONDS", "2"))
+
+
+class ShardWorker(commands.AutoShardedBot):
+    """Bot for a subset of shards that posts queued deliveries instead of scraping"""
+
+    def __init__(self, *args, worker_id: str = None, queue: JobQueue = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.queue = queue or JobQueue()
+        self.send_dispatcher = SendDispatcher()
+        # Subscriptions are matched by the producer; commands only read the count
+        self.subscriptions = SubscriptionIndex()
+        self.metrics_runner = None
+        self._consumer = None
+
+    async def setup_hook(self):
+        await asyncio.to_thread(ensure_indexes)
+        setup_commands(self, WORKER_COMMANDS)
+        self.metrics_runner = await start_http_server()
+
+    async def on_ready(self):
+        print(f"Logged in as {self.user} with shards {self.shard_ids} of {self.shard_count}")
+        if self._consumer is None:
+            self._consumer = asyncio.create_task(self.consume())
+            # Only checkpoints of channels in this worker's shards are visible here
+            resumed = await resume_pending(self)
+            if resumed:
+                print(f"Resumed {resumed} interrupted job repost(s)")
+
+    async def reload_subscriptions(self):
+        # The producer recompiles the subscriptions from MongoDB every cycle
+        print("Subscriptions changed, the producer picks them up on its next cycle")
+
+    async def consume(self):
+        """Claim and post deliveries until the bot closes"""
+        while not self.is_closed():
+            try:
+                claimed = await self.process_batch()
+            except Exception as e:
+                print(f"ERROR consuming the delivery queue: {str(e)}")
+                claimed = 0
+            if not claimed:
+                await asyncio.sleep(QUEUE_POLL_SECONDS)
+
+    async def process_batch(self) -> int:
+        """
+        Claim one batch for this worker's shards and post it, one send queue per channel.
+        Returns:
+            int: Number of deliveries claimed
+        """
+        entries = await asyncio.to_thread(self.queue.claim, self.worker_id, list(self.shard_ids), CLAIM_BATCH)
+        if not entries:
+            return 0
+
+        by_channel: Dict[int, List[Dict]] = {}
+        for entry in entries:
+            by_channel.setdefault(entry["channel_id"], []).append(entry)
+
+        sends = []
+        failed = []
+        for channel_id, channel_entries in by_channel.items():
+            channel = self.get_channel(channel_id)
+            if channel is None:
+                print(f"Channel {channel_id} is not visible to this worker, returning its deliveries")
+                failed.extend(entry["_id"] for entry in channel_entries)
+                continue
+            jobs = [JobPosting.from_mongo(entry["job"]) for entry in channel_entries]
+            build_embed = create_compact_job_embed if len(jobs) > COMPACT_EMBED_THRESHOLD else create_job_embed
+            sends.append((channel_entries, self.send_dispatcher.send_all(channel, [build_embed(job) for job in jobs])))
+
+        results = await asyncio.gather(*[send for _, send in sends])
+        done = []
+        posted: Dict[str, List[str]] = {}
+        for (channel_entries, _), delivered in zip(sends, results):
+            for entry, ok in zip(channel_entries, delivered):
+                if not ok:
+                    failed.append(entry["_id"])
+                    continue
+                done.append(entry["_id"])
+                if entry["marks_posted"]:
+                    posted.setdefault(entry["collection"], []).append(entry["job"]["url"])
+
+        # Every entry of one claim carries the same token
+        await asyncio.to_thread(self._finish, entries[0]["claim_token"], done, failed, posted)
+        return len(entries)
+
+    def _finish(self, claim_token: str, done: List, failed: List, posted: Dict[str, List[str]]):
+        completed = self.queue.complete(done, claim_token)
+        if completed < len(done):
+            # Another worker reclaimed them after the claim expired, and will post them again
+            print(f"{len(done) - completed} delivered job(s) had been reclaimed by another worker")
+        self.queue.retry(failed, claim_token)
+        for collection_name, urls in posted.items():
+            mark_posted(get_collection(collection_name), urls)
+            JOBS_POSTED.inc(len(urls), collection=collection_name)
+
+    async def close(self):
+        if self._consumer is not None:
+            self._consumer.cancel()
+        await self.send_dispatcher.close()
+        close_clients()
+        if self.metrics_runner is not None:
+            await self.metrics_runner.cleanup()
+        await super().close()
+
+
+def main():
+    if not TOKEN:
+        print("ERROR: BOT_TOKEN not found in environment variables")
+        return
+
+    intents = discord.Intents.default()
+    intents.message_content = True
+    worker = ShardWorker(command_prefix="!", intents=intents, shard_ids=SHARD_IDS, shard_count=SHARD_COUNT)
+    print(f"Starting shard worker for shards {SHARD_IDS} of {SHARD_COUNT}...")
+    try:
+        worker.run(TOKEN)
+    except discord.LoginFailure:
+        print("ERROR: Invalid bot token")
+    except Exception as e:
+        print(f"ERROR starting worker: {str(e)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,128 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ASCENDING, DESCENDING, TEXT
+from pymongo.collation import Collation
 import os
+import threading
 
-def client():
-    return MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017/"))
+DB_NAME = "engjobs"
 
-def get_software_jobs_collection():
-    db = client()["engjobs"]
-    collection = db["software_jobs"]
+# Case-insensitive comparison for company lookups; queries must pass the same collation to use the index
+CASE_INSENSITIVE = Collation(locale="en", strength=2)
+
+# Process-wide registry: one pooled client per URI and one handle per collection
+_clients = {}
+_collections = {}
+_lock = threading.Lock()
+
+def client(uri: str = None) -> MongoClient:
+    """Return the shared MongoClient for uri, creating it lazily on first use"""
+    uri = uri or os.getenv("MONGO_URI", "mongodb://localhost:27017/")
+    with _lock:
+        if uri not in _clients:
+            _clients[uri] = MongoClient(
+                uri,
+                maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "20")),
+                minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+                serverSelectionTimeoutMS=int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000")),
+                connectTimeoutMS=int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000")),
+                socketTimeoutMS=int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000")),
+                connect=False  # Don't open sockets until the first operation
+            )
+        return _clients[uri]
+
+def get_collection(name: str):
+    """Return a cached handle for a collection in the jobs database"""
+    with _lock:
+        collection = _collections.get(name)
+    if collection is None:
+        collection = client()[DB_NAME][name]
+        with _lock:
+            collection = _collections.setdefault(name, collection)
     return collection
 
+def live_client_count() -> int:
+    """Number of MongoClients currently open in this process"""
+    with _lock:
+        return len(_clients)
+
+def close_clients():
+    """Close every shared client and drop cached collection handles"""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _collections.clear()
+    for c in clients:
+        c.close()
+
+def get_software_jobs_collection():
+    return get_collection("software_jobs")
+
 def get_engineering_jobs_collection():
-    db = client()["engjobs"]
-    collection = db["engineering_jobs"]
-    return collection   
+    return get_collection("engineering_jobs")
 
 def get_newgrad_software_jobs_collection():
-    db = client()["engjobs"]
-    collection = db["newgrad_software_jobs"]
-    return collection
+    return get_collection("newgrad_software_jobs")
 
 def get_newgrad_engineering_jobs_collection():
-    db = client()["engjobs"]
-    collection = db["newgrad_engineering_jobs"]
-    return collection
+    return get_collection("newgrad_engineering_jobs")
 
-def ensure_indexes():
-    """Create indexes for both collections if they don't exist"""
-    cols = [
+def get_repost_checkpoints_collection():
+    """Progress of interrupted !postalljobs runs, one document per channel"""
+    return get_collection("repost_checkpoints")
+
+def get_subscriptions_collection():
+    """Per-guild channel subscriptions and their filters, one document per channel"""
+    return get_collection("subscriptions")
+
+def get_leases_collection():
+    """Leadership leases, one document per lease name"""
+    return get_collection("leases")
+
+def get_job_queue_collection():
+    """Deliveries from the elected scraper to the shard workers"""
+    return get_collection("job_queue")
+
+def get_job_collections():
+    """All four job collections"""
+    return [
         get_software_jobs_collection(),
         get_engineering_jobs_collection(),
         get_newgrad_software_jobs_collection(),
         get_newgrad_engineering_jobs_collection()
     ]
-    # Create URL index for software jobs
-    for c in cols:
-        if "url_1" not in c.index_information():
+
+def ensure_indexes():
+    """Create the job collection, subscription and delivery queue indexes if they don't exist"""
+    subscriptions = get_subscriptions_collection()
+    if "channel_id_1" not in subscriptions.index_information():
+        subscriptions.create_index("channel_id", unique=True)
+
+    queue = get_job_queue_collection()
+    existing = queue.index_information()
+    if "key_1" not in existing:
+        queue.create_index("key", unique=True)
+    # Claim scans, oldest first per shard
+    if "shard_1_status_1__id_1" not in existing:
+        queue.create_index([("shard", ASCENDING), ("status", ASCENDING), ("_id", ASCENDING)])
+    if "claim_token_1" not in existing:
+        queue.create_index("claim_token", sparse=True)
+    # Finished deliveries are kept a week for inspection, their keys keep late duplicates out until then
+    if "done_at_1" not in existing:
+        queue.create_index("done_at", expireAfterSeconds=int(os.getenv("QUEUE_RETENTION_SECONDS", str(7 * 86400))))
+    for c in get_job_collections():
+        existing = c.index_information()
+        if "url_1" not in existing:
             c.create_index("url", unique=True)
+        # Newest-first listing and keyset pagination
+        if "date_posted_-1__id_-1" not in existing:
+            c.create_index([("date_posted", DESCENDING), ("_id", DESCENDING)])
+        if "company_ci_date" not in existing:
+            c.create_index([("company", ASCENDING), ("date_posted", DESCENDING), ("_id", DESCENDING)],
+                           name="company_ci_date", collation=CASE_INSENSITIVE)
+        if "role_type_1_date_posted_-1__id_-1" not in existing:
+            c.create_index([("role_type", ASCENDING), ("date_posted", DESCENDING), ("_id", DESCENDING)])
+        # Oldest-first scan of the jobs not posted yet, for !postalljobs
+        if "unposted_date" not in existing:
+            c.create_index([("posted_to_discord", ASCENDING), ("date_posted", ASCENDING), ("_id", ASCENDING)],
+                           name="unposted_date")
+        if "title_text" not in existing:
+            c.create_index([("title", TEXT)])
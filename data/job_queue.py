@@ -0,0 +1,168 @@
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+
+from data.db import get_job_queue_collection
+from data.models import JobPosting
+from data.persistence import failed_write_indexes
+from monitoring.metrics import mongo_op
+
+# A claimed delivery that is not completed within this long goes back to the queue
+CLAIM_SECONDS = int(os.getenv("QUEUE_CLAIM_SECONDS", "120"))
+# Deliveries that fail this many times are parked as failed
+MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", "5"))
+# A failed delivery waits this long before it can be claimed again
+RETRY_DELAY_SECONDS = int(os.getenv("QUEUE_RETRY_DELAY_SECONDS", "30"))
+
+
+def shard_for(guild_id: Optional[int], shard_count: int) -> int:
+    """Discord's shard for a guild; deliveries without a guild go to shard 0"""
+    if not guild_id or shard_count <= 1:
+        return 0
+    return (guild_id >> 22) % shard_count
+
+
+def delivery(job: JobPosting, channel_id: int, guild_id: Optional[int], shard_count: int,
+             collection: str, marks_posted: bool) -> Dict:
+    """
+    One job bound for one channel.
+    Args:
+        collection (str): Job collection the job is stored in
+        marks_posted (bool): Whether delivering it sets posted_to_discord on the stored job
+    """
+    return {
+        "key": f"{channel_id}:{job.url}",
+        "channel_id": channel_id,
+        "guild_id": guild_id,
+        "shard": shard_for(guild_id, shard_count),
+        "collection": collection,
+        "marks_posted": marks_posted,
+        "job": job.to_mongo(),
+    }
+
+
+class JobQueue:
+    """
+    Durable delivery queue in a MongoDB collection, between the elected
+    scraper and the shard workers.
+    The unique key (channel, url) makes enqueueing idempotent, so a delivery is
+    queued once however many producers emit it, including a producer that
+    lost the lease mid-cycle. Workers claim pending deliveries for their shards
+    in batches; a claim expires, so deliveries held by a worker that died are
+    picked up again. Completing or returning a delivery needs the claim token,
+    so a worker whose claim expired cannot overwrite the claim that replaced it.
+    """
+
+    def __init__(self, collection=None, claim_seconds: int = CLAIM_SECONDS, max_attempts: int = MAX_ATTEMPTS,
+                 retry_delay_seconds: int = RETRY_DELAY_SECONDS):
+        self.collection = collection if collection is not None else get_job_queue_collection()
+        self.claim_for = timedelta(seconds=claim_seconds)
+        self.max_attempts = max_attempts
+        self.retry_delay = timedelta(seconds=retry_delay_seconds)
+
+    def enqueue(self, deliveries: List[Dict], term: Optional[int] = None) -> int:
+        """
+        Queue deliveries, skipping any already queued.
+        Args:
+            term (int): Lease term of the producer, recorded on each delivery for tracing
+        Returns:
+            int: Number of deliveries newly queued
+        Raises:
+            BulkWriteError: When any delivery failed for a reason other than being queued already
+        """
+        if not deliveries:
+            return 0
+        now = datetime.now(timezone.utc)
+        operations = [
+            InsertOne(dict(item, status="pending", attempts=0, term=term, enqueued_at=now, available_at=now, claimed_until=None))
+            for item in deliveries
+        ]
+        try:
+            with mongo_op("bulk_write"):
+                return self.collection.bulk_write(operations, ordered=False).inserted_count
+        except BulkWriteError as e:
+            if failed_write_indexes(e):
+                raise
+            # Duplicate keys were already queued, everything else went in
+            return e.details.get("nInserted", 0)
+
+    def _claimable(self, shards: List[int], now: datetime) -> Dict:
+        return {
+            "shard": {"$in": shards},
+            "$or": [
+                {"status": "pending", "available_at": {"$lte": now}},
+                {"status": "claimed", "claimed_until": {"$lt": now}},
+            ],
+        }
+
+    def claim(self, worker: str, shards: List[int], limit: int = 50) -> List[Dict]:
+        """
+        Claim up to limit deliveries for the given shards, oldest first.
+        Three round trips whatever the batch size: pick candidates, claim the
+        ones still claimable under a fresh token, read back what the token won.
+        """
+        now = datetime.now(timezone.utc)
+        with mongo_op("find"):
+            candidates = [doc["_id"] for doc in self.collection.find(self._claimable(shards, now), {"_id": 1}).sort("_id", 1).limit(limit)]
+        if not candidates:
+            return []
+
+        token = f"{worker}:{uuid.uuid4().hex}"
+        claimable = dict(self._claimable(shards, now), _id={"$in": candidates})
+        with mongo_op("update_many"):
+            self.collection.update_many(claimable, {
+                "$set": {"status": "claimed", "claim_token": token, "claimed_by": worker, "claimed_until": now + self.claim_for},
+                "$inc": {"attempts": 1},
+            })
+        with mongo_op("find"):
+            return list(self.collection.find({"claim_token": token}).sort("_id", 1))
+
+    def _held(self, ids: List, claim_token: str) -> Dict:
+        """Deliveries among ids still claimed under claim_token"""
+        return {"_id": {"$in": ids}, "claim_token": claim_token, "status": "claimed"}
+
+    def complete(self, ids: List, claim_token: str) -> int:
+        """
+        Mark delivered entries done, unless their claim was lost meanwhile.
+        Returns:
+            int: Number of deliveries completed
+        """
+        if not ids:
+            return 0
+        with mongo_op("update_many"):
+            result = self.collection.update_many(
+                self._held(ids, claim_token),
+                {"$set": {"status": "done", "done_at": datetime.now(timezone.utc)}, "$unset": {"job": ""}}
+            )
+        return result.modified_count
+
+    def retry(self, ids: List, claim_token: str) -> int:
+        """
+        Return failed deliveries to the queue after the retry delay, or park them once they are out of attempts.
+        Deliveries whose claim was lost meanwhile are left to their new holder.
+        Returns:
+            int: Number of deliveries returned or parked
+        """
+        if not ids:
+            return 0
+        now = datetime.now(timezone.utc)
+        with mongo_op("update_many"):
+            parked = self.collection.update_many(
+                dict(self._held(ids, claim_token), attempts={"$gte": self.max_attempts}),
+                {"$set": {"status": "failed", "done_at": now}}
+            )
+        with mongo_op("update_many"):
+            returned = self.collection.update_many(
+                self._held(ids, claim_token),
+                {"$set": {"status": "pending", "available_at": now + self.retry_delay, "claimed_until": None}}
+            )
+        return parked.modified_count + returned.modified_count
+
+    def depth(self) -> Dict[str, int]:
+        """Deliveries per status"""
+        with mongo_op("aggregate"):
+            return {doc["_id"]: doc["count"] for doc in self.collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}])}
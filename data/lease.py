@@ -0,0 +1,81 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from data.db import get_leases_collection
+from monitoring.metrics import mongo_op
+
+# A holder that stops renewing for this long loses the lease
+LEASE_TTL_SECONDS = int(os.getenv("LEASE_TTL_SECONDS", "90"))
+
+
+class Lease:
+    """
+    Named leadership lease stored in MongoDB, held by at most one instance.
+    The holder renews it well inside the TTL; once it stops, any other instance
+    can take it over after expiry. Every change of holder increments term,
+    which identifies the leadership period in logs and on queued deliveries.
+    It is not a fencing token: a deposed holder can still write until it
+    notices, so its writes must be safe to repeat.
+    Instances' clocks are assumed to agree to within a small part of the TTL.
+    """
+
+    def __init__(self, name: str, holder: str, ttl_seconds: int = LEASE_TTL_SECONDS, collection=None):
+        self.name = name
+        self.holder = holder
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.collection = collection if collection is not None else get_leases_collection()
+        self.term: Optional[int] = None
+        self.expires_at: Optional[datetime] = None
+
+    def acquire(self) -> bool:
+        """Renew the lease if held, else take it over if it is free or expired"""
+        now = datetime.now(timezone.utc)
+        update = {"holder": self.holder, "expires_at": now + self.ttl, "renewed_at": now}
+        with mongo_op("find_one_and_update"):
+            doc = self.collection.find_one_and_update(
+                {"_id": self.name, "holder": self.holder, "expires_at": {"$gt": now}},
+                {"$set": update},
+                return_document=ReturnDocument.AFTER
+            )
+        if doc is None:
+            try:
+                with mongo_op("find_one_and_update"):
+                    # No match on a live lease makes the upsert collide on _id
+                    doc = self.collection.find_one_and_update(
+                        {"_id": self.name, "expires_at": {"$lte": now}},
+                        {"$set": update, "$inc": {"term": 1}},
+                        upsert=True,
+                        return_document=ReturnDocument.AFTER
+                    )
+            except DuplicateKeyError:
+                doc = None
+
+        if doc is None:
+            self.term = None
+            self.expires_at = None
+            return False
+        self.term = doc["term"]
+        self.expires_at = now + self.ttl
+        return True
+
+    def held(self) -> bool:
+        """Whether the last acquire() succeeded and has not run out since"""
+        return self.expires_at is not None and datetime.now(timezone.utc) < self.expires_at
+
+    def release(self):
+        """Give the lease up early so another instance can take over without waiting for the TTL"""
+        with mongo_op("update_one"):
+            self.collection.update_one(
+                {"_id": self.name, "holder": self.holder},
+                {"$set": {"expires_at": datetime.fromtimestamp(0, tz=timezone.utc)}}
+            )
+        self.term = None
+        self.expires_at = None
+
+    def owner(self) -> Optional[dict]:
+        with mongo_op("find_one"):
+            return self.collection.find_one({"_id": self.name})
@@ -1,16 +1,103 @@
 # data/models.py
 
-from datetime import datetime
-from typing import List
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
+
+
+def to_utc(value: Union[int, float, datetime, None], naive_is_local: bool = True) -> datetime:
+    """
+    Normalize a timestamp or datetime to an aware UTC datetime.
+    Naive datetimes are local time when they come from the scraper, and UTC
+    when they come back from MongoDB (pass naive_is_local=False).
+    """
+    if value is None:
+        return datetime.now(timezone.utc)
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    if value.tzinfo is None:
+        if naive_is_local:
+            return value.astimezone(timezone.utc)
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
 
 class JobPosting:
-    title: str
-    company: str
-    location: str
-    url: str
-    date_posted: datetime
-    role_type: str
-    majors: List[str]
-    description: str
-    source: str
-    posted_to_discord: bool
+    """One job posting as it flows from the scraper to MongoDB and Discord"""
+
+    __slots__ = (
+        "title",
+        "company",
+        "location",
+        "url",
+        "date_posted",
+        "role_type",
+        "majors",
+        "description",
+        "source",
+        "posted_to_discord",
+        "work_model",
+    )
+
+    def __init__(self, title: str, company: str, location: str, url: str,
+                 date_posted: datetime, role_type: str = "Internship",
+                 majors: Optional[List[str]] = None, description: str = "",
+                 source: str = "", posted_to_discord: bool = False,
+                 work_model: Optional[str] = ""):
+        self.title = title
+        self.company = company
+        self.location = location
+        self.url = url
+        self.date_posted = to_utc(date_posted)
+        self.role_type = role_type
+        self.majors = majors or []
+        self.description = description
+        self.source = source
+        self.posted_to_discord = posted_to_discord
+        self.work_model = work_model
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any], source_name: str) -> "JobPosting":
+        """Map a listings.json entry or parsed README row to a JobPosting"""
+        role_type = ("New Grad" if "New-Grad" in source_name or
+                     "Newgrad" in source_name else "Internship")
+        locations = raw.get("locations")
+
+        return cls(
+            title=raw.get("title", ""),
+            company=raw.get("company_name", raw.get("company", "")),
+            location=", ".join(locations) if locations else raw.get("location", ""),
+            url=raw.get("url", ""),
+            date_posted=raw.get("date_posted"),
+            role_type=role_type,
+            source=source_name,
+            work_model=raw.get("work_model", ""),
+        )
+
+    @classmethod
+    def from_mongo(cls, doc: Dict[str, Any]) -> "JobPosting":
+        """Build a JobPosting from a stored document"""
+        return cls(
+            title=doc.get("title", ""),
+            company=doc.get("company", ""),
+            location=doc.get("location", ""),
+            url=doc.get("url", ""),
+            date_posted=to_utc(doc.get("date_posted"), naive_is_local=False),
+            role_type=doc.get("role_type", "Internship"),
+            majors=doc.get("majors"),
+            description=doc.get("description", ""),
+            source=doc.get("source", ""),
+            posted_to_discord=doc.get("posted_to_discord", False),
+            work_model=doc.get("work_model", ""),
+        )
+
+    def to_mongo(self) -> Dict[str, Any]:
+        """Document stored in the jobs collections"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if not isinstance(other, JobPosting):
+            return NotImplemented
+        return self.to_mongo() == other.to_mongo()
+
+    def __repr__(self):
+        return f"JobPosting({self.company!r}, {self.title!r}, {self.url!r}, {self.date_posted.isoformat()})"
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Set
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from data.models import JobPosting
+from monitoring.metrics import mongo_op
+
+# MongoDB's error code for a unique index violation
+DUPLICATE_KEY = 11000
+
+
+def failed_write_indexes(error: BulkWriteError) -> Set[int]:
+    """Indexes of the operations in a bulk write that failed for a reason other than a duplicate key"""
+    return {
+        write_error["index"] for write_error in error.details.get("writeErrors", [])
+        if write_error.get("code") != DUPLICATE_KEY
+    }
+
+
+def upsert_new_jobs(collection, jobs: List[JobPosting]) -> List[JobPosting]:
+    """
+    Store jobs whose URL is not in the collection yet, in a single bulk_write.
+    Args:
+        collection: Target MongoDB collection
+        jobs (list): JobPostings bound for this collection
+    Returns:
+        list: Only the jobs that were newly inserted, in their original order
+    Raises:
+        BulkWriteError: When any row failed for a reason other than a duplicate url
+    """
+    if not jobs:
+        return []
+
+    operations = [
+        UpdateOne({"url": job.url}, {"$setOnInsert": job.to_mongo()}, upsert=True)
+        for job in jobs
+    ]
+    try:
+        with mongo_op("bulk_write"):
+            result = collection.bulk_write(operations, ordered=False)
+        upserted_indexes = result.upserted_ids.keys()
+    except BulkWriteError as e:
+        if failed_write_indexes(e):
+            raise
+        # Another writer won the race on the unique url index for some rows;
+        # the rest of the batch was still applied
+        upserted_indexes = [op["index"] for op in e.details.get("upserted", [])]
+
+    return [jobs[index] for index in sorted(upserted_indexes)]
+
+
+def store_new_jobs(collection, jobs: List[JobPosting], seen_urls=None) -> List[JobPosting]:
+    """
+    upsert_new_jobs behind the seen-URL filter: known URLs are dropped in
+    memory and only probable-new ones reach Mongo.
+    Returns:
+        list: Only the jobs that were newly inserted
+    """
+    if seen_urls is not None:
+        jobs = seen_urls.filter_new(jobs)
+    if not jobs:
+        return []
+    try:
+        new_jobs = upsert_new_jobs(collection, jobs)
+    except BulkWriteError as e:
+        if seen_urls is not None:
+            # Rows that failed are not in Mongo, so they must stay new for the next cycle
+            failed = failed_write_indexes(e)
+            seen_urls.mark_stored([job.url for index, job in enumerate(jobs) if index not in failed],
+                                  len(e.details.get("upserted", [])))
+        raise
+    if seen_urls is not None:
+        seen_urls.mark_stored([job.url for job in jobs], len(new_jobs))
+    return new_jobs
+
+
+def mark_posted(collection, urls: List[str]) -> int:
+    """Flip posted_to_discord for every given URL in one update_many"""
+    if not urls:
+        return 0
+    with mongo_op("update_many"):
+        result = collection.update_many(
+            {"url": {"$in": urls}},
+            {"$set": {"posted_to_discord": True}}
+        )
+    return result.modified_count
+
+
+def iter_recent_jobs(collections: Iterable, days: int) -> Iterator[JobPosting]:
+    """Stream stored jobs posted within the last N days from the given collections"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    for collection in collections:
+        for doc in collection.find({"date_posted": {"$gte": cutoff}}, {"_id": 0}):
+            yield JobPosting.from_mongo(doc)
@@ -0,0 +1,121 @@
+import re
+import heapq
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+
+from data.db import CASE_INSENSITIVE
+from data.models import JobPosting
+from monitoring.metrics import mongo_op
+
+PAGE_SIZE = 10
+
+# Only what the job embeds show, plus the pagination key
+EMBED_FIELDS = {
+    "_id": 1, "title": 1, "company": 1, "location": 1, "url": 1,
+    "date_posted": 1, "role_type": 1, "source": 1, "work_model": 1,
+}
+# Newest first; _id breaks ties between jobs posted at the same instant
+SORT = [("date_posted", -1), ("_id", -1)]
+
+
+def encode_cursor(doc: Dict) -> str:
+    """Opaque keyset cursor pointing just past doc"""
+    date_posted = doc["date_posted"]
+    if date_posted.tzinfo is None:
+        date_posted = date_posted.replace(tzinfo=timezone.utc)
+    return f"{int(date_posted.timestamp() * 1000)}-{doc['_id']}"
+
+
+def decode_cursor(token: str) -> Tuple[datetime, ObjectId]:
+    try:
+        millis, object_id = token.split("-", 1)
+        return datetime.fromtimestamp(int(millis) / 1000, tz=timezone.utc), ObjectId(object_id)
+    except Exception:
+        raise ValueError(f"Invalid page cursor: {token}")
+
+
+def build_filter(company: Optional[str] = None, since: Optional[datetime] = None,
+                 location: Optional[str] = None, role_type: Optional[str] = None,
+                 text: Optional[str] = None, after: Optional[str] = None) -> Dict:
+    """
+    MongoDB filter for a job search.
+    Args:
+        company (str): Exact company name, case-insensitive (served by the company_ci_date index)
+        since (datetime): Only jobs posted at or after this time
+        location (str): Case-insensitive substring of the location
+        role_type (str): "Internship" or "New Grad"
+        text (str): Words to match in the title (text index)
+        after (str): Keyset cursor from a previous page
+    """
+    query = {}
+    if company:
+        query["company"] = company
+    if role_type:
+        query["role_type"] = role_type
+    if since is not None:
+        query["date_posted"] = {"$gte": since}
+    if text:
+        query["$text"] = {"$search": text}
+    if location:
+        query["location"] = {"$regex": re.escape(location), "$options": "i"}
+    if after:
+        after_date, after_id = decode_cursor(after)
+        query.setdefault("$and", []).append({"$or": [
+            {"date_posted": {"$lt": after_date}},
+            {"date_posted": after_date, "_id": {"$lt": after_id}},
+        ]})
+    return query
+
+
+def _sort_key(doc: Dict):
+    date_posted = doc["date_posted"]
+    if date_posted.tzinfo is None:
+        date_posted = date_posted.replace(tzinfo=timezone.utc)
+    return (-date_posted.timestamp(), _negated(doc["_id"]))
+
+
+def _negated(object_id: ObjectId) -> bytes:
+    # ObjectIds compare by their bytes; inverting them gives descending order under heapq.merge
+    return bytes(255 - b for b in object_id.binary)
+
+
+def _page_docs(collections: Iterable, query: Dict, limit: int, projection: Dict) -> List[Dict]:
+    """The first limit documents across collections in SORT order"""
+    cursors = []
+    for collection in collections:
+        # Text search only runs under the simple collation, so company is matched exactly alongside it
+        options = {"collation": CASE_INSENSITIVE} if "company" in query and "$text" not in query else {}
+        with mongo_op("find"):
+            cursors.append(list(collection.find(query, projection, **options).sort(SORT).limit(limit)))
+    return list(heapq.merge(*cursors, key=_sort_key))[:limit]
+
+
+def find_jobs(collections: Iterable, limit: int = PAGE_SIZE, after: Optional[str] = None,
+              **filters) -> Tuple[List[JobPosting], Optional[str]]:
+    """
+    One page of matching jobs across the given collections, newest first.
+    Each collection returns at most limit documents from its index, projected to
+    the embed fields, and the pages are merged, so no collection is read in full.
+    Returns:
+        tuple: (jobs, cursor for the next page or None when this was the last one)
+    """
+    docs = _page_docs(collections, build_filter(after=after, **filters), limit + 1, EMBED_FIELDS)
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    return [JobPosting.from_mongo(doc) for doc in docs[:limit]], next_cursor
+
+
+def cursor_for_page(collections: Iterable, page: int, limit: int = PAGE_SIZE, **filters) -> Optional[str]:
+    """
+    Keyset cursor that starts page (1-based), found by walking the earlier pages
+    on keys only. Returns None when the results end before that page.
+    """
+    collections = list(collections)
+    after = None
+    for _ in range(page - 1):
+        docs = _page_docs(collections, build_filter(after=after, **filters), limit, {"_id": 1, "date_posted": 1})
+        if len(docs) < limit:
+            return None
+        after = encode_cursor(docs[-1])
+    return after
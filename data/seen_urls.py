@@ -0,0 +1,150 @@
+import os
+import math
+import struct
+import hashlib
+from typing import Iterable, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATH = os.path.join(PROJECT_ROOT, ".cache", "seen_urls.bin")
+
+_MAGIC = b"SEEN1"
+_HEADER = struct.Struct("<5sQIQQ")  # magic, bit count, hash count, digest count, stored doc count
+
+
+def _digest(url: str) -> bytes:
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 16-byte digests (double hashing)"""
+
+    def __init__(self, capacity: int = 200_000, error_rate: float = 0.001, bits: int = None, hashes: int = None):
+        self.bits = bits or max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = hashes or max(1, round(self.bits / capacity * math.log(2)))
+        self.array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, digest: bytes):
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add_digest(self, digest: bytes):
+        for position in self._positions(digest):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def contains_digest(self, digest: bytes) -> bool:
+        return all(self.array[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+    def add(self, url: str):
+        self.add_digest(_digest(url))
+
+    def __contains__(self, url: str) -> bool:
+        return self.contains_digest(_digest(url))
+
+    def expected_error_rate(self, count: int) -> float:
+        return (1 - math.exp(-self.hashes * count / self.bits)) ** self.hashes
+
+
+class SeenURLs:
+    """
+    In-process filter of URLs already stored in MongoDB.
+    A Bloom filter answers "definitely new" without touching the exact set; a
+    positive is confirmed against an exact set of 8-byte URL digests, so known
+    URLs are rejected with no database I/O and a Bloom false positive still
+    goes to Mongo. Both structures are persisted to disk for fast restarts.
+    """
+
+    def __init__(self, path: str = None, capacity: int = 200_000, error_rate: float = 0.001):
+        self.path = path or os.getenv("SEEN_URLS_PATH", DEFAULT_PATH)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.exact = set()
+        self.stored_count = 0
+        self.stats = {"hits": 0, "misses": 0, "false_positives": 0}
+
+    def __len__(self):
+        return len(self.exact)
+
+    def is_known(self, url: str) -> bool:
+        digest = _digest(url)
+        if not self.bloom.contains_digest(digest):
+            self.stats["misses"] += 1
+            return False
+        if digest[:8] in self.exact:
+            self.stats["hits"] += 1
+            return True
+        self.stats["false_positives"] += 1
+        return False
+
+    def add(self, url: str):
+        digest = _digest(url)
+        if digest[:8] not in self.exact:
+            self.exact.add(digest[:8])
+            self.bloom.add_digest(digest)
+
+    def add_many(self, urls: Iterable[str]):
+        for url in urls:
+            self.add(url)
+
+    def filter_new(self, jobs: List) -> List:
+        """Jobs whose URL is not known to be stored yet"""
+        return [job for job in jobs if not self.is_known(job.url)]
+
+    def warm(self, collections: Iterable) -> int:
+        """Load every stored URL from the given collections; returns the number of URLs"""
+        self.bloom = BloomFilter(self.capacity, self.error_rate)
+        self.exact = set()
+        stored_count = 0
+        for collection in collections:
+            for doc in collection.find({}, {"url": 1, "_id": 0}):
+                if doc.get("url"):
+                    self.add(doc["url"])
+                    stored_count += 1
+        self.stored_count = stored_count
+        return stored_count
+
+    def warm_or_load(self, collections: List) -> str:
+        """
+        Use the on-disk snapshot when it still matches the stored document count,
+        otherwise rebuild from MongoDB. Returns "disk" or "mongo".
+        """
+        expected = sum(collection.estimated_document_count() for collection in collections)
+        if self.load() and self.stored_count == expected:
+            return "disk"
+        self.warm(collections)
+        self.save()
+        return "mongo"
+
+    def mark_stored(self, urls: Iterable[str], inserted: int):
+        """Record URLs now present in MongoDB, inserted of them being new documents"""
+        self.add_many(urls)
+        self.stored_count += inserted
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.bloom.bits, self.bloom.hashes, len(self.exact), self.stored_count))
+            f.write(self.bloom.array)
+            f.write(b"".join(self.exact))
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> bool:
+        try:
+            with open(self.path, "rb") as f:
+                magic, bits, hashes, digest_count, stored_count = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC:
+                    return False
+                bloom = BloomFilter(bits=bits, hashes=hashes)
+                bloom.array = bytearray(f.read(len(bloom.array)))
+                digests = f.read(digest_count * 8)
+        except (OSError, struct.error):
+            return False
+        if len(digests) != digest_count * 8 or len(bloom.array) != (bits + 7) // 8:
+            return False
+        self.bloom = bloom
+        self.exact = {digests[i:i + 8] for i in range(0, len(digests), 8)}
+        self.stored_count = stored_count
+        return True
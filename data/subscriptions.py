@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from data.db import get_subscriptions_collection
+from monitoring.metrics import mongo_op
+
+FILTER_FIELDS = ("role_types", "locations", "companies", "exclude_companies", "keywords")
+
+
+class Subscription:
+    """
+    One guild channel that receives jobs, with its filters.
+    Empty filter lists match everything; within a list any entry may match.
+    """
+
+    __slots__ = ("guild_id", "channel_id") + FILTER_FIELDS
+
+    def __init__(self, guild_id: int, channel_id: int, role_types: Optional[List[str]] = None,
+                 locations: Optional[List[str]] = None, companies: Optional[List[str]] = None,
+                 exclude_companies: Optional[List[str]] = None, keywords: Optional[List[str]] = None):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.role_types = role_types or []
+        self.locations = locations or []
+        self.companies = companies or []
+        self.exclude_companies = exclude_companies or []
+        self.keywords = keywords or []
+
+    @classmethod
+    def from_mongo(cls, doc: Dict) -> "Subscription":
+        return cls(doc["guild_id"], doc["channel_id"], **{name: doc.get(name) for name in FILTER_FIELDS})
+
+    def to_mongo(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def describe(self) -> str:
+        parts = [f"{name.replace('_', ' ')}: {', '.join(getattr(self, name))}" for name in FILTER_FIELDS if getattr(self, name)]
+        return "\n".join(parts) or "all jobs"
+
+    def __repr__(self):
+        return f"Subscription(guild={self.guild_id}, channel={self.channel_id})"
+
+
+def load_subscriptions(collection=None) -> Iterator[Subscription]:
+    collection = collection if collection is not None else get_subscriptions_collection()
+    with mongo_op("find"):
+        docs = list(collection.find({}, {"_id": 0}))
+    return (Subscription.from_mongo(doc) for doc in docs)
+
+
+def save_subscription(subscription: Subscription, collection=None):
+    """Create or replace the subscription of subscription.channel_id"""
+    collection = collection if collection is not None else get_subscriptions_collection()
+    doc = dict(subscription.to_mongo(), updated_at=datetime.now(timezone.utc))
+    with mongo_op("replace_one"):
+        collection.replace_one({"channel_id": subscription.channel_id}, doc, upsert=True)
+
+
+def delete_subscription(channel_id: int, collection=None) -> bool:
+    collection = collection if collection is not None else get_subscriptions_collection()
+    with mongo_op("delete_one"):
+        return collection.delete_one({"channel_id": channel_id}).deleted_count > 0
@@ -0,0 +1,172 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+# Latency buckets in seconds, from a cached parse up to a slow cycle
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: Tuple, extra: Tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def values(self) -> Dict[Tuple, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(key)} {value}" for key, value in sorted(self.values().items())]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the with-block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def summary(self) -> Dict[Tuple, Tuple[int, float]]:
+        """label key -> (count, sum)"""
+        with self._lock:
+            return {key: (int(series[-2]), series[-1]) for key, series in self._values.items()}
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._values.items()}
+        lines = []
+        for key, series in sorted(snapshot.items()):
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', repr(float(bound))),))} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {series[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series[-2]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series[-1]}")
+        return lines
+
+
+class Registry:
+    """Named metrics rendered together in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, documentation))
+
+    def histogram(self, name: str, documentation: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, documentation, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# Scraping
+FETCH_SECONDS = REGISTRY.histogram("jobbot_fetch_seconds", "Per-source fetch and parse latency")
+FETCH_BYTES = REGISTRY.counter("jobbot_fetch_bytes_total", "Response body bytes read per source")
+FETCH_RESULTS = REGISTRY.counter("jobbot_fetch_results_total", "Source fetches by outcome (ok, error, timeout, skipped)")
+NOT_MODIFIED = REGISTRY.counter("jobbot_fetch_not_modified_total", "Source fetches answered with 304 Not Modified")
+ROWS_PARSED = REGISTRY.counter("jobbot_rows_parsed_total", "Raw rows parsed per source")
+ROWS_FILTERED = REGISTRY.counter("jobbot_rows_filtered_total", "Raw rows dropped before mapping, by source and stage (unchanged, too_old)")
+DEDUP_HITS = REGISTRY.counter("jobbot_dedup_hits_total", "Cross-source duplicates dropped, by match kind")
+CYCLE_SECONDS = REGISTRY.histogram("jobbot_cycle_seconds", "Scrape cycle latency, all due sources")
+
+# MongoDB
+MONGO_ROUND_TRIPS = REGISTRY.counter("jobbot_mongo_round_trips_total", "MongoDB round trips by operation")
+MONGO_SECONDS = REGISTRY.histogram("jobbot_mongo_seconds", "MongoDB operation latency by operation")
+
+# Discord
+SEND_SECONDS = REGISTRY.histogram("jobbot_discord_send_seconds", "Latency of one Discord message send")
+SEND_RESULTS = REGISTRY.counter("jobbot_discord_messages_total", "Discord message sends by outcome (ok, rate_limited, failed)")
+JOBS_POSTED = REGISTRY.counter("jobbot_jobs_posted_total", "Jobs delivered to Discord per collection")
+
+
+@contextmanager
+def mongo_op(operation: str):
+    """Count one MongoDB round trip and time it"""
+    MONGO_ROUND_TRIPS.inc(operation=operation)
+    with MONGO_SECONDS.time(operation=operation):
+        yield
+
+
+async def start_http_server(host: str = METRICS_HOST, port: int = METRICS_PORT, registry: Registry = REGISTRY) -> Optional[web.AppRunner]:
+    """Serve /metrics in the Prometheus text format on the running loop; port 0 disables it"""
+    if not port:
+        return None
+
+    async def handle_metrics(request):
+        return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"Metrics available at http://{host}:{port}/metrics")
+    return runner
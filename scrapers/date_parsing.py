@@ -0,0 +1,119 @@
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
+
+PREFIX_RE = re.compile(r'^(posted|updated|added):\s*', re.IGNORECASE)
+SUFFIX_RE = re.compile(r'\s*(ago|old)$', re.IGNORECASE)
+RELATIVE_RE = re.compile(r'(\d+)\s*(day|week|month)s?', re.IGNORECASE)
+
+# Shape of the string -> the only formats that can match it, in the original order
+MONTH_DAY_RE = re.compile(r'^([A-Za-z]{3})\s+(\d{1,2})$')
+SHAPE_FORMATS = [
+    (re.compile(r'^[A-Za-z]+\s+\d{1,2},\s*\d{4}$'), ['%b %d, %Y', '%B %d, %Y']),
+    (re.compile(r'^\d{1,2}/\d{1,2}/\d{4}$'), ['%m/%d/%Y', '%d/%m/%Y']),
+    (re.compile(r'^\d{4}-\d{1,2}-\d{1,2}$'), ['%Y-%m-%d']),
+    (re.compile(r'^\d{1,2}-\d{1,2}-\d{4}$'), ['%d-%m-%Y', '%m-%d-%Y']),
+    (re.compile(r'^\d{4}/\d{1,2}/\d{1,2}$'), ['%Y/%m/%d']),
+]
+
+# Common date formats, tried in turn when the shape is not recognised
+FORMATS = [
+    '%b %d, %Y',      # Dec 18, 2024
+    '%B %d, %Y',      # December 18, 2024
+    '%m/%d/%Y',       # 12/18/2024
+    '%Y-%m-%d',       # 2024-12-18
+    '%d-%m-%Y',       # 18-12-2024
+    '%m-%d-%Y',       # 12-18-2024
+    '%Y/%m/%d',       # 2024/12/18
+    '%d/%m/%Y',       # 18/12/2024
+]
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+RELATIVE_UNITS = {'day': 1, 'week': 7, 'month': 30}
+
+# Anything unparseable is assumed to be recent (within last week)
+FALLBACK_AGE = timedelta(days=7)
+
+
+@lru_cache(maxsize=4096)
+def normalize_date_string(date_str: str) -> str:
+    date_str = date_str.strip()
+    date_str = PREFIX_RE.sub('', date_str)
+    return SUFFIX_RE.sub('', date_str)
+
+
+def _month_day(month: int, day: int, today: date) -> datetime:
+    """'Jun 19' style dates belong to the current year unless that would be in the future"""
+    date_obj = datetime(today.year, month, day)
+    if date_obj.date() > today:
+        date_obj = date_obj.replace(year=today.year - 1)
+    return date_obj
+
+
+@lru_cache(maxsize=4096)
+def _parse_normalized(date_str: str, today: date) -> Tuple[str, object]:
+    """
+    Parse a normalized date string relative to a reference day.
+    Returns:
+        tuple: ('relative', timedelta) for ages like '3 days', ('absolute', datetime) for dates,
+        ('unparsed', FALLBACK_AGE) when nothing matched.
+        Relative results are applied to the caller's "now", so caching them is safe.
+    """
+    relative_match = RELATIVE_RE.search(date_str)
+    if relative_match:
+        num = int(relative_match.group(1))
+        unit = relative_match.group(2).lower()
+        return 'relative', timedelta(days=num * RELATIVE_UNITS[unit])
+
+    month_day_match = MONTH_DAY_RE.match(date_str)
+    if month_day_match and month_day_match.group(1).lower() in MONTHS:
+        try:
+            month = MONTHS[month_day_match.group(1).lower()]
+            return 'absolute', _month_day(month, int(month_day_match.group(2)), today)
+        except ValueError:
+            pass
+
+    formats = FORMATS
+    for shape_re, shape_formats in SHAPE_FORMATS:
+        if shape_re.match(date_str):
+            formats = shape_formats
+            break
+    else:
+        # Unknown shape, fall back to the full original sequence
+        try:
+            date_obj = datetime.strptime(date_str, '%b %d')
+            return 'absolute', _month_day(date_obj.month, date_obj.day, today)
+        except ValueError:
+            pass
+
+    for fmt in formats:
+        try:
+            return 'absolute', datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+
+    return 'unparsed', FALLBACK_AGE
+
+
+def parse_date(date_str: str, now: Optional[datetime] = None, strict: bool = False) -> datetime:
+    """
+    Try to parse various date formats, including incomplete dates like 'Jun 19' and ages like '3 days ago'.
+    Unparseable strings are taken as FALLBACK_AGE old, or raise ValueError when strict is set.
+    """
+    now = now or datetime.now()
+    kind, value = _parse_normalized(normalize_date_string(date_str), now.date())
+    if kind == 'unparsed' and strict:
+        raise ValueError(f"Unrecognised date \"{date_str}\"")
+    if kind != 'absolute':
+        return now - value
+    return value
+
+
+def cache_info():
+    """LRU statistics of the normalized-string cache"""
+    return _parse_normalized.cache_info()
@@ -0,0 +1,230 @@
+import re
+import time
+import hashlib
+import zlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from data.models import JobPosting
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'ref', 'referrer', 'source', 'src', 'gh_src', 'lever-source', 'lever-origin',
+    'gclid', 'fbclid', 'mc_cid', 'mc_eid', 'trk', 'trackingid',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+COMPANY_SUFFIXES = {'inc', 'llc', 'ltd', 'corp', 'corporation', 'co', 'company', 'plc', 'gmbh', 'lp'}
+NON_WORD_RE = re.compile(r'[^a-z0-9]+')
+
+# MinHash / LSH parameters: 32 one-permutation-hashing bins in 8 bands of 4
+NUM_PERM = 32
+BANDS = 8
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+# Offset added per step when an empty bin borrows from its right neighbour
+_DENSIFY_OFFSET = 1 << 32
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize scheme and host, drop tracking parameters, fragments and trailing slashes"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.hostname or ""
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def _words(text: str) -> List[str]:
+    return NON_WORD_RE.sub(' ', text.lower()).split()
+
+
+def normalize_company(company: str) -> str:
+    words = [w for w in _words(company) if w not in COMPANY_SUFFIXES]
+    return ' '.join(words)
+
+
+def normalize_title(title: str) -> str:
+    return ' '.join(_words(title))
+
+
+def normalize_location(location: str) -> str:
+    """Order-independent form of a comma separated location list"""
+    places = [' '.join(_words(place)) for place in (location or "").split(',')]
+    return '|'.join(sorted(p for p in places if p))
+
+
+def signature(job: JobPosting) -> bytes:
+    """8-byte hash of the normalized (company, title, location) triple"""
+    key = f"{normalize_company(job.company)}\x1f{normalize_title(job.title)}\x1f{normalize_location(job.location)}"
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+
+
+def minhash(text: str) -> Tuple[int, ...]:
+    """
+    One-permutation MinHash of the character shingles of a normalized title.
+    Each shingle is hashed once and binned; empty bins are filled from the next
+    non-empty bin to the right (densification) so every position is comparable.
+    """
+    text = f" {text} "
+    bins = [None] * NUM_PERM
+    for i in range(max(1, len(text) - SHINGLE_SIZE + 1)):
+        h = zlib.crc32(text[i:i + SHINGLE_SIZE].encode('utf-8'))
+        index, value = h % NUM_PERM, h // NUM_PERM
+        if bins[index] is None or value < bins[index]:
+            bins[index] = value
+
+    # Text always has at least one shingle, so some bin is filled
+    dense = list(bins)
+    for i in range(NUM_PERM):
+        if bins[i] is None:
+            distance = 1
+            while bins[(i + distance) % NUM_PERM] is None:
+                distance += 1
+            dense[i] = bins[(i + distance) % NUM_PERM] + distance * _DENSIFY_OFFSET
+    return tuple(dense)
+
+
+def similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(1 for x, y in zip(left, right) if x == y) / NUM_PERM
+
+
+class _Entry:
+    __slots__ = ('url', 'signature', 'company', 'locations', 'minhash', 'date_posted')
+
+    def __init__(self, url, signature, company, locations, minhash, date_posted):
+        self.url = url
+        self.signature = signature
+        self.company = company
+        self.locations = locations
+        self.minhash = minhash
+        self.date_posted = date_posted
+
+
+class DedupIndex:
+    """
+    Cross-source duplicate index.
+    A posting is a duplicate when its canonical URL was already seen under a different
+    raw URL, when its (company, title, location) signature matches, or when a posting
+    from the same company has a near-identical title (MinHash LSH) and overlapping locations.
+    """
+
+    def __init__(self, threshold: float = 0.8, max_age_days: int = 30):
+        self.threshold = threshold
+        self.max_age_days = max_age_days
+        self._by_url: Dict[str, _Entry] = {}
+        self._by_signature: Dict[bytes, str] = {}
+        self._buckets: Dict[Tuple, Set[str]] = {}
+        self.stats = {'url_hits': 0, 'signature_hits': 0, 'near_hits': 0, 'misses': 0}
+
+    def __len__(self):
+        return len(self._by_url)
+
+    def _bands(self, company: str, hashes: Tuple[int, ...]):
+        for band in range(BANDS):
+            start = band * ROWS_PER_BAND
+            yield (company, band, hashes[start:start + ROWS_PER_BAND])
+
+    def _describe(self, job: JobPosting) -> Tuple[str, _Entry]:
+        company = normalize_company(job.company)
+        return canonicalize_url(job.url), _Entry(
+            url=job.url,
+            signature=signature(job),
+            company=company,
+            locations=set(normalize_location(job.location).split('|')) - {''},
+            minhash=minhash(normalize_title(job.title)),
+            date_posted=job.date_posted.timestamp(),
+        )
+
+    def _match(self, canonical: str, entry: _Entry) -> Optional[str]:
+        existing = self._by_url.get(canonical)
+        if existing is not None:
+            if existing.url == entry.url:
+                # The same posting seen again, not a duplicate of itself
+                self.stats['misses'] += 1
+                return None
+            self.stats['url_hits'] += 1
+            return existing.url
+
+        match = self._by_signature.get(entry.signature)
+        if match is not None:
+            self.stats['signature_hits'] += 1
+            return self._by_url[match].url
+
+        candidates = set()
+        for key in self._bands(entry.company, entry.minhash):
+            candidates.update(self._buckets.get(key, ()))
+        for candidate_url in candidates:
+            candidate = self._by_url[candidate_url]
+            if entry.locations and candidate.locations and not (entry.locations & candidate.locations):
+                continue
+            if similarity(entry.minhash, candidate.minhash) >= self.threshold:
+                self.stats['near_hits'] += 1
+                return candidate.url
+
+        self.stats['misses'] += 1
+        return None
+
+    def _insert(self, canonical: str, entry: _Entry):
+        if canonical in self._by_url:
+            return
+        self._by_url[canonical] = entry
+        self._by_signature.setdefault(entry.signature, canonical)
+        for key in self._bands(entry.company, entry.minhash):
+            self._buckets.setdefault(key, set()).add(canonical)
+
+    def find_duplicate(self, job: JobPosting) -> Optional[str]:
+        """Return the stored raw URL of an earlier posting this job duplicates, or None"""
+        return self._match(*self._describe(job))
+
+    def add(self, job: JobPosting):
+        self._insert(*self._describe(job))
+
+    def check_and_add(self, job: JobPosting) -> Optional[str]:
+        """find_duplicate, then index the job when it is not a duplicate"""
+        canonical, entry = self._describe(job)
+        duplicate_of = self._match(canonical, entry)
+        if duplicate_of is None:
+            self._insert(canonical, entry)
+        return duplicate_of
+
+    def discard(self, job: JobPosting):
+        """Forget a job check_and_add indexed, when it ends up not being kept"""
+        canonical = canonicalize_url(job.url)
+        entry = self._by_url.get(canonical)
+        if entry is not None and entry.url == job.url:
+            self._remove(canonical)
+
+    def warm(self, jobs: Iterable[JobPosting]) -> int:
+        """Index historical jobs; returns how many were added"""
+        count = len(self)
+        for job in jobs:
+            self.add(job)
+        return len(self) - count
+
+    def prune(self):
+        """Forget postings older than max_age_days so the index stays bounded"""
+        cutoff = time.time() - self.max_age_days * 86400
+        for canonical in [url for url, entry in self._by_url.items() if entry.date_posted < cutoff]:
+            self._remove(canonical)
+
+    def _remove(self, canonical: str):
+        entry = self._by_url.pop(canonical)
+        if self._by_signature.get(entry.signature) == canonical:
+            del self._by_signature[entry.signature]
+        for key in self._bands(entry.company, entry.minhash):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(canonical)
+                if not bucket:
+                    del self._buckets[key]
@@ -0,0 +1,79 @@
+import os
+import json
+import hashlib
+from typing import Dict, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache", "http")
+
+
+class HTTPCache:
+    """
+    Persistent on-disk cache of source bodies keyed by URL.
+
+    Each entry keeps the ETag/Last-Modified validators the server sent along
+    with the last body, so the next request can be made conditional and a
+    304 Not Modified can be answered from disk.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or os.getenv("HTTP_CACHE_DIR", DEFAULT_CACHE_DIR)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".body"
+
+    def _write_atomic(self, path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def load_meta(self, url: str) -> Dict:
+        meta_path, body_path = self._paths(url)
+        if not os.path.exists(body_path):
+            return {}
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Headers that turn the next request for url into a conditional GET"""
+        meta = self.load_meta(url)
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load_body(self, url: str) -> Optional[bytes]:
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url: str, headers, body: bytes):
+        """Save a 200 response body with its validators"""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        meta_path, body_path = self._paths(url)
+        if not etag and not last_modified:
+            # Nothing to revalidate with, so there is no point keeping the body
+            self.remove(url)
+            return
+        meta = {"url": url, "etag": etag, "last_modified": last_modified}
+        self._write_atomic(body_path, body)
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def remove(self, url: str):
+        """Forget the body and validators stored for url"""
+        for path in self._paths(url):
+            if os.path.exists(path):
+                os.remove(path)
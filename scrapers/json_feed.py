@@ -0,0 +1,93 @@
+import json
+from typing import Any, Dict, List, Optional
+
+# Optional fast decoders - the stdlib json module is used when neither is installed
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The only listings.json fields JobPosting.from_raw reads
+MAPPED_FIELDS = ('title', 'company_name', 'locations', 'url', 'date_posted')
+
+
+if msgspec is not None:
+    class Listing(msgspec.Struct):
+        """Projection of a listings.json entry; every other key is skipped while decoding"""
+        title: Optional[str] = ""
+        company_name: Optional[str] = ""
+        locations: Optional[List[str]] = None
+        url: Optional[str] = ""
+        date_posted: Optional[float] = None
+        active: Optional[bool] = True
+        is_visible: Optional[bool] = True
+
+    _listings_decoder = msgspec.json.Decoder(List[Listing])
+
+
+def _keep(date_posted: Any, active: Any, is_visible: Any, cutoff: Optional[float]) -> bool:
+    """Closed or hidden postings and anything older than cutoff are dropped"""
+    # Intended change from the old fetch_github_json + filter_recent_jobs path, which posted
+    # closed and hidden listings as long as they were recent; only an explicit False drops one
+    if active is False or is_visible is False:
+        return False
+    if cutoff is None:
+        return True
+    return isinstance(date_posted, (int, float)) and date_posted >= cutoff
+
+
+def _decode_with_msgspec(body: bytes, cutoff: Optional[float]) -> List[Dict]:
+    return [
+        {
+            'title': listing.title or "",
+            'company_name': listing.company_name or "",
+            'locations': listing.locations or [],
+            'url': listing.url or "",
+            'date_posted': int(listing.date_posted),
+        }
+        for listing in _listings_decoder.decode(body)
+        if listing.date_posted is not None
+        and _keep(listing.date_posted, listing.active, listing.is_visible, cutoff)
+    ]
+
+
+def _decode_generic(body: bytes, cutoff: Optional[float]) -> List[Dict]:
+    entries = orjson.loads(body) if orjson is not None else json.loads(body)
+    return [
+        {field: entry[field] for field in MAPPED_FIELDS if field in entry}
+        for entry in entries
+        if 'date_posted' in entry
+        and _keep(entry['date_posted'], entry.get('active'), entry.get('is_visible'), cutoff)
+    ]
+
+
+def decode_listings(body: bytes, cutoff: Optional[float] = None) -> List[Dict]:
+    """
+    Decode a listings.json body into compact raw rows.
+    Args:
+        body (bytes): Raw listings.json content
+        cutoff (float): Drop entries whose date_posted (epoch seconds) is older than this
+    Returns:
+        list: Rows holding only the fields map_job uses. Entries flagged active: false or
+        is_visible: false are left out; entries without the flags are kept
+    """
+    if msgspec is not None:
+        try:
+            return _decode_with_msgspec(body, cutoff)
+        except msgspec.ValidationError:
+            # Unexpected field types somewhere in the feed, take the untyped path
+            pass
+    return _decode_generic(body, cutoff)
+
+
+def decoder_name() -> str:
+    if msgspec is not None:
+        return "msgspec"
+    if orjson is not None:
+        return "orjson"
+    return "json"
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, Optional
+
+# Tables are ordered newest-first; stop once this many rows in a row fall outside the window
+EARLY_STOP_AFTER_OLD_ROWS = 5
+
+HEADER_KEYWORDS = ['company', 'position', 'location', 'application', 'job title']
+NO_LOCATION_VALUES = ['n/a', '', 'remote', 'various']
+
+
+class MarkdownTableParser:
+    """
+    Push parser for the job tables in GitHub READMEs.
+    Lines are fed one at a time and a job dict is returned as soon as a row
+    is complete, so callers can stream a response body through it. When a
+    days window is given, `done` turns True once the newest-first table has
+    moved past the cutoff and the rest of the body can be skipped.
+    """
+
+    def __init__(self, scraper, table_format: str = 'default', days: Optional[int] = None, limit: Optional[int] = None):
+        self.scraper = scraper
+        self.table_format = table_format
+        self.cutoff = (datetime.now() - timedelta(days=days)).timestamp() if days is not None else None
+        self.limit = limit
+        self.emitted = 0
+        self.header_found = False
+        self.last_company = None
+        self.old_rows = 0
+        self.done = False
+
+    def feed(self, line: str) -> Optional[Dict]:
+        """Consume one line of markdown and return the job it completes, if any"""
+        line = line.strip()
+        if not line or not (line.startswith('|') and line.endswith('|')):
+            return None
+
+        columns = [col.strip() for col in line[1:-1].split('|')]
+
+        if not self.header_found:
+            if any(keyword in ' '.join(columns).lower() for keyword in HEADER_KEYWORDS):
+                self.header_found = True
+                return None
+
+        if self.header_found and all('---' in col or col == '' for col in columns):
+            return None
+
+        if not self.header_found or len(columns) < 3:
+            return None
+
+        try:
+            if self.table_format == 'jobright':
+                job_entry = self._parse_jobright_row(columns)
+            else:
+                job_entry = self._parse_default_row(columns)
+        except Exception as e:
+            print(f"Error parsing row: {line}, Error: {str(e)}")
+            return None
+
+        if job_entry is None:
+            return None
+
+        if self.cutoff is not None:
+            if job_entry['date_posted'] < self.cutoff:
+                self.old_rows += 1
+                if self.old_rows >= EARLY_STOP_AFTER_OLD_ROWS:
+                    self.done = True
+                return None
+            self.old_rows = 0
+
+        self.emitted += 1
+        if self.limit is not None and self.emitted >= self.limit:
+            # Tables are newest first, so no later row can make the top `limit`
+            self.done = True
+        return job_entry
+
+    def _parse_date_column(self, date_posted: str) -> datetime:
+        try:
+            if date_posted:
+                return self.scraper._parse_date(date_posted)
+            return datetime.now()
+        except Exception:
+            return datetime.now()
+
+    def _parse_jobright_row(self, columns) -> Optional[Dict]:
+        if len(columns) < 5:
+            print(f"WARNING: Skipping row with only {len(columns)} columns: {columns}")
+            return None
+
+        company = columns[0].strip()
+        if company == '↳' and self.last_company:
+            company = self.last_company
+        else:
+            self.last_company = company if company and company != '↳' else self.last_company
+
+        position = columns[1].strip()
+        location = columns[2].strip()
+        work_model = columns[3].strip()
+        date_posted = columns[4].strip()
+
+        url = self.scraper._extract_url_from_markdown(position)
+        position = self.scraper._clean_position_text(position)
+        company = self.scraper._clean_position_text(company)
+
+        if not company or not position or company.lower() in ['company', 'name']:
+            return None
+        if not url:
+            return None
+
+        date_obj = self._parse_date_column(date_posted)
+        return {
+            'title': position,
+            'company_name': company,
+            'locations': [location] if location and location.lower() not in NO_LOCATION_VALUES else [],
+            'url': url,
+            'date_posted': int(date_obj.timestamp()),
+            'work_model': work_model
+        }
+
+    def _parse_default_row(self, columns) -> Optional[Dict]:
+        company = columns[0].strip()
+        position = columns[1].strip()
+        location = columns[2].strip() if len(columns) > 2 else ""
+        application_info = columns[3].strip() if len(columns) > 3 else ""
+        date_posted = columns[4].strip() if len(columns) > 4 else ""
+        url = self.scraper._extract_url_from_markdown(application_info)
+
+        if not company or not position or company.lower() in ['company', 'name']:
+            return None
+
+        date_obj = self._parse_date_column(date_posted)
+        return {
+            'title': position,
+            'company_name': company,
+            'locations': [location] if location and location.lower() not in NO_LOCATION_VALUES else [],
+            'url': url,
+            'date_posted': int(date_obj.timestamp()),
+            'work_model': None
+        }
+
+
+def iter_markdown_table(scraper, lines: Iterable[str], table_format: str = 'default',
+                        days: Optional[int] = None, limit: Optional[int] = None) -> Iterator[Dict]:
+    """Yield job dicts from an iterable of markdown lines, stopping early past the days cutoff or after limit rows"""
+    parser = MarkdownTableParser(scraper, table_format, days, limit)
+    for line in lines:
+        job_entry = parser.feed(line)
+        if job_entry is not None:
+            yield job_entry
+        if parser.done:
+            return
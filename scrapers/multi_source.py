@@ -1,388 +1,519 @@
 import requests
-import re
+import aiohttp
+import asyncio
+import io
+import json
 import time
-import concurrent.futures
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from scrapers.http_cache import HTTPCache
+from scrapers.markdown_table import MarkdownTableParser, iter_markdown_table
+from scrapers.text_cleaning import strip_html, clean_text, extract_url
+from scrapers.date_parsing import parse_date
+from scrapers.json_feed import decode_listings
+from scrapers.dedup import DedupIndex
+from scrapers.snapshot import RowSnapshot
+from scrapers.source_registry import load_sources, load_destinations
+from scrapers.selection import SelectionPolicy, top_recent_rows
+from scrapers.parse_pool import ParsePool
+from scrapers.resilience import CircuitBreakers, backoff_delays, is_transient, CONNECT_TIMEOUT, READ_TIMEOUT, MAX_RETRIES
+from data.models import JobPosting
+from monitoring.metrics import FETCH_SECONDS, FETCH_BYTES, FETCH_RESULTS, NOT_MODIFIED, ROWS_PARSED, ROWS_FILTERED, DEDUP_HITS
 
 class JobScraper:
-    def __init__(self):
-        self.sources = {
-            'summer2026_swe_vanshb_internship': { # SWE Internship positions
-                'url': 'https://raw.githubusercontent.com/vanshb03/Summer2026-Internships/dev/.github/scripts/listings.json',
-                'type': 'json',
-                'source_name': 'Summer2026-Internships-Vanshb'
-            },
-            'summer2026_swe_simplify_internship': {
-                'url': 'https://raw.githubusercontent.com/SimplifyJobs/Summer2026-Internships/dev/.github/scripts/listings.json',
-                'type': 'json',
-                'source_name': 'Summer2026-Internships-SimplifyJobs'
-            },
-            'jobright_ai_software_internship': {
-                'url': 'https://raw.githubusercontent.com/jobright-ai/2025-Software-Engineer-Internship/master/README.md',
-                'type': 'markdown_table',
-                'source_name': 'JobRight-AI-Software-Internship',
-                'table_format': 'jobright'
-            },
-
-
-            'jobright_ai_engineering_internship': { # PM & Engineering Internship positions
-                'url': 'https://raw.githubusercontent.com/jobright-ai/2025-Engineer-Internship/master/README.md',
-                'type': 'markdown_table',
-                'source_name': 'JobRight-AI-Engineering-Internship',
-                'table_format': 'jobright'
-            },
-            'jobright_ai_product_management_internship': { 
-                'url': 'https://raw.githubusercontent.com/jobright-ai/2025-Product-Management-Internship/master/README.md',
-                'type': 'markdown_table',
-                'source_name': 'JobRight-AI-Product-Management-Internship',
-                'table_format': 'jobright'
-            },
-
-
-            'newgrad_swe_vanshb': { # SWE New Grad positions
-                'url': 'https://raw.githubusercontent.com/vanshb03/New-Grad-2025/dev/.github/scripts/listings.json', 
-                'type': 'json',
-                'source_name': 'New-Grad-SWE-Vanshb',
-            },
-            'newgrad_swe_simplify': {
-                'url': 'https://raw.githubusercontent.com/SimplifyJobs/New-Grad-Positions/dev/.github/scripts/listings.json',
-                'type': 'json',
-                'source_name': 'New-Grad-SWE-SimplifyJobs',
-            },
-            'new_grad_jobright_ai_swe': {
-                'url': 'https://raw.githubusercontent.com/jobright-ai/2025-Software-Engineer-New-Grad/master/README.md',
-                'type': 'markdown_table',
-                'source_name': 'JobRight-AI-Software-New-Grad',
-                'table_format': 'jobright'
-            },
-
-
-            'newgrad_pm_jobright': { # PM & Engineering New Grad positions
-                'url': 'https://raw.githubusercontent.com/jobright-ai/2025-Product-Management-Internship/master/README.md',
-                'type': 'markdown_table',
-                'source_name': 'JobRight-AI-Product-Management-New-Grad',
-                'table_format': 'jobright'
-            },
-            'newgrad_eng_jobright': {
-                'url': 'https://raw.githubusercontent.com/jobright-ai/2025-Engineering-New-Grad/master/README.md',
-                'type': 'markdown_table',
-                'source_name': 'JobRight-AI-Engineering-New-Grad',
-                'table_format': 'jobright'
-            },
-        }
+    def __init__(self, cache_dir: str = None, pool_size: int = 10, snapshot: Optional[RowSnapshot] = None,
+                 sources: Optional[Dict[str, Dict]] = None, breakers: Optional[CircuitBreakers] = None,
+                 connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT, retries: int = MAX_RETRIES,
+                 parse_workers: Optional[int] = None, destinations: Optional[Dict[str, Dict]] = None):
+        self.session = requests.Session()
+        self.pool_size = pool_size
+        # (connect, read) timeouts for every request, so a hung endpoint cannot block a worker
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        # Per-source circuit breakers and failure metrics, persisted across cycles
+        self.breakers = breakers or CircuitBreakers()
+        # Large bodies are parsed in worker processes (PARSE_WORKERS, 0 disables)
+        self.parse_pool = ParsePool(parse_workers)
+        self._async_session = None
+        self.http_cache = HTTPCache(cache_dir)
+        # Rows key -> (cache key, validators, rows) of the last response, reused when the server answers 304
+        self._raw_rows = {}
+        # Cross-source duplicate index, kept across cycles
+        self.dedup_index = DedupIndex()
+        # When set, only rows that changed since the last committed cycle are mapped and returned
+        self.snapshot = snapshot
+        # Source key -> config, from scrapers/sources.json unless given explicitly
+        self.sources = sources if sources is not None else load_sources()
+        # Per-destination window and cap; explicitly given sources use the defaults unless destinations are given too
+        if destinations is None:
+            destinations = load_destinations() if sources is None else {}
+        self.selection = SelectionPolicy(destinations)
+        # Source key -> whether its last poll produced new rows
+        self.source_changes = {}
+
+    def fetch_source_body(self, url: str):
+        """
+        Conditionally fetch a source body through the on-disk HTTP cache.
+        Returns:
+            tuple: (body bytes, modified flag) - modified is False when the server answered 304
+        """
+        response = self.session.get(url, headers=self.http_cache.conditional_headers(url), timeout=self.timeout)
+        if response.status_code == 304:
+            body = self.http_cache.load_body(url)
+            if body is not None:
+                return body, False
+            # Cache entry disappeared between the request and the read, refetch in full
+            response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        self.http_cache.store(url, response.headers, response.content)
+        return response.content, True
+
+    async def _get_async_session(self) -> aiohttp.ClientSession:
+        """Shared pooled aiohttp session, created lazily on the running loop"""
+        if self._async_session is None or self._async_session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            timeout = aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1])
+            self._async_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._async_session
+
+    async def aclose(self):
+        """Close the shared aiohttp session and the parse workers"""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+        self.parse_pool.shutdown()
 
     def fetch_github_json(self, url: str) -> List[Dict]:
         """Fetch JSON data from GitHub raw URL"""
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
+        body, _ = self.fetch_source_body(url)
+        return json.loads(body)
 
     def fetch_markdown_content(self, url: str) -> str:
         """Fetch markdown content from GitHub"""
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.text
+        body, _ = self.fetch_source_body(url)
+        return body.decode("utf-8")
     
     def _strip_html(self, text: str) -> str:
         """Remove any HTML tags before further processing."""
-        return BeautifulSoup(text, "html.parser").get_text(separator=", ")
+        return strip_html(text, separator=", ")
 
     def _clean_position_text(self, text: str) -> str:
         """Remove markdown formatting and extra spaces from text."""
-        text = self._strip_html(text)
-        if not text:
-            return ""
-        # 2. Remove markdown links, emphasis, etc.
-        cleaned = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
-        cleaned = re.sub(r'[*_`#]', '', cleaned)
-        return cleaned.strip()
+        return clean_text(text)
 
     def _extract_url_from_markdown(self, text: str) -> str:
         """Extract URL from markdown link format or plain text"""
-        if not text:
-            return ""
-        markdown_link_match = re.search(r'\[([^\]]*)\]\(([^)]+)\)', text)
-        if markdown_link_match:
-            return markdown_link_match.group(2).strip()
-        url_match = re.search(r'https?://[^\s<>\[\]]+', text)
-        if url_match:
-            return url_match.group(0).strip()
-        if any(keyword in text.lower() for keyword in ['apply', 'link', 'url']):
-            return text.strip()
-        return ""
+        return extract_url(text)
 
     def _parse_date(self, date_str: str) -> datetime:
         """Try to parse various date formats, including incomplete dates like 'Jun 19'"""
-        date_str = date_str.strip()
-        date_str = re.sub(r'^(posted|updated|added):\s*', '', date_str, flags=re.IGNORECASE)
-        date_str = re.sub(r'\s*(ago|old)$', '', date_str, flags=re.IGNORECASE)
-
-        # Handle relative dates like "2 days ago"
-        relative_match = re.search(r'(\d+)\s*(day|week|month)s?\s*ago', date_str, re.IGNORECASE)
-        if relative_match:
-            num = int(relative_match.group(1))
-            unit = relative_match.group(2).lower()
-            if unit == 'day':
-                return datetime.now() - timedelta(days=num)
-            elif unit == 'week':
-                return datetime.now() - timedelta(weeks=num)
-            elif unit == 'month':
-                return datetime.now() - timedelta(days=num * 30)
-
-        # Try to parse as 'Jun 19' (month day)
-        try:
-            date_obj = datetime.strptime(date_str, '%b %d')
-            date_obj = date_obj.replace(year=datetime.now().year)
-            if date_obj > datetime.now():
-                date_obj = date_obj.replace(year=datetime.now().year - 1)
-            return date_obj
-        except ValueError:
-            pass
-
-        # Common date formats
-        formats = [
-            '%b %d, %Y',      # Dec 18, 2024
-            '%B %d, %Y',      # December 18, 2024
-            '%m/%d/%Y',       # 12/18/2024
-            '%Y-%m-%d',       # 2024-12-18
-            '%d-%m-%Y',       # 18-12-2024
-            '%m-%d-%Y',       # 12-18-2024
-            '%Y/%m/%d',       # 2024/12/18
-            '%d/%m/%Y',       # 18/12/2024
-        ]
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
+        return parse_date(date_str)
 
-        # If all else fails, assume it's recent (within last week)
-        return datetime.now() - timedelta(days=7)
+    def iter_markdown_table(self, lines: Iterable[str], table_format: str = 'default', days: Optional[int] = None,
+                            limit: Optional[int] = None) -> Iterator[Dict]:
+        """Stream job dicts out of markdown lines, stopping once rows fall past the days cutoff or limit is reached"""
+        return iter_markdown_table(self, lines, table_format, days, limit)
 
     def parse_markdown_table(self, markdown_content: str, table_format: str = 'default') -> List[Dict]:
-        jobs = []
-        lines = markdown_content.split('\n')
-        header_found = False
-        last_company = None
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        return list(self.iter_markdown_table(io.StringIO(markdown_content), table_format))
 
-            if line.startswith('|') and line.endswith('|'):
-                columns = [col.strip() for col in line[1:-1].split('|')]
-
-                if not header_found:
-                    if any(keyword in ' '.join(columns).lower() for keyword in ['company', 'position', 'location', 'application', 'job title']):
-                        header_found = True
-                        continue
-
-                if header_found and all('---' in col or col == '' for col in columns):
-                    continue
-
-                if header_found and len(columns) >= 3:
-                    try:
-                        if table_format == 'jobright':
-                            if len(columns) >= 5:
-                                company = columns[0].strip()
-                                if company == '↳' and last_company:
-                                    company = last_company
-                                else:
-                                    last_company = company if company and company != '↳' else last_company
-
-                                position = columns[1].strip()
-                                location = columns[2].strip()
-                                work_model = columns[3].strip()
-                                date_posted = columns[4].strip()
-
-                                url = self._extract_url_from_markdown(position)
-                                position = self._clean_position_text(position)
-                                company = self._clean_position_text(company)
-
-                                if not company or not position or company.lower() in ['company', 'name']:
-                                    continue
-
-                                try:
-                                    if date_posted:
-                                        date_obj = self._parse_date(date_posted)
-                                    else:
-                                        date_obj = datetime.now()
-                                except Exception:
-                                    date_obj = datetime.now()
-
-                                job_entry = {
-                                    'title': position,
-                                    'company_name': company,
-                                    'locations': [location] if location and location.lower() not in ['n/a', '', 'remote', 'various'] else [],
-                                    'url': url,
-                                    'date_posted': int(date_obj.timestamp()),
-                                    'work_model': work_model
-                                }
-                                if not job_entry["url"]:
-                                    continue
-
-                                jobs.append(job_entry)
-                            else:
-                                print(f"WARNING: Skipping row with only {len(columns)} columns: {columns}")
-                                continue
-                        else:
-                            company = columns[0].strip()
-                            position = columns[1].strip()
-                            location = columns[2].strip() if len(columns) > 2 else ""
-                            application_info = columns[3].strip() if len(columns) > 3 else ""
-                            date_posted = columns[4].strip() if len(columns) > 4 else ""
-                            url = self._extract_url_from_markdown(application_info)
-                            work_model = None
-
-                            if not company or not position or company.lower() in ['company', 'name']:
-                                continue
-
-                            try:
-                                if date_posted:
-                                    date_obj = self._parse_date(date_posted)
-                                else:
-                                    date_obj = datetime.now()
-                            except Exception:
-                                date_obj = datetime.now()
-
-                            job_entry = {
-                                'title': position,
-                                'company_name': company,
-                                'locations': [location] if location and location.lower() not in ['n/a', '', 'remote', 'various'] else [],
-                                'url': url,
-                                'date_posted': int(date_obj.timestamp()),
-                                'work_model': work_model
-                            }
-                            jobs.append(job_entry)
-                    except Exception as e:
-                        print(f"Error parsing row: {line}, Error: {str(e)}")
-                        continue
-
-        return jobs
-
-    def map_job(self, json_job: Dict, source_name: str) -> Dict:
-        """Map job data to standardized format"""
-        if 'date_posted' in json_job and isinstance(json_job['date_posted'], int):
-            date_posted = datetime.fromtimestamp(json_job["date_posted"])
-        else:
-            date_posted = json_job.get('date_posted', datetime.now())
-
-        role_type = ("New Grad" if "New-Grad" in source_name or 
-                     "Newgrad" in source_name else "Internship")
-
-        return {
-            "title": json_job.get("title", ""),
-            "company": json_job.get("company_name", json_job.get("company", "")),
-            "location": ", ".join(json_job.get("locations", [])) if json_job.get("locations") else json_job.get("location", ""),
-            "url": json_job.get("url", ""),
-            "date_posted": date_posted,
-            "role_type": role_type,
-            "majors": [],
-            "description": "",
-            "source": source_name,
-            "posted_to_discord": False,
-            "work_model": json_job.get("work_model", "")
-        }
+    def map_job(self, json_job: Dict, source_name: str) -> JobPosting:
+        """Map a raw row to a JobPosting; the module-level map_job still returns the old dict"""
+        return JobPosting.from_raw(json_job, source_name)
 
     def filter_recent_jobs(self, jobs: List[Dict], days: int = 7) -> List[Dict]:
-        """Filter jobs to only include those posted within the last N days"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        recent_jobs = []
+        """Filter raw rows (epoch-second date_posted) to those posted within the last N days"""
+        cutoff = time.time() - days * 86400
+        return [job for job in jobs if job["date_posted"] >= cutoff]
 
-        for job in jobs:
-            if isinstance(job["date_posted"], int):
-                job_date = datetime.fromtimestamp(job["date_posted"])
+    def _parse_body(self, source_config: Dict, body: bytes, days: int) -> List[Dict]:
+        if self.parse_pool.accepts(len(body)):
+            try:
+                return self.parse_pool.parse(source_config, body, days, self.selection.cap(source_config))
+            except BrokenProcessPool:
+                print(f"Parse workers died while parsing {source_config['source_name']}, parsing in-process")
+                self.parse_pool.reset()
+        return self._parse_body_local(source_config, body, days)
+
+    async def _aparse_body(self, source_config: Dict, body: bytes, days: int) -> List[Dict]:
+        """_parse_body off the event loop: in a worker process for large bodies, a thread otherwise"""
+        if self.parse_pool.accepts(len(body)):
+            try:
+                return await self.parse_pool.aparse(source_config, body, days, self.selection.cap(source_config))
+            except BrokenProcessPool:
+                print(f"Parse workers died while parsing {source_config['source_name']}, parsing in a thread")
+                self.parse_pool.reset()
+        return await asyncio.to_thread(self._parse_body_local, source_config, body, days)
+
+    def _parse_body_local(self, source_config: Dict, body: bytes, days: int) -> List[Dict]:
+        if source_config['type'] == 'json':
+            return decode_listings(body, cutoff=time.time() - days * 86400)
+        table_format = source_config.get('table_format', 'default')
+        lines = io.StringIO(body.decode("utf-8"))
+        return list(self.iter_markdown_table(lines, table_format, days, self.selection.cap(source_config)))
+
+    def _rows_key(self, source_config: Dict, days: int) -> str:
+        """HTTP cache key for the rows of a read that stopped early, which only hold for this window and cap"""
+        return f"{source_config['url']}#days={days}&cap={self.selection.cap(source_config)}"
+
+    def _revalidation(self, source_config: Dict, days: int) -> Tuple[str, Dict[str, str]]:
+        """
+        Cache entry the next request for a source revalidates, and its conditional headers.
+        Returns:
+            tuple: (cache key, headers) - the rows of an early-stopped read when there are any, the full body otherwise
+        """
+        rows_key = self._rows_key(source_config, days)
+        headers = self.http_cache.conditional_headers(rows_key)
+        if headers:
+            return rows_key, headers
+        url = source_config['url']
+        return url, self.http_cache.conditional_headers(url)
+
+    def _cached_rows(self, source_config: Dict, days: int, cache_key: str, headers: Dict[str, str]) -> Optional[List[Dict]]:
+        """Rows for a source the server reported as unchanged, or None if nothing usable is cached"""
+        rows_key = self._rows_key(source_config, days)
+        memo = self._raw_rows.get(rows_key)
+        if memo is not None and memo[:2] == (cache_key, headers):
+            # 304 Not Modified - reuse the rows parsed from the response those validators came with
+            return memo[2]
+        body = self.http_cache.load_body(cache_key)
+        if body is None:
+            return None
+        if cache_key == rows_key:
+            rows = json.loads(body)
+        else:
+            rows = self._parse_body(source_config, body, days)
+        self._raw_rows[rows_key] = (cache_key, headers, rows)
+        return rows
+
+    def _store_rows(self, source_config: Dict, days: int, response_headers, body: bytes, rows: List[Dict], complete: bool):
+        """
+        Cache what a 200 response yielded. A complete body is stored under the
+        URL, where fetch_source_body can serve it too. A read that stopped early
+        only covers this window and cap, so its parsed rows are stored under
+        their own key instead of passing the truncated body off as the document.
+        """
+        url = source_config['url']
+        rows_key = self._rows_key(source_config, days)
+        if complete:
+            self.http_cache.store(url, response_headers, body)
+            self.http_cache.remove(rows_key)
+            cache_key = url
+        else:
+            self.http_cache.store(rows_key, response_headers, json.dumps(rows).encode("utf-8"))
+            cache_key = rows_key
+        self._raw_rows[rows_key] = (cache_key, self.http_cache.conditional_headers(cache_key), rows)
+
+    def _jobs_from_rows(self, source_config: Dict, raw_jobs: List[Dict], days: int) -> List[JobPosting]:
+        source_name = source_config['source_name']
+        if self.snapshot is not None:
+            changed_jobs = self.snapshot.delta(source_name, raw_jobs)
+            ROWS_FILTERED.inc(len(raw_jobs) - len(changed_jobs), source=source_name, stage="unchanged")
+            raw_jobs = changed_jobs
+        recent_jobs = self.filter_recent_jobs(raw_jobs, days)
+        ROWS_FILTERED.inc(len(raw_jobs) - len(recent_jobs), source=source_name, stage="too_old")
+        # No source can contribute more than its destination's cap, so only that many are mapped
+        top_jobs = top_recent_rows(recent_jobs, self.selection.cap(source_config))
+        ROWS_FILTERED.inc(len(recent_jobs) - len(top_jobs), source=source_name, stage="over_cap")
+        recent_jobs = top_jobs
+        return [self.map_job(job, source_config['source_name']) for job in recent_jobs]
+
+    def fetch_source_rows(self, source_config: Dict, days: int) -> List[Dict]:
+        """
+        Fetch and parse the raw rows of one source through the HTTP cache.
+        Markdown bodies are streamed and reading stops as soon as the table
+        moves past the days window or the cap; see _store_rows for what is
+        cached when it does.
+        """
+        url = source_config['url']
+        cache_key, headers = self._revalidation(source_config, days)
+        response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+        if response.status_code == 304:
+            response.close()
+            NOT_MODIFIED.inc(source=source_config['source_name'])
+            rows = self._cached_rows(source_config, days, cache_key, headers)
+            if rows is not None:
+                return rows
+            # Cache entry disappeared between the request and the read, refetch in full
+            response = self.session.get(url, stream=True, timeout=self.timeout)
+
+        with response:
+            response.raise_for_status()
+            if source_config['type'] == 'json':
+                body = response.content
+                rows = self._parse_body(source_config, body, days)
+                complete = True
             else:
-                job_date = job["date_posted"]
-
-            if job_date >= cutoff_date:
-                recent_jobs.append(job)
+                consumed = []
+                exhausted = []
+
+                def lines():
+                    pending = b""
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        consumed.append(chunk)
+                        *complete_lines, pending = (pending + chunk).split(b"\n")
+                        for raw_line in complete_lines:
+                            yield raw_line.decode("utf-8", errors="replace")
+                    if pending:
+                        yield pending.decode("utf-8", errors="replace")
+                    exhausted.append(True)
 
-        return recent_jobs
-
-    def fetch_source_single(self, source_config: Dict, days: int) -> List[Dict]:
-        """Fetch jobs from a single source - for use in multithreading"""
-        try:
-            print(f"[Thread] Fetching jobs from {source_config['source_name']}...")
-            
-            if source_config['type'] == 'json':
-                raw_jobs = self.fetch_github_json(source_config['url'])
-            elif source_config['type'] == 'markdown_table':
-                markdown_content = self.fetch_markdown_content(source_config['url'])
                 table_format = source_config.get('table_format', 'default')
-                raw_jobs = self.parse_markdown_table(markdown_content, table_format)
+                rows = list(self.iter_markdown_table(lines(), table_format, days, self.selection.cap(source_config)))
+                body = b"".join(consumed)
+                complete = bool(exhausted)
+            self._store_rows(source_config, days, response.headers, body, rows, complete)
+
+        FETCH_BYTES.inc(len(body), source=source_config['source_name'])
+        ROWS_PARSED.inc(len(rows), source=source_config['source_name'])
+        return rows
+
+    async def afetch_source_rows(self, source_config: Dict, days: int) -> List[Dict]:
+        """Async version of fetch_source_rows"""
+        url = source_config['url']
+        cache_key, headers = self._revalidation(source_config, days)
+        session = await self._get_async_session()
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                NOT_MODIFIED.inc(source=source_config['source_name'])
+                rows = await asyncio.to_thread(self._cached_rows, source_config, days, cache_key, headers)
+                if rows is not None:
+                    return rows
             else:
+                return await self._aparse_response(source_config, response, days)
+        # Cache entry disappeared between the request and the read, refetch in full
+        async with session.get(url) as response:
+            return await self._aparse_response(source_config, response, days)
+
+    async def _aparse_response(self, source_config: Dict, response: aiohttp.ClientResponse, days: int) -> List[Dict]:
+        response.raise_for_status()
+        if source_config['type'] == 'json':
+            body = await response.read()
+            # Decoding large feeds is CPU-bound, keep it off the event loop
+            rows = await self._aparse_body(source_config, body, days)
+            complete = True
+        else:
+            parser = MarkdownTableParser(self, source_config.get('table_format', 'default'), days,
+                                         self.selection.cap(source_config))
+            consumed = []
+            rows = []
+            complete = True
+            async for raw_line in response.content:
+                consumed.append(raw_line)
+                job_entry = parser.feed(raw_line.decode("utf-8", errors="replace"))
+                if job_entry is not None:
+                    rows.append(job_entry)
+                if parser.done:
+                    complete = False
+                    break
+                if len(consumed) % 200 == 0:
+                    # Let the gateway heartbeat run between chunks of rows
+                    await asyncio.sleep(0)
+            body = b"".join(consumed)
+        self._store_rows(source_config, days, response.headers, body, rows, complete)
+        FETCH_BYTES.inc(len(body), source=source_config['source_name'])
+        ROWS_PARSED.inc(len(rows), source=source_config['source_name'])
+        return rows
+
+    def _fetch_rows_with_retries(self, source_config: Dict, days: int) -> List[Dict]:
+        """fetch_source_rows, retrying transient failures with jittered backoff"""
+        delays = backoff_delays(self.retries)
+        while True:
+            try:
+                return self.fetch_source_rows(source_config, days)
+            except Exception as e:
+                delay = next(delays, None) if is_transient(e) else None
+                if delay is None:
+                    raise
+                self.breakers.record_retry(source_config['source_name'])
+                time.sleep(delay)
+
+    async def _afetch_rows_with_retries(self, source_config: Dict, days: int, timeout: float) -> List[Dict]:
+        """afetch_source_rows with jittered retries, all attempts sharing one timeout budget"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delays = backoff_delays(self.retries)
+        while True:
+            try:
+                return await asyncio.wait_for(self.afetch_source_rows(source_config, days), deadline - loop.time())
+            except Exception as e:
+                delay = next(delays, None) if is_transient(e) else None
+                if delay is None or loop.time() + delay >= deadline:
+                    raise
+                self.breakers.record_retry(source_config['source_name'])
+                await asyncio.sleep(delay)
+
+    def fetch_source_single(self, source_config: Dict, days: int) -> List[JobPosting]:
+        """Fetch jobs from a single source synchronously"""
+        source_name = source_config['source_name']
+        if not self.breakers.allow(source_name):
+            print(f"Skipping {source_name}: circuit open")
+            FETCH_RESULTS.inc(source=source_name, outcome="skipped")
+            return []
+        start = time.perf_counter()
+        try:
+            print(f"Fetching jobs from {source_name}...")
+
+            if source_config['type'] not in ('json', 'markdown_table'):
                 print(f"Unknown source type: {source_config['type']}")
                 return []
 
-            recent_jobs = self.filter_recent_jobs(raw_jobs, days)
-            mapped_jobs = [self.map_job(job, source_config['source_name']) for job in recent_jobs]
-            print(f"[Thread] Found {len(mapped_jobs)} recent jobs from {source_config['source_name']}")
+            raw_jobs = self._fetch_rows_with_retries(source_config, days)
+            self.breakers.record_success(source_name)
+            mapped_jobs = self._jobs_from_rows(source_config, raw_jobs, days)
+            print(f"Found {len(mapped_jobs)} recent jobs from {source_name}")
+            FETCH_RESULTS.inc(source=source_name, outcome="ok")
             return mapped_jobs
 
         except Exception as e:
-            print(f"[Thread] Error fetching from {source_config['source_name']}: {str(e)}")
+            self.breakers.record_failure(source_name, e)
+            print(f"Error fetching from {source_name}: {str(e)}")
+            FETCH_RESULTS.inc(source=source_name, outcome="error")
+            return []
+        finally:
+            FETCH_SECONDS.observe(time.perf_counter() - start, source=source_name)
+
+    async def afetch_source_single(self, source_config: Dict, days: int, semaphore: asyncio.Semaphore, timeout: float) -> List[JobPosting]:
+        """Fetch jobs from a single source without blocking the event loop"""
+        source_name = source_config['source_name']
+        # Checked before taking a slot, so a dead source never holds one
+        if not self.breakers.allow(source_name):
+            print(f"[Async] Skipping {source_name}: circuit open")
+            FETCH_RESULTS.inc(source=source_name, outcome="skipped")
             return []
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                print(f"[Async] Fetching jobs from {source_name}...")
+
+                if source_config['type'] not in ('json', 'markdown_table'):
+                    print(f"Unknown source type: {source_config['type']}")
+                    return []
+
+                raw_jobs = await self._afetch_rows_with_retries(source_config, days, timeout)
+                self.breakers.record_success(source_name)
+                mapped_jobs = await asyncio.to_thread(self._jobs_from_rows, source_config, raw_jobs, days)
+                print(f"[Async] Found {len(mapped_jobs)} recent jobs from {source_name}")
+                FETCH_RESULTS.inc(source=source_name, outcome="ok")
+                return mapped_jobs
+
+            except asyncio.TimeoutError as e:
+                self.breakers.record_failure(source_name, e)
+                print(f"[Async] Timed out fetching from {source_name} after {timeout}s")
+                FETCH_RESULTS.inc(source=source_name, outcome="timeout")
+                return []
+            except Exception as e:
+                self.breakers.record_failure(source_name, e)
+                print(f"[Async] Error fetching from {source_name}: {str(e)}")
+                FETCH_RESULTS.inc(source=source_name, outcome="error")
+                return []
+            finally:
+                FETCH_SECONDS.observe(time.perf_counter() - start, source=source_name)
 
-    def fetch_all_jobs(self, days: int = 7, max_workers: int = 5) -> List[Dict]:
-        """Fetch jobs from all configured sources using multithreading"""
-        all_jobs = []
-        
-        # Create a list of tasks for the thread pool
-        tasks = [(source_config, days) for source_key, source_config in self.sources.items()]
-        
-        # Use ThreadPoolExecutor to fetch all sources concurrently
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_source = {
-                executor.submit(self.fetch_source_single, source_config, days): source_config['source_name']
-                for source_config, days in tasks
-            }
-            
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_source):
-                source_name = future_to_source[future]
-                try:
-                    source_jobs = future.result()
-                    all_jobs.extend(source_jobs)
-                except Exception as e:
-                    print(f"Error in thread for {source_name}: {str(e)}")
-
-        # Deduplicate and sort
-        seen_jobs = set()
+    def _dedupe_and_cap(self, all_jobs: List[JobPosting]) -> List[JobPosting]:
+        """Drop cross-source duplicates, then select each destination's capped share, oldest first"""
+        all_jobs.sort(key=lambda x: x.date_posted)  # Oldest first, so the earliest listing wins
+        seen_urls = set()
         unique_jobs = []
+        indexed_jobs = []
+        stats_before = dict(self.dedup_index.stats)
 
         for job in all_jobs:
-            if job["url"] not in seen_jobs:
-                seen_jobs.add(job["url"])
+            if job.url in seen_urls:
+                DEDUP_HITS.inc(kind="same_url")
+                continue
+            indexed = len(self.dedup_index)
+            if self.dedup_index.check_and_add(job) is None:
+                seen_urls.add(job.url)
                 unique_jobs.append(job)
+                if len(self.dedup_index) > indexed:
+                    indexed_jobs.append(job)
+
+        for kind in ('url_hits', 'signature_hits', 'near_hits'):
+            DEDUP_HITS.inc(self.dedup_index.stats[kind] - stats_before[kind], kind=kind[:-len('_hits')])
+        selected_jobs = self.selection.select(unique_jobs, self.sources)
+
+        # Jobs first indexed this cycle but cut by a cap were never posted, so they must not count as seen
+        selected_urls = {job.url for job in selected_jobs}
+        for job in indexed_jobs:
+            if job.url not in selected_urls:
+                self.dedup_index.discard(job)
+        self.dedup_index.prune()
+
+        print(f"Total unique jobs after deduplication: {len(unique_jobs)}, selected within caps: {len(selected_jobs)} "
+              f"(dedup stats: {self.dedup_index.stats})")
+        return selected_jobs
+
+    async def afetch_all_jobs(self, days: Optional[int] = None, max_concurrency: int = 5, timeout: float = 30,
+                              source_keys: Optional[List[str]] = None) -> List[JobPosting]:
+        """
+        Fetch jobs from the configured sources concurrently on the shared aiohttp session.
+        Args:
+            days (int): Only keep jobs posted within the last N days, each destination's window_days by default
+            max_concurrency (int): Maximum number of sources fetched at once
+            timeout (float): Per-source fetch timeout in seconds
+            source_keys (list): Only fetch these sources, all of them by default
+        """
+        keys = list(self.sources) if source_keys is None else source_keys
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results = await asyncio.gather(*[
+            self.afetch_source_single(
+                self.sources[key],
+                days if days is not None else self.selection.window_days(self.sources[key]),
+                semaphore,
+                timeout
+            )
+            for key in keys
+        ])
+        # With a snapshot, a non-empty result means the source has new rows since the last cycle
+        self.source_changes = {key: bool(source_jobs) for key, source_jobs in zip(keys, results)}
+
+        await asyncio.to_thread(self.breakers.save)
+        failing = {
+            name: f"{metrics['state']}, {metrics['consecutive_failures']} consecutive failures"
+            for name, metrics in self.breakers.metrics().items() if metrics['consecutive_failures']
+        }
+        if failing:
+            print(f"Failing sources: {failing}")
+
+        all_jobs = []
+        for source_jobs in results:
+            all_jobs.extend(source_jobs)
+        return self._dedupe_and_cap(all_jobs)
 
-        unique_jobs.sort(key=lambda x: x['date_posted'])  # Oldest first
-        # CAP TO 300
-        if len(unique_jobs) > 300:
-            unique_jobs = unique_jobs[-300:]
+    def fetch_all_jobs(self, days: Optional[int] = None, max_workers: int = 5) -> List[JobPosting]:
+        """Synchronous wrapper around afetch_all_jobs - do not call from a running event loop"""
+        async def run():
+            try:
+                return await self.afetch_all_jobs(days, max_concurrency=max_workers)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(run())
 
-        print(f"Total unique jobs after deduplication (capped to 300): {len(unique_jobs)}")
-        return unique_jobs
+# For backward compatibility: these keep the original dict-based contract, converting at the boundary
+def _local_datetime(value) -> datetime:
+    """date_posted as the naive local datetime the old functions used; raw rows carry epoch seconds"""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    return value
 
-# For backward compatibility
 def fetch_github_json(url):
     scraper = JobScraper()
     return scraper.fetch_github_json(url)
 
 def map_job(json_job):
-    scraper = JobScraper()
-    return scraper.map_job(json_job, "GitHub")
+    """Map one listings.json entry to the old job dict, with a naive local date_posted"""
+    job = JobPosting.from_raw(json_job, "GitHub").to_mongo()
+    job["date_posted"] = job["date_posted"].astimezone().replace(tzinfo=None)
+    return job
 
 def filter_recent_jobs(jobs, days=7):
-    scraper = JobScraper()
-    return scraper.filter_recent_jobs(jobs, days)
+    """Jobs posted within the last N days; date_posted may be epoch seconds or a naive local datetime"""
+    cutoff_date = datetime.now() - timedelta(days=days)
+    return [job for job in jobs if _local_datetime(job["date_posted"]) >= cutoff_date]
 
 def fetch_and_filter_recent_jobs(url, days=7):
-    scraper = JobScraper()
-    data = scraper.fetch_github_json(url)
-    recent_jobs_raw = scraper.filter_recent_jobs(data, days)
-    return [scraper.map_job(job, "GitHub") for job in recent_jobs_raw]
+    data = fetch_github_json(url)
+    return [map_job(job) for job in filter_recent_jobs(data, days)]
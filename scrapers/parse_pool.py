@@ -0,0 +1,123 @@
+import os
+import io
+import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from scrapers.json_feed import decode_listings, MAPPED_FIELDS
+from scrapers.markdown_table import iter_markdown_table
+from scrapers.text_cleaning import strip_html, clean_text, extract_url
+from scrapers.date_parsing import parse_date
+
+# Field order of the compact records workers send back, per source type
+RECORD_FIELDS = {
+    'json': MAPPED_FIELDS,
+    'markdown_table': MAPPED_FIELDS + ('work_model',),
+}
+
+# Bodies smaller than this are parsed in a thread; shipping them to a process costs more than it saves
+PROCESS_PARSE_MIN_BYTES = int(os.getenv("PROCESS_PARSE_MIN_BYTES", str(512 * 1024)))
+
+
+class _CellHelpers:
+    """The JobScraper cell helpers MarkdownTableParser calls, without the scraper's HTTP state"""
+
+    def _strip_html(self, text: str) -> str:
+        return strip_html(text, separator=", ")
+
+    def _clean_position_text(self, text: str) -> str:
+        return clean_text(text)
+
+    def _extract_url_from_markdown(self, text: str) -> str:
+        return extract_url(text)
+
+    def _parse_date(self, date_str: str) -> datetime:
+        return parse_date(date_str)
+
+
+def parse_records(source_type: str, table_format: str, body: bytes, days: int,
+                  limit: Optional[int] = None) -> List[Tuple]:
+    """
+    Worker entry point: parse a raw source body and keep the rows inside the days window.
+    Markdown tables also stop after limit rows, as JobScraper._parse_body_local does.
+    Returns:
+        list: One RECORD_FIELDS[source_type] tuple per row, cheaper to pickle back than dicts
+    """
+    if source_type == 'json':
+        rows = decode_listings(body, cutoff=time.time() - days * 86400)
+    else:
+        lines = io.StringIO(body.decode("utf-8", errors="replace"))
+        rows = iter_markdown_table(_CellHelpers(), lines, table_format, days, limit)
+    fields = RECORD_FIELDS[source_type]
+    return [tuple(row.get(field) for field in fields) for row in rows]
+
+
+def rows_from_records(source_type: str, records: List[Tuple]) -> List[Dict]:
+    fields = RECORD_FIELDS[source_type]
+    return [dict(zip(fields, record)) for record in records]
+
+
+def default_workers() -> int:
+    """PARSE_WORKERS, or one worker per spare core (at most 4); 0 keeps all parsing in threads"""
+    configured = os.getenv("PARSE_WORKERS")
+    if configured is not None:
+        return int(configured)
+    return max(0, min(4, (os.cpu_count() or 1) - 1))
+
+
+class ParsePool:
+    """
+    Process pool for CPU-bound parsing of large source bodies.
+    Workers receive raw bytes and return compact records, so only the body and
+    the rows inside the window cross the process boundary.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_bytes: int = PROCESS_PARSE_MIN_BYTES):
+        self.workers = default_workers() if workers is None else workers
+        self.min_bytes = min_bytes
+        self._executor = None
+
+    def accepts(self, body_size: int) -> bool:
+        return self.workers > 0 and body_size >= self.min_bytes
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Fork where available: spawned workers would re-import the bot's __main__ module
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("fork") if "fork" in methods else None
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._executor
+
+    def start(self):
+        """Create the workers now, before the caller starts other threads"""
+        if self.workers > 0:
+            self._get_executor().submit(int).result()
+
+    def parse(self, source_config: Dict, body: bytes, days: int, limit: Optional[int] = None) -> List[Dict]:
+        records = self._get_executor().submit(
+            parse_records, source_config['type'], source_config.get('table_format', 'default'), body, days, limit
+        ).result()
+        return rows_from_records(source_config['type'], records)
+
+    async def aparse(self, source_config: Dict, body: bytes, days: int, limit: Optional[int] = None) -> List[Dict]:
+        loop = asyncio.get_running_loop()
+        records = await loop.run_in_executor(
+            self._get_executor(), parse_records,
+            source_config['type'], source_config.get('table_format', 'default'), body, days, limit
+        )
+        # Rebuilding dicts is cheap but not free for large windows, keep it off the loop
+        return await asyncio.to_thread(rows_from_records, source_config['type'], records)
+
+    def reset(self):
+        """Drop a broken pool; the next parse starts fresh workers"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
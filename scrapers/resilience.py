@@ -0,0 +1,141 @@
+import os
+import json
+import time
+import random
+import asyncio
+import aiohttp
+import requests
+from typing import Dict, Iterator, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BREAKER_PATH = os.path.join(PROJECT_ROOT, ".cache", "circuit_breakers.json")
+
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 20
+MAX_RETRIES = 2
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 8.0
+
+# Consecutive failed fetches before a source's breaker opens
+FAILURE_THRESHOLD = 3
+# First open period; doubled each time a half-open trial fails
+OPEN_SECONDS = 600
+MAX_OPEN_SECONDS = 6 * 3600
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def backoff_delays(retries: int = MAX_RETRIES, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> Iterator[float]:
+    """Full-jitter exponential backoff: a random delay in [0, min(cap, base * 2^attempt)] per retry"""
+    for attempt in range(retries):
+        yield random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def is_transient(error: Exception) -> bool:
+    """Timeouts, dropped connections, 429 and 5xx answers are worth retrying; anything else is not"""
+    if isinstance(error, (asyncio.TimeoutError, requests.Timeout, requests.ConnectionError,
+                          aiohttp.ServerTimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+        return True
+    status = None
+    if isinstance(error, aiohttp.ClientResponseError):
+        status = error.status
+    elif isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+    return status is not None and (status == 429 or status >= 500)
+
+
+class CircuitBreakers:
+    """
+    Per-source circuit breakers with failure metrics, persisted across cycles.
+    A source is skipped while its breaker is open. Once the open period ends a
+    single trial fetch is allowed (half-open): success closes the breaker, failure
+    re-opens it for twice as long.
+    """
+
+    def __init__(self, path: Optional[str] = None, failure_threshold: int = FAILURE_THRESHOLD,
+                 open_seconds: float = OPEN_SECONDS, max_open_seconds: float = MAX_OPEN_SECONDS):
+        self.path = path or os.getenv("CIRCUIT_BREAKER_PATH", DEFAULT_BREAKER_PATH)
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.sources: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _source(self, name: str) -> Dict:
+        if name not in self.sources:
+            self.sources[name] = {
+                "state": CLOSED,
+                "consecutive_failures": 0,
+                "open_until": 0,
+                "open_seconds": self.open_seconds,
+                "attempts": 0,
+                "failures": 0,
+                "timeouts": 0,
+                "retries": 0,
+                "skipped": 0,
+                "opened": 0,
+                "last_error": "",
+                "last_success": 0,
+            }
+        return self.sources[name]
+
+    def allow(self, name: str, now: Optional[float] = None) -> bool:
+        """Whether a fetch of this source may go out now"""
+        now = now or time.time()
+        source = self._source(name)
+        if source["state"] == OPEN:
+            if now < source["open_until"]:
+                source["skipped"] += 1
+                return False
+            source["state"] = HALF_OPEN
+        source["attempts"] += 1
+        return True
+
+    def record_retry(self, name: str):
+        self._source(name)["retries"] += 1
+
+    def record_success(self, name: str, now: Optional[float] = None):
+        source = self._source(name)
+        source["state"] = CLOSED
+        source["consecutive_failures"] = 0
+        source["open_seconds"] = self.open_seconds
+        source["last_success"] = now or time.time()
+
+    def record_failure(self, name: str, error: Exception, now: Optional[float] = None):
+        now = now or time.time()
+        source = self._source(name)
+        source["failures"] += 1
+        source["consecutive_failures"] += 1
+        if isinstance(error, (asyncio.TimeoutError, requests.Timeout, aiohttp.ServerTimeoutError)):
+            source["timeouts"] += 1
+        source["last_error"] = f"{type(error).__name__}: {error}"[:200]
+
+        if source["state"] == HALF_OPEN:
+            # The trial fetch failed, stay away for longer
+            source["open_seconds"] = min(source["open_seconds"] * 2, self.max_open_seconds)
+        elif source["consecutive_failures"] < self.failure_threshold:
+            return
+        source["state"] = OPEN
+        source["open_until"] = now + source["open_seconds"]
+        source["opened"] += 1
+        print(f"Circuit open for {name} for {source['open_seconds'] / 60:.0f} min after "
+              f"{source['consecutive_failures']} failures ({source['last_error']})")
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Per-source breaker state and failure counters"""
+        return {name: dict(source) for name, source in self.sources.items()}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.sources, f)
+        os.replace(tmp_path, self.path)
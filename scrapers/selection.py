@@ -0,0 +1,78 @@
+import heapq
+from operator import attrgetter, itemgetter
+from typing import Dict, List, Optional
+
+from data.models import JobPosting
+
+# Used for sources without a destination, or destinations that do not set these
+DEFAULT_WINDOW_DAYS = 7
+DEFAULT_CAP = 300
+DEFAULT_DESTINATION = "default"
+
+
+def top_recent_rows(rows: List[Dict], k: int) -> List[Dict]:
+    """The k most recent raw rows, by epoch date_posted (bounded heap, O(n log k))"""
+    if len(rows) <= k:
+        return rows
+    return heapq.nlargest(k, rows, key=itemgetter('date_posted'))
+
+
+def fair_share(available: Dict[str, int], cap: int) -> Dict[str, int]:
+    """
+    Split cap between sources as evenly as their row counts allow.
+    Sources with fewer rows than an equal share keep them all, and the share
+    they do not use goes to the remaining sources.
+    """
+    quotas = {}
+    remaining = cap
+    ordered = sorted(available.items(), key=itemgetter(1))
+    for i, (source, count) in enumerate(ordered):
+        quotas[source] = min(count, remaining // (len(ordered) - i))
+        remaining -= quotas[source]
+    return quotas
+
+
+class SelectionPolicy:
+    """
+    Per-destination fetch window and cap.
+    Each source is limited to its destination's cap before mapping; after dedup
+    the cap is split between the destination's sources with fair-share quotas,
+    so one noisy source cannot push every other source out.
+    """
+
+    def __init__(self, destinations: Optional[Dict[str, Dict]] = None):
+        self.destinations = destinations or {}
+
+    def destination_of(self, source_config: Dict) -> str:
+        return source_config.get('destination', DEFAULT_DESTINATION)
+
+    def window_days(self, source_config: Dict) -> int:
+        return self.destinations.get(self.destination_of(source_config), {}).get('window_days', DEFAULT_WINDOW_DAYS)
+
+    def cap(self, source_config: Dict) -> int:
+        return self.destinations.get(self.destination_of(source_config), {}).get('cap', DEFAULT_CAP)
+
+    def select(self, jobs: List[JobPosting], sources: Dict[str, Dict]) -> List[JobPosting]:
+        """
+        Apply each destination's cap with fair-share quotas.
+        Args:
+            jobs (list): Deduplicated jobs from every source
+            sources (dict): Source configs, matched to jobs by source_name
+        Returns:
+            list: The selected jobs, oldest first
+        """
+        config_by_name = {config['source_name']: config for config in sources.values()}
+        by_destination: Dict[str, Dict[str, List[JobPosting]]] = {}
+        for job in jobs:
+            config = config_by_name.get(job.source, {})
+            by_destination.setdefault(self.destination_of(config), {}).setdefault(job.source, []).append(job)
+
+        selected = []
+        for destination, by_source in by_destination.items():
+            cap = self.destinations.get(destination, {}).get('cap', DEFAULT_CAP)
+            quotas = fair_share({source: len(source_jobs) for source, source_jobs in by_source.items()}, cap)
+            for source, source_jobs in by_source.items():
+                selected.extend(heapq.nlargest(quotas[source], source_jobs, key=attrgetter('date_posted')))
+
+        selected.sort(key=attrgetter('date_posted'))
+        return selected
@@ -0,0 +1,72 @@
+import os
+import json
+import hashlib
+from typing import Dict, Iterable, List, Optional, Set
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATH = os.path.join(PROJECT_ROOT, ".cache", "row_snapshot.json")
+
+
+def row_fingerprint(row: Dict) -> str:
+    """
+    Hash of a raw row's URL and posting day.
+    The day rather than the exact timestamp is used because relative ages
+    ("3 days ago") and undated rows resolve against the current time.
+    """
+    key = f"{row.get('url', '')}\x1f{int(row.get('date_posted') or 0) // 86400}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class RowSnapshot:
+    """
+    Per-source fingerprints of the rows seen in the last committed cycle.
+    delta() stages the current fingerprints of a source and returns only rows
+    that were not in the committed snapshot; commit() makes the staged state
+    current and writes it to disk, so a cycle that fails before its jobs are
+    stored is emitted again on the next run.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("ROW_SNAPSHOT_PATH", DEFAULT_PATH)
+        self._committed: Dict[str, Set[str]] = self._load()
+        self._pending: Dict[str, Set[str]] = {}
+
+    def _load(self) -> Dict[str, Set[str]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return {source: set(fingerprints) for source, fingerprints in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def delta(self, source_name: str, rows: List[Dict]) -> List[Dict]:
+        """Rows of source_name that were added or changed since the committed snapshot"""
+        known = self._committed.get(source_name, set())
+        fingerprints = set()
+        changed = []
+        for row in rows:
+            fingerprint = row_fingerprint(row)
+            fingerprints.add(fingerprint)
+            if fingerprint not in known:
+                changed.append(row)
+        self._pending[source_name] = fingerprints
+        return changed
+
+    def commit(self):
+        """Make the staged fingerprints current and persist them"""
+        if not self._pending:
+            return
+        self._committed.update(self._pending)
+        self._pending = {}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({source: sorted(fingerprints) for source, fingerprints in self._committed.items()}, f)
+        os.replace(tmp_path, self.path)
+
+    def discard(self, source_names: Optional[Iterable[str]] = None):
+        """Drop staged fingerprints, of every source or only source_names, so the same delta is emitted again"""
+        if source_names is None:
+            self._pending = {}
+            return
+        for source_name in source_names:
+            self._pending.pop(source_name, None)
@@ -0,0 +1,112 @@
+import os
+import json
+import time
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOURCES_PATH = os.path.join(PROJECT_ROOT, "scrapers", "sources.json")
+DEFAULT_SCHEDULE_PATH = os.path.join(PROJECT_ROOT, ".cache", "source_schedule.json")
+
+# Used when neither the source nor the config file's "defaults" set a value
+DEFAULT_INTERVAL_MINUTES = 30
+DEFAULT_MIN_INTERVAL_MINUTES = 5
+DEFAULT_MAX_INTERVAL_MINUTES = 240
+
+
+def _load_config(path: Optional[str]) -> Dict:
+    path = path or os.getenv("SOURCES_CONFIG", DEFAULT_SOURCES_PATH)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_sources(path: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Load the source registry.
+    Args:
+        path (str): JSON file with "defaults" and "sources" keys, SOURCES_CONFIG or scrapers/sources.json by default
+    Returns:
+        dict: Source key -> source config with the polling defaults filled in
+    """
+    config = _load_config(path)
+
+    defaults = {
+        "interval_minutes": DEFAULT_INTERVAL_MINUTES,
+        "min_interval_minutes": DEFAULT_MIN_INTERVAL_MINUTES,
+        "max_interval_minutes": DEFAULT_MAX_INTERVAL_MINUTES,
+    }
+    defaults.update(config.get("defaults", {}))
+
+    sources = {}
+    for key, source_config in config["sources"].items():
+        if source_config.get("type") not in ("json", "markdown_table"):
+            print(f"Skipping source {key}: unknown type {source_config.get('type')}")
+            continue
+        sources[key] = {**defaults, **source_config}
+    return sources
+
+
+def load_destinations(path: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Destination name -> {"window_days", "cap", "role_type", "collection", "channel_env"}
+    from the registry's "destinations" section
+    """
+    return _load_config(path).get("destinations", {})
+
+
+class SourceSchedule:
+    """
+    Per-source polling schedule.
+    Every source starts at its configured interval. A poll that finds new rows
+    halves the interval (down to min_interval_minutes), a poll that finds
+    nothing doubles it (up to max_interval_minutes). Intervals and due times
+    are persisted so a restart keeps what was learned.
+    """
+
+    def __init__(self, sources: Dict[str, Dict], path: Optional[str] = None):
+        self.sources = sources
+        self.path = path or os.getenv("SOURCE_SCHEDULE_PATH", DEFAULT_SCHEDULE_PATH)
+        saved = self._load()
+        self.state = {}
+        for key, source_config in sources.items():
+            interval = saved.get(key, {}).get("interval", source_config["interval_minutes"] * 60)
+            self.state[key] = {
+                "interval": self._clamp(key, interval),
+                "next_due": saved.get(key, {}).get("next_due", 0),
+            }
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _clamp(self, key: str, interval: float) -> float:
+        source_config = self.sources[key]
+        return min(max(interval, source_config["min_interval_minutes"] * 60), source_config["max_interval_minutes"] * 60)
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Keys of the sources whose next poll time has passed"""
+        now = now or time.time()
+        return [key for key, state in self.state.items() if state["next_due"] <= now]
+
+    def record(self, key: str, changed: bool, now: Optional[float] = None):
+        """Adapt a source's interval after a poll and schedule its next one"""
+        now = now or time.time()
+        state = self.state[key]
+        state["interval"] = self._clamp(key, state["interval"] / 2 if changed else state["interval"] * 2)
+        state["next_due"] = now + state["interval"]
+
+    def next_due(self) -> float:
+        return min((state["next_due"] for state in self.state.values()), default=0)
+
+    def summary(self) -> Dict[str, int]:
+        """Current interval of each source in minutes"""
+        return {key: round(state["interval"] / 60) for key, state in self.state.items()}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,133 @@
+import re
+import threading
+from html.parser import HTMLParser
+
+MARKDOWN_LINK_RE = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+MARKDOWN_LINK_URL_RE = re.compile(r'\[([^\]]*)\]\(([^)]+)\)')
+PLAIN_URL_RE = re.compile(r'https?://[^\s<>\[\]]+')
+EMPHASIS_RE = re.compile(r'[*_`#]')
+
+# Whitespace-only strings collapse to one character, as BeautifulSoup does
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+_WHITESPACE_TABLE = {ord(c): None for c in ASCII_SPACES}
+
+# Text inside these is left out of the output, text inside these keeps its whitespace
+SKIPPED_TAGS = {'script', 'style', 'template'}
+PRESERVE_WHITESPACE_TAGS = {'pre', 'textarea'}
+
+
+class _TextCollector(HTMLParser):
+    """
+    Stateful html.parser stripper that reproduces
+    BeautifulSoup(text, "html.parser").get_text(separator=...) on table cells.
+    One instance is reset and reused per thread instead of building a tree per cell.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._data = []
+        self._skip_depth = 0
+        self._preserve_depth = 0
+        self._in_cdata = False
+
+    def reset(self):
+        super().reset()
+        self.parts = []
+        self._data = []
+        self._skip_depth = 0
+        self._preserve_depth = 0
+        self._in_cdata = False
+
+    def _flush(self):
+        if not self._data:
+            return
+        data = ''.join(self._data)
+        self._data = []
+        if self._skip_depth:
+            return
+        if not self._preserve_depth and not data.translate(_WHITESPACE_TABLE):
+            data = '\n' if '\n' in data else ' '
+        self.parts.append(data)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in PRESERVE_WHITESPACE_TAGS:
+            self._preserve_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._flush()
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in PRESERVE_WHITESPACE_TAGS and self._preserve_depth:
+            self._preserve_depth -= 1
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        if data.startswith('CDATA['):
+            self.parts.append(data[len('CDATA['):])
+
+    def text(self, markup: str, separator: str) -> str:
+        self.reset()
+        self.feed(markup)
+        self.close()
+        self._flush()
+        return separator.join(self.parts)
+
+
+_local = threading.local()
+
+
+def strip_html(text: str, separator: str = ", ") -> str:
+    """Remove HTML tags from text, joining the remaining strings with separator"""
+    if '<' not in text and '&' not in text:
+        # Nothing to parse - the whole cell is a single string
+        if text and not text.translate(_WHITESPACE_TABLE):
+            return '\n' if '\n' in text else ' '
+        return text
+    collector = getattr(_local, 'collector', None)
+    if collector is None:
+        collector = _local.collector = _TextCollector()
+    return collector.text(text, separator)
+
+
+def clean_text(text: str) -> str:
+    """Remove HTML, markdown links and emphasis and surrounding spaces from a table cell"""
+    text = strip_html(text)
+    if not text:
+        return ""
+    cleaned = MARKDOWN_LINK_RE.sub(r'\1', text)
+    cleaned = EMPHASIS_RE.sub('', cleaned)
+    return cleaned.strip()
+
+
+def extract_url(text: str) -> str:
+    """Extract URL from markdown link format or plain text"""
+    if not text:
+        return ""
+    markdown_link_match = MARKDOWN_LINK_URL_RE.search(text)
+    if markdown_link_match:
+        return markdown_link_match.group(2).strip()
+    url_match = PLAIN_URL_RE.search(text)
+    if url_match:
+        return url_match.group(0).strip()
+    if any(keyword in text.lower() for keyword in ['apply', 'link', 'url']):
+        return text.strip()
+    return ""
@@ -0,0 +1,80 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+class StubServer:
+    """
+    Local HTTP server answering GETs from an in-memory path -> (body, etag) map.
+    Honours If-None-Match with a 304 and records every request it served.
+    """
+
+    def __init__(self):
+        self.documents = {}
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in stub.documents:
+                    stub.requests.append((self.path, self.headers.get("If-None-Match"), 404))
+                    self.send_error(404)
+                    return
+                body, etag = stub.documents[self.path]
+                if etag and self.headers.get("If-None-Match") == etag:
+                    stub.requests.append((self.path, etag, 304))
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                stub.requests.append((self.path, self.headers.get("If-None-Match"), 200))
+                self.send_response(200)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Streaming readers may stop before the end of the body
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}{path}"
+
+    def statuses(self, path: str):
+        return [status for request_path, _, status in self.requests if request_path == path]
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    server.thread.start()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    """JobScraper with its HTTP cache and breaker state under tmp_path, parsing in-process"""
+    from scrapers.multi_source import JobScraper
+    from scrapers.resilience import CircuitBreakers
+
+    job_scraper = JobScraper(cache_dir=str(tmp_path / "http"), sources={}, parse_workers=0,
+                             breakers=CircuitBreakers(str(tmp_path / "circuit_breakers.json")))
+    yield job_scraper
+    job_scraper.session.close()
+    job_scraper.parse_pool.shutdown()
@@ -0,0 +1,98 @@
+import os
+
+import requests
+
+from scrapers import resilience
+from scrapers.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreakers
+
+NOW = 1_700_000_000.0
+ERROR = requests.ConnectionError("connection refused")
+
+
+def fail(breakers, times, now=NOW):
+    for _ in range(times):
+        assert breakers.allow("src", now=now)
+        breakers.record_failure("src", ERROR, now=now)
+
+
+def test_breaker_opens_after_three_consecutive_failures(tmp_path):
+    breakers = CircuitBreakers(str(tmp_path / "circuit_breakers.json"))
+    fail(breakers, 2)
+    assert breakers.sources["src"]["state"] == CLOSED
+
+    fail(breakers, 1)
+    assert breakers.sources["src"]["state"] == OPEN
+    assert breakers.sources["src"]["open_until"] == NOW + 600
+    assert not breakers.allow("src", now=NOW + 599)
+    assert breakers.sources["src"]["skipped"] == 1
+
+
+def test_success_resets_the_failure_count(tmp_path):
+    breakers = CircuitBreakers(str(tmp_path / "circuit_breakers.json"))
+    fail(breakers, 2)
+    breakers.record_success("src", now=NOW)
+    fail(breakers, 2)
+    assert breakers.sources["src"]["state"] == CLOSED
+
+
+def test_half_open_trial_success_closes_the_breaker(tmp_path):
+    breakers = CircuitBreakers(str(tmp_path / "circuit_breakers.json"))
+    fail(breakers, 3)
+
+    assert breakers.allow("src", now=NOW + 600)
+    assert breakers.sources["src"]["state"] == HALF_OPEN
+    breakers.record_success("src", now=NOW + 600)
+    source = breakers.sources["src"]
+    assert (source["state"], source["consecutive_failures"], source["open_seconds"]) == (CLOSED, 0, 600)
+    assert breakers.allow("src", now=NOW + 601)
+
+
+def test_failed_half_open_trial_reopens_for_twice_as_long(tmp_path):
+    breakers = CircuitBreakers(str(tmp_path / "circuit_breakers.json"))
+    fail(breakers, 3)
+
+    fail(breakers, 1, now=NOW + 600)
+    source = breakers.sources["src"]
+    assert source["state"] == OPEN
+    assert source["open_until"] == NOW + 600 + 1200
+    assert not breakers.allow("src", now=NOW + 1799)
+
+    fail(breakers, 1, now=NOW + 1800)
+    assert breakers.sources["src"]["open_until"] == NOW + 1800 + 2400
+    assert breakers.sources["src"]["opened"] == 3
+
+
+def test_open_period_is_capped(tmp_path):
+    breakers = CircuitBreakers(str(tmp_path / "circuit_breakers.json"))
+    now = NOW
+    fail(breakers, 3, now=now)
+    for _ in range(10):
+        now = breakers.sources["src"]["open_until"]
+        fail(breakers, 1, now=now)
+    assert breakers.sources["src"]["open_seconds"] == resilience.MAX_OPEN_SECONDS
+
+
+def test_state_is_reloaded_from_disk(tmp_path):
+    path = str(tmp_path / "circuit_breakers.json")
+    breakers = CircuitBreakers(path)
+    fail(breakers, 3)
+    fail(breakers, 1, now=NOW + 600)
+    breakers.save()
+
+    reloaded = CircuitBreakers(path)
+    assert reloaded.sources == breakers.sources
+    assert not reloaded.allow("src", now=NOW + 1799)
+    assert reloaded.allow("src", now=NOW + 1800)
+
+
+def test_missing_or_corrupt_state_starts_closed(tmp_path):
+    path = tmp_path / "circuit_breakers.json"
+    path.write_text("{not json")
+    assert CircuitBreakers(str(path)).sources == {}
+    assert CircuitBreakers(str(tmp_path / "missing.json")).allow("src", now=NOW)
+
+
+def test_default_path_is_under_the_cache_directory(monkeypatch):
+    monkeypatch.delenv("CIRCUIT_BREAKER_PATH", raising=False)
+    assert resilience.DEFAULT_BREAKER_PATH.endswith(os.path.join(".cache", "circuit_breakers.json"))
+    assert CircuitBreakers().path == resilience.DEFAULT_BREAKER_PATH
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.bench_date_parsing import CORPUS, legacy_parse_date
+from scrapers.date_parsing import parse_date
+
+
+@pytest.mark.parametrize("cell, expected", CORPUS)
+def test_corpus(cell, expected):
+    now = datetime.now()
+    if expected is None:
+        # Month/day cells must agree with the parser this one replaced
+        expected = legacy_parse_date(cell)
+    elif isinstance(expected, timedelta):
+        expected = now - expected
+    assert parse_date(cell, now=now) == expected
+
+
+@pytest.mark.parametrize("now, expected", [
+    (datetime(2025, 3, 1, 12), datetime(2024, 6, 19)),
+    (datetime(2025, 7, 1, 12), datetime(2025, 6, 19)),
+    (datetime(2025, 6, 19, 12), datetime(2025, 6, 19)),
+])
+def test_month_day_never_lands_in_the_future(now, expected):
+    assert parse_date("Jun 19", now=now) == expected
+
+
+def test_cached_relative_dates_follow_the_reference_time():
+    now = datetime(2025, 3, 1, 12)
+    later = now + timedelta(days=2)
+    assert parse_date("3 days ago", now=now) == now - timedelta(days=3)
+    assert parse_date("3 days ago", now=later) == later - timedelta(days=3)
+    assert parse_date("Posted: 3 days ago", now=later) == later - timedelta(days=3)
+
+
+def test_unparseable_cells_fall_back_to_a_week_ago():
+    now = datetime(2025, 3, 1, 12)
+    assert parse_date("not a date", now=now) == now - timedelta(days=7)
+    assert parse_date("Feb 30", now=now) == now - timedelta(days=7)
+
+
+@pytest.mark.parametrize("cell", ["not a date", "Feb 30"])
+def test_strict_parsing_rejects_unparseable_cells(cell):
+    with pytest.raises(ValueError):
+        parse_date(cell, strict=True)
+
+
+def test_strict_parsing_accepts_relative_and_absolute_dates():
+    now = datetime(2025, 3, 1, 12)
+    assert parse_date("3 days ago", now=now, strict=True) == now - timedelta(days=3)
+    assert parse_date("2025-02-14", now=now, strict=True) == datetime(2025, 2, 14)
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from data import db
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    # connect=False keeps the clients from opening sockets, no server is needed
+    monkeypatch.setenv("MONGO_URI", "mongodb://localhost:27017/")
+    db.close_clients()
+    yield
+    db.close_clients()
+
+
+def test_repeated_lookups_share_one_client():
+    for _ in range(50):
+        db.get_software_jobs_collection()
+        db.get_job_collections()
+        db.get_collection("subscriptions")
+
+    assert db.live_client_count() == 1
+    assert db.get_collection("software_jobs") is db.get_software_jobs_collection()
+
+
+def test_concurrent_first_use_creates_one_client():
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        handles = list(executor.map(lambda _: db.get_collection("software_jobs"), range(64)))
+
+    assert db.live_client_count() == 1
+    assert all(handle is handles[0] for handle in handles)
+
+
+def test_close_clients_drops_clients_and_handles():
+    before = db.get_collection("software_jobs")
+    db.close_clients()
+
+    assert db.live_client_count() == 0
+    assert db.get_collection("software_jobs") is not before
+    assert db.live_client_count() == 1
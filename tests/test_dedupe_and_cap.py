@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from data.models import JobPosting
+from scrapers.multi_source import JobScraper
+from scrapers.resilience import CircuitBreakers
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def capped_scraper(tmp_path):
+    sources = {
+        'a': {'source_name': 'A', 'url': 'https://example.com/a.json', 'type': 'json', 'destination': 'capped'},
+        'b': {'source_name': 'B', 'url': 'https://example.com/b.json', 'type': 'json', 'destination': 'open'},
+    }
+    destinations = {'capped': {'cap': 2}, 'open': {'cap': 100}}
+    return JobScraper(cache_dir=str(tmp_path / "http"), sources=sources, destinations=destinations, parse_workers=0,
+                      breakers=CircuitBreakers(str(tmp_path / "circuit_breakers.json")))
+
+
+def job(company: str, source: str, url: str, hours_ago: int) -> JobPosting:
+    return JobPosting("Software Engineer Intern", company, "New York, NY", url, NOW - timedelta(hours=hours_ago), source=source)
+
+
+def test_job_cut_by_the_cap_is_not_a_duplicate_next_cycle(capped_scraper):
+    first = capped_scraper._dedupe_and_cap([
+        job("Acme", "A", "https://acme.com/1", 30),
+        job("Globex", "A", "https://globex.com/1", 2),
+        job("Initech", "A", "https://initech.com/1", 1),
+    ])
+    assert [j.company for j in first] == ["Globex", "Initech"]
+
+    # The same Acme posting shows up through another source
+    second = capped_scraper._dedupe_and_cap([job("Acme", "B", "https://jobs.example.com/acme-1", 30)])
+    assert [j.url for j in second] == ["https://jobs.example.com/acme-1"]
+
+
+def test_selected_jobs_stay_indexed(capped_scraper):
+    capped_scraper._dedupe_and_cap([job("Globex", "A", "https://globex.com/1", 2)])
+
+    assert capped_scraper._dedupe_and_cap([job("Globex", "B", "https://jobs.example.com/globex-1", 2)]) == []
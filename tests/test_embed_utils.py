@@ -0,0 +1,39 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from bot.embed_utils import create_job_embed, render_job_embed
+from data.models import JobPosting
+
+
+def make_job(date_posted):
+    return JobPosting("Software Engineering Intern", "Stripe", "Remote", "https://example.com/jobs/1", date_posted)
+
+
+def test_send_time_does_not_leak_into_the_cached_embed():
+    job = make_job(datetime(2025, 3, 1, 12, tzinfo=timezone.utc))
+    first = create_job_embed(job)
+    second = create_job_embed(job)
+
+    assert first is not second
+    assert first.timestamp is not None
+    assert render_job_embed(job, "full").timestamp is None
+
+
+@pytest.fixture
+def new_york_time(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available on this platform")
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_posted_day_is_shown_in_local_time(new_york_time):
+    # 02:00 UTC on March 2nd is still March 1st in New York
+    job = make_job(datetime(2025, 3, 2, 2, tzinfo=timezone.utc))
+    posted = next(field for field in create_job_embed(job).fields if field.name == "Posted")
+    assert posted.value == "March 01, 2025"
@@ -0,0 +1,41 @@
+from scrapers.http_cache import HTTPCache
+
+
+def test_store_keeps_validators_for_the_next_request(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    cache.store("https://example.com/a", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, b"body")
+
+    assert cache.load_body("https://example.com/a") == b"body"
+    assert cache.conditional_headers("https://example.com/a") == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+
+
+def test_response_without_validators_is_not_kept(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    cache.store("https://example.com/a", {"ETag": '"v1"'}, b"old")
+    cache.store("https://example.com/a", {}, b"new")
+
+    assert cache.load_body("https://example.com/a") is None
+    assert cache.conditional_headers("https://example.com/a") == {}
+
+
+def test_conditional_get_is_answered_from_disk(stub_server, scraper):
+    stub_server.documents["/listings.json"] = (b'[{"title": "Intern"}]', '"v1"')
+    url = stub_server.url("/listings.json")
+
+    assert scraper.fetch_source_body(url) == (b'[{"title": "Intern"}]', True)
+    assert scraper.fetch_source_body(url) == (b'[{"title": "Intern"}]', False)
+    assert stub_server.requests[1] == ("/listings.json", '"v1"', 304)
+
+
+def test_changed_document_replaces_the_cached_body(stub_server, scraper):
+    stub_server.documents["/listings.json"] = (b"[]", '"v1"')
+    url = stub_server.url("/listings.json")
+    scraper.fetch_source_body(url)
+
+    stub_server.documents["/listings.json"] = (b'[{"title": "Intern"}]', '"v2"')
+    assert scraper.fetch_source_body(url) == (b'[{"title": "Intern"}]', True)
+    assert scraper.fetch_source_body(url) == (b'[{"title": "Intern"}]', False)
+    assert stub_server.statuses("/listings.json") == [200, 200, 304]
@@ -0,0 +1,21 @@
+import pytest
+
+from bot.commands import parse_job_query
+
+
+@pytest.mark.parametrize("query", ["since:not a date", "since:Feb 30"])
+def test_unparseable_since_is_rejected(query):
+    with pytest.raises(ValueError):
+        parse_job_query(query)
+
+
+def test_search_key_ignores_paging_and_survives_relative_dates():
+    first = parse_job_query("company:Stripe since:3 days ago")
+    second = parse_job_query("company:stripe since:3 days ago page:2")
+
+    assert first[3] == second[3]
+    assert second[1] == 2
+
+
+def test_search_key_separates_different_searches():
+    assert parse_job_query("company:Stripe")[3] != parse_job_query("company:Meta")[3]
@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta, timezone
+
+import mongomock
+import pytest
+from pymongo.errors import BulkWriteError
+
+from data.job_queue import JobQueue, delivery
+from data.lease import Lease
+from data.models import JobPosting
+
+
+@pytest.fixture
+def database():
+    return mongomock.MongoClient(tz_aware=True)["engjobs"]
+
+
+def expire(collection, **query):
+    """Move the matching documents' deadlines into the past, as if their holder stopped"""
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    collection.update_many(query, {"$set": {"expires_at": past, "claimed_until": past, "available_at": past}})
+
+
+def test_live_lease_is_held_by_one_instance(database):
+    first = Lease("scraper", "a", collection=database.leases)
+    second = Lease("scraper", "b", collection=database.leases)
+
+    assert first.acquire() and first.held()
+    assert not second.acquire() and not second.held()
+    # Renewing keeps the term
+    assert first.acquire() and first.term == 1
+
+
+def test_expired_lease_is_taken_over_with_a_new_term(database):
+    first = Lease("scraper", "a", collection=database.leases)
+    second = Lease("scraper", "b", collection=database.leases)
+    first.acquire()
+
+    expire(database.leases, _id="scraper")
+    assert second.acquire()
+    assert second.term == 2
+    assert database.leases.find_one({"_id": "scraper"})["holder"] == "b"
+    # The old holder cannot renew once it lost the lease
+    assert not first.acquire()
+
+
+def test_released_lease_is_free_at_once(database):
+    first = Lease("scraper", "a", collection=database.leases)
+    second = Lease("scraper", "b", collection=database.leases)
+    first.acquire()
+
+    first.release()
+    assert not first.held()
+    assert second.acquire() and second.term == 2
+
+
+def make_deliveries(count, channel_id=10):
+    jobs = [JobPosting("Intern", "Stripe", "Remote", f"https://example.com/jobs/{i}", datetime.now(timezone.utc))
+            for i in range(count)]
+    return [delivery(job, channel_id, None, 1, "software_jobs", True) for job in jobs]
+
+
+@pytest.fixture
+def queue(database):
+    database.job_queue.create_index("key", unique=True)
+    return JobQueue(database.job_queue, max_attempts=2, retry_delay_seconds=0)
+
+
+def test_enqueue_skips_deliveries_already_queued(queue):
+    assert queue.enqueue(make_deliveries(3)) == 3
+    assert queue.enqueue(make_deliveries(4)) == 1
+    assert queue.depth() == {"pending": 4}
+
+
+def test_claimed_deliveries_go_to_one_worker(queue):
+    queue.enqueue(make_deliveries(3))
+
+    claimed = queue.claim("a", [0])
+    assert len(claimed) == 3
+    assert queue.claim("b", [0]) == []
+
+
+def test_claim_of_a_dead_worker_is_redelivered(queue, database):
+    queue.enqueue(make_deliveries(2))
+    first = queue.claim("a", [0])
+
+    expire(database.job_queue, status="claimed")
+    redelivered = queue.claim("b", [0])
+    assert [doc["_id"] for doc in redelivered] == [doc["_id"] for doc in first]
+    assert {doc["claimed_by"] for doc in redelivered} == {"b"}
+    assert {doc["attempts"] for doc in redelivered} == {2}
+
+
+def test_completed_deliveries_are_not_claimed_again(queue, database):
+    queue.enqueue(make_deliveries(2))
+    claimed = queue.claim("a", [0])
+    assert queue.complete([doc["_id"] for doc in claimed], claimed[0]["claim_token"]) == 2
+
+    expire(database.job_queue, status="done")
+    assert queue.claim("b", [0]) == []
+    assert queue.depth() == {"done": 2}
+
+
+def test_failed_deliveries_are_retried_then_parked(queue):
+    queue.enqueue(make_deliveries(1))
+
+    claimed = queue.claim("a", [0])
+    queue.retry([doc["_id"] for doc in claimed], claimed[0]["claim_token"])
+    assert queue.depth() == {"pending": 1}
+
+    claimed = queue.claim("a", [0])
+    queue.retry([doc["_id"] for doc in claimed], claimed[0]["claim_token"])
+    assert queue.depth() == {"failed": 1}
+    assert queue.claim("a", [0]) == []
+
+
+def test_expired_claim_cannot_overwrite_its_replacement(queue, database):
+    queue.enqueue(make_deliveries(2))
+    stale = queue.claim("a", [0])
+    ids = [doc["_id"] for doc in stale]
+
+    expire(database.job_queue, status="claimed")
+    current = queue.claim("b", [0])
+
+    assert queue.complete(ids, stale[0]["claim_token"]) == 0
+    assert queue.retry(ids, stale[0]["claim_token"]) == 0
+    assert queue.depth() == {"claimed": 2}
+    assert queue.complete(ids, current[0]["claim_token"]) == 2
+
+
+def test_enqueue_raises_on_errors_other_than_duplicates():
+    class FailingCollection:
+        def bulk_write(self, operations, ordered=True):
+            raise BulkWriteError({"nInserted": 1, "writeErrors": [{"index": 1, "code": 11000},
+                                                                  {"index": 2, "code": 10334}]})
+
+    with pytest.raises(BulkWriteError):
+        JobQueue(FailingCollection()).enqueue(make_deliveries(3))
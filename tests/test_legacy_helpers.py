@@ -0,0 +1,27 @@
+import time
+from datetime import datetime, timedelta
+
+from scrapers.multi_source import filter_recent_jobs, map_job
+
+
+def test_filter_recent_jobs_accepts_datetimes_and_epoch_seconds():
+    recent, old = datetime.now() - timedelta(days=1), datetime.now() - timedelta(days=30)
+    jobs = [
+        {"url": "a", "date_posted": recent},
+        {"url": "b", "date_posted": old},
+        {"url": "c", "date_posted": int(time.time()) - 3600},
+        {"url": "d", "date_posted": int(old.timestamp())},
+    ]
+    assert [job["url"] for job in filter_recent_jobs(jobs, days=7)] == ["a", "c"]
+
+
+def test_map_job_returns_the_old_dict():
+    posted = int(time.time()) - 3600
+    job = map_job({"title": "Intern", "company_name": "Acme", "locations": ["NYC", "Remote"],
+                   "url": "https://acme.com/1", "date_posted": posted})
+
+    assert isinstance(job, dict)
+    assert job["company"] == "Acme"
+    assert job["location"] == "NYC, Remote"
+    assert job["source"] == "GitHub"
+    assert job["date_posted"] == datetime.fromtimestamp(posted)
@@ -0,0 +1,24 @@
+from benchmarks.fixtures import make_readme
+from scrapers.multi_source import JobScraper
+from scrapers.parse_pool import ParsePool
+from scrapers.resilience import CircuitBreakers
+
+SOURCE = {"type": "markdown_table", "table_format": "jobright", "source_name": "Bench-README", "destination": "bench"}
+
+
+def test_pooled_and_local_parsing_apply_the_same_cap(tmp_path):
+    scraper = JobScraper(cache_dir=str(tmp_path / "http"), sources={}, parse_workers=0,
+                         breakers=CircuitBreakers(str(tmp_path / "circuit_breakers.json")),
+                         destinations={"bench": {"window_days": 7, "cap": 50}})
+    body = make_readme(400)
+    local_rows = scraper._parse_body(SOURCE, body, 7)
+
+    scraper.parse_pool = ParsePool(1, min_bytes=0)
+    try:
+        pooled_rows = scraper._parse_body(SOURCE, body, 7)
+    finally:
+        scraper.parse_pool.shutdown()
+        scraper.session.close()
+
+    assert len(local_rows) == 50
+    assert [row["url"] for row in pooled_rows] == [row["url"] for row in local_rows]
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from data.models import JobPosting
+from data.persistence import store_new_jobs
+from data.seen_urls import SeenURLs
+
+
+def make_jobs(count):
+    return [JobPosting("Intern", "Stripe", "Remote", f"https://example.com/jobs/{i}", datetime.now(timezone.utc))
+            for i in range(count)]
+
+
+class FailingCollection:
+    """Raises the given bulk write errors after applying nothing but the listed upserts"""
+
+    def __init__(self, write_errors, upserted):
+        self.details = {"writeErrors": write_errors, "upserted": [{"index": index} for index in upserted]}
+
+    def bulk_write(self, operations, ordered=True):
+        raise BulkWriteError(self.details)
+
+
+def test_lost_duplicate_races_are_not_errors(tmp_path):
+    jobs = make_jobs(3)
+    collection = FailingCollection([{"index": 1, "code": 11000}], upserted=[0, 2])
+    seen_urls = SeenURLs(str(tmp_path / "seen_urls.bin"))
+
+    assert store_new_jobs(collection, jobs, seen_urls) == [jobs[0], jobs[2]]
+    assert all(seen_urls.is_known(job.url) for job in jobs)
+
+
+def test_other_write_errors_are_raised_and_stay_new(tmp_path):
+    jobs = make_jobs(3)
+    collection = FailingCollection([{"index": 1, "code": 11000}, {"index": 2, "code": 10334}], upserted=[0])
+    seen_urls = SeenURLs(str(tmp_path / "seen_urls.bin"))
+
+    with pytest.raises(BulkWriteError):
+        store_new_jobs(collection, jobs, seen_urls)
+    assert seen_urls.is_known(jobs[0].url)
+    assert seen_urls.is_known(jobs[1].url)
+    assert not seen_urls.is_known(jobs[2].url)
+    assert seen_urls.stored_count == 1
@@ -0,0 +1,15 @@
+from bot import producer
+
+
+def test_sharded_producer_refuses_to_start_without_home_guild(monkeypatch, capsys):
+    monkeypatch.setattr(producer, "SHARD_COUNT", 2)
+    monkeypatch.setattr(producer, "HOME_GUILD_ID", None)
+
+    def fail():
+        raise AssertionError("the producer must not start")
+
+    monkeypatch.setattr(producer, "Producer", fail)
+    monkeypatch.setattr(producer, "close_clients", lambda: None)
+
+    producer.main()
+    assert "HOME_GUILD_ID must be set" in capsys.readouterr().out
@@ -0,0 +1,49 @@
+import asyncio
+
+import mongomock
+import pytest
+
+from bot import repost
+
+
+class FakeBot:
+    def __init__(self, channel_ids):
+        self.channels = {channel_id: type("Channel", (), {"id": channel_id})() for channel_id in channel_ids}
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+
+@pytest.fixture
+def checkpoints(monkeypatch):
+    collection = mongomock.MongoClient()["engjobs"]["repost_checkpoints"]
+    monkeypatch.setattr(repost, "get_repost_checkpoints_collection", lambda: collection)
+    return collection
+
+
+def test_repeated_ready_events_resume_each_channel_once(checkpoints, monkeypatch):
+    checkpoints.insert_many([{"_id": 1, "status": "running"}, {"_id": 2, "status": "running"},
+                             {"_id": 3, "status": "done"}])
+    started = []
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def fake_run(engine):
+            started.append(engine.channel.id)
+            await release.wait()
+
+        monkeypatch.setattr(repost, "_run_resumed", fake_run)
+        bot = FakeBot([1, 2, 3])
+        # The second call comes before the first call's tasks have started
+        first = await repost.resume_pending(bot)
+        second = await repost.resume_pending(bot)
+        await asyncio.sleep(0)
+        third = await repost.resume_pending(bot)
+        release.set()
+        await asyncio.gather(*repost._resumed_tasks.values())
+        return first, second, third
+
+    assert asyncio.run(scenario()) == (2, 0, 0)
+    assert sorted(started) == [1, 2]
+    assert repost._resumed_tasks == {}
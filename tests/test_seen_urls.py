@@ -0,0 +1,41 @@
+import pytest
+
+from data.seen_urls import BloomFilter, SeenURLs
+
+STORED = [f"https://boards.greenhouse.io/c/jobs/{i}" for i in range(20000)]
+UNSEEN = [f"https://jobs.lever.co/new/{i}" for i in range(50000)]
+
+
+@pytest.mark.parametrize("error_rate", [0.01, 0.001])
+def test_false_positive_rate_stays_within_bound(error_rate):
+    bloom = BloomFilter(capacity=len(STORED), error_rate=error_rate)
+    for url in STORED:
+        bloom.add(url)
+
+    assert all(url in bloom for url in STORED)
+    false_positives = sum(1 for url in UNSEEN if url in bloom)
+    assert false_positives / len(UNSEEN) <= 2 * error_rate
+    assert bloom.expected_error_rate(len(STORED)) <= 1.1 * error_rate
+
+
+def test_bloom_false_positives_are_not_reported_as_known(tmp_path):
+    # A tiny filter, so most unseen URLs pass the Bloom check
+    seen = SeenURLs(path=str(tmp_path / "seen_urls.bin"), capacity=100, error_rate=0.5)
+    seen.mark_stored(STORED[:2000], 2000)
+
+    assert all(seen.is_known(url) for url in STORED[:2000])
+    assert not any(seen.is_known(url) for url in UNSEEN[:2000])
+    assert seen.stats["false_positives"] > 0
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "seen_urls.bin")
+    seen = SeenURLs(path=path, capacity=len(STORED))
+    seen.mark_stored(STORED, len(STORED))
+    seen.save()
+
+    restored = SeenURLs(path=path)
+    assert restored.load()
+    assert restored.stored_count == len(STORED)
+    assert all(restored.is_known(url) for url in STORED[:1000])
+    assert not any(restored.is_known(url) for url in UNSEEN[:1000])
@@ -0,0 +1,117 @@
+import asyncio
+
+import discord
+
+from bot.send_queue import ChannelSendQueue, SendDispatcher, MAX_EMBEDS_PER_MESSAGE
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__("429 Too Many Requests")
+        self.retry_after = retry_after
+
+
+class FakeChannel:
+    """Records the embeds of every message, failing the first sends with the given errors"""
+
+    def __init__(self, channel_id: int = 1, errors=(), blocked: bool = False):
+        self.id = channel_id
+        self.messages = []
+        self.attempts = 0
+        self.errors = list(errors)
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def send(self, embeds):
+        self.attempts += 1
+        await self.unblocked.wait()
+        if self.errors:
+            raise self.errors.pop(0)
+        self.messages.append([embed.title for embed in embeds])
+
+
+def embeds(count: int):
+    return [discord.Embed(title=f"Job {i}") for i in range(count)]
+
+
+def fast_dispatcher(**options):
+    return SendDispatcher(global_rate=1000, global_per=1.0, rate=1000, per=1.0, linger=0.01, **options)
+
+
+def test_embeds_arrive_in_order_packed_ten_per_message():
+    async def run():
+        channel = FakeChannel()
+        dispatcher = fast_dispatcher()
+        delivered = await dispatcher.send_all(channel, embeds(25))
+        await dispatcher.close()
+        return channel, delivered
+
+    channel, delivered = asyncio.run(run())
+
+    assert delivered == [True] * 25
+    assert [len(message) for message in channel.messages] == [MAX_EMBEDS_PER_MESSAGE, MAX_EMBEDS_PER_MESSAGE, 5]
+    assert [title for message in channel.messages for title in message] == [f"Job {i}" for i in range(25)]
+
+
+def test_rate_limited_send_is_retried():
+    async def run():
+        channel = FakeChannel(errors=[RateLimited(0.01), RateLimited(0.01)])
+        dispatcher = fast_dispatcher(max_retries=3)
+        delivered = await dispatcher.send_all(channel, embeds(3))
+        stats = dispatcher.stats()[channel.id]
+        await dispatcher.close()
+        return channel, delivered, stats
+
+    channel, delivered, stats = asyncio.run(run())
+
+    assert delivered == [True] * 3
+    assert channel.attempts == 3
+    assert stats["rate_limited"] == 2
+    assert stats["messages_sent"] == 1
+
+
+def test_send_fails_after_retries_or_on_other_errors():
+    async def run():
+        limited = FakeChannel(1, errors=[RateLimited(0.01)] * 3)
+        broken = FakeChannel(2, errors=[RuntimeError("Missing Access")])
+        dispatcher = fast_dispatcher(max_retries=2)
+        results = await asyncio.gather(dispatcher.send_all(limited, embeds(2)), dispatcher.send_all(broken, embeds(2)))
+        await dispatcher.close()
+        return limited, broken, results
+
+    limited, broken, (limited_delivered, broken_delivered) = asyncio.run(run())
+
+    assert limited_delivered == [False, False]
+    assert limited.attempts == 3
+    assert broken_delivered == [False, False]
+    assert broken.attempts == 1
+
+
+def test_close_resolves_pending_sends_as_undelivered():
+    async def run():
+        channel = FakeChannel(blocked=True)
+        queue = ChannelSendQueue(channel, rate=1000, per=1.0, linger=0.01)
+        futures = [queue.enqueue(embed) for embed in embeds(25)]
+        # Let the worker take the first batch and block in send
+        while channel.attempts == 0:
+            await asyncio.sleep(0.01)
+        await asyncio.wait_for(queue.close(), 1)
+        results = await asyncio.wait_for(asyncio.gather(*futures), 1)
+        await asyncio.wait_for(queue.join(), 1)
+        return results
+
+    assert asyncio.run(run()) == [False] * 25
+
+
+def test_dispatcher_close_unblocks_send_all():
+    async def run():
+        channel = FakeChannel(blocked=True)
+        dispatcher = fast_dispatcher()
+        send = asyncio.create_task(dispatcher.send_all(channel, embeds(12)))
+        while channel.attempts == 0:
+            await asyncio.sleep(0.01)
+        await dispatcher.close()
+        return await asyncio.wait_for(send, 1)
+
+    assert asyncio.run(run()) == [False] * 12
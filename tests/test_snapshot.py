@@ -0,0 +1,28 @@
+from scrapers.snapshot import RowSnapshot
+
+
+def test_discarded_source_is_emitted_again_while_others_commit(tmp_path):
+    path = str(tmp_path / "row_snapshot.json")
+    rows = {"A": [{"url": "https://a.example/1", "date_posted": 0}],
+            "B": [{"url": "https://b.example/1", "date_posted": 0}]}
+    snapshot = RowSnapshot(path)
+    for source_name, source_rows in rows.items():
+        snapshot.delta(source_name, source_rows)
+
+    snapshot.discard({"A"})
+    snapshot.commit()
+
+    reloaded = RowSnapshot(path)
+    assert reloaded.delta("A", rows["A"]) == rows["A"]
+    assert reloaded.delta("B", rows["B"]) == []
+
+
+def test_discard_without_sources_drops_everything_staged(tmp_path):
+    snapshot = RowSnapshot(str(tmp_path / "row_snapshot.json"))
+    rows = [{"url": "https://a.example/1", "date_posted": 0}]
+    snapshot.delta("A", rows)
+
+    snapshot.discard()
+    snapshot.commit()
+
+    assert snapshot.delta("A", rows) == rows
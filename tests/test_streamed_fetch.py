@@ -0,0 +1,80 @@
+import asyncio
+
+from scrapers.multi_source import JobScraper
+
+HEADER = "| Company | Position | Location | Application | Date Posted |\n|---|---|---|---|---|\n"
+
+
+def readme(recent: int, week_old: int, historic: int) -> bytes:
+    rows = [f"| Recent {i} | Engineer | NYC | [Apply](https://example.com/recent/{i}) | 1 day ago |" for i in range(recent)]
+    rows += [f"| Older {i} | Engineer | NYC | [Apply](https://example.com/older/{i}) | 10 days ago |" for i in range(week_old)]
+    rows += [f"| Historic {i} | Engineer | NYC | [Apply](https://example.com/historic/{i}) | 2019-01-01 |" for i in range(historic)]
+    return (HEADER + "\n".join(rows) + "\n").encode("utf-8")
+
+
+def markdown_source(url: str):
+    return {'source_name': 'Test README', 'url': url, 'type': 'markdown_table'}
+
+
+def test_early_stop_does_not_cache_the_prefix_as_the_document(stub_server, scraper):
+    document = readme(recent=20, week_old=0, historic=3000)
+    stub_server.documents["/README.md"] = (document, '"v1"')
+    source = markdown_source(stub_server.url("/README.md"))
+
+    streamed = scraper.fetch_source_rows(source, 7)
+    assert len(streamed) == 20
+    assert scraper.fetch_source_rows(source, 7) == streamed
+
+    # The streamed read stopped early, so the full-body path must not see a 304 for a partial body
+    assert scraper.fetch_markdown_content(source['url']) == document.decode("utf-8")
+    assert scraper.fetch_source_body(source['url']) == (document, False)
+    assert stub_server.statuses("/README.md") == [200, 304, 200, 304]
+
+
+def test_cached_rows_survive_a_restart(stub_server, scraper, tmp_path):
+    stub_server.documents["/README.md"] = (readme(recent=20, week_old=0, historic=3000), '"v1"')
+    source = markdown_source(stub_server.url("/README.md"))
+    streamed = scraper.fetch_source_rows(source, 7)
+
+    restarted = JobScraper(cache_dir=scraper.http_cache.cache_dir, sources={}, parse_workers=0, breakers=scraper.breakers)
+    assert restarted.fetch_source_rows(source, 7) == streamed
+    assert stub_server.statuses("/README.md") == [200, 304]
+
+
+def test_wider_window_is_not_answered_from_a_narrower_read(stub_server, scraper):
+    stub_server.documents["/README.md"] = (readme(recent=20, week_old=10, historic=3000), '"v1"')
+    source = markdown_source(stub_server.url("/README.md"))
+
+    assert len(scraper.fetch_source_rows(source, 7)) == 20
+    assert len(scraper.fetch_source_rows(source, 30)) == 30
+    assert len(scraper.fetch_source_rows(source, 30)) == 30
+    assert stub_server.statuses("/README.md") == [200, 200, 304]
+
+
+def test_complete_read_is_cached_as_the_document(stub_server, scraper):
+    document = readme(recent=20, week_old=0, historic=0)
+    stub_server.documents["/README.md"] = (document, '"v1"')
+    source = markdown_source(stub_server.url("/README.md"))
+
+    assert len(scraper.fetch_source_rows(source, 7)) == 20
+    assert scraper.fetch_source_body(source['url']) == (document, False)
+
+
+def test_async_early_stop_then_full_body(stub_server, scraper):
+    document = readme(recent=20, week_old=0, historic=3000)
+    stub_server.documents["/README.md"] = (document, '"v1"')
+    source = markdown_source(stub_server.url("/README.md"))
+
+    async def run():
+        try:
+            first = await scraper.afetch_source_rows(source, 7)
+            second = await scraper.afetch_source_rows(source, 7)
+            return first, second
+        finally:
+            await scraper.aclose()
+
+    first, second = asyncio.run(run())
+    assert len(first) == 20
+    assert second == first
+    assert scraper.fetch_markdown_content(source['url']) == document.decode("utf-8")
+    assert stub_server.statuses("/README.md") == [200, 304, 200]
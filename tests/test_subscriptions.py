@@ -0,0 +1,118 @@
+import random
+from datetime import datetime, timezone
+
+import mongomock
+import pytest
+
+from benchmarks.bench_subscriptions import random_job, random_subscription, scan_matches
+from bot.commands import parse_subscription
+from bot.subscriptions import SubscriptionIndex
+from data.models import JobPosting
+from data.subscriptions import Subscription, delete_subscription, load_subscriptions, save_subscription
+
+
+def make_job(title="Software Engineer Intern", company="Stripe", location="New York, NY", role_type="Internship"):
+    return JobPosting(title, company, location, "https://example.com/jobs/1", datetime.now(timezone.utc), role_type)
+
+
+def matched_channels(subscriptions, job):
+    return sorted(subscription.channel_id for subscription in SubscriptionIndex(subscriptions).match(job))
+
+
+def test_empty_subscription_matches_everything():
+    assert matched_channels([Subscription(1, 10)], make_job()) == [10]
+
+
+def test_role_filter():
+    subscriptions = [Subscription(1, 10, role_types=["Internship"]), Subscription(1, 11, role_types=["New Grad"]),
+                     Subscription(1, 12)]
+    assert matched_channels(subscriptions, make_job(role_type="New Grad")) == [11, 12]
+
+
+def test_company_filter_ignores_case_and_punctuation():
+    subscriptions = [Subscription(1, 10, companies=["AT&T", "Jane Street"]), Subscription(1, 11, companies=["Meta"])]
+    assert matched_channels(subscriptions, make_job(company="at&t")) == [10]
+    assert matched_channels(subscriptions, make_job(company="Jane  Street")) == [10]
+
+
+def test_excluded_company_wins_over_every_other_filter():
+    subscriptions = [Subscription(1, 10, exclude_companies=["Stripe"]),
+                     Subscription(1, 11, companies=["Stripe"], exclude_companies=["Stripe"]),
+                     Subscription(1, 12, exclude_companies=["Meta"])]
+    assert matched_channels(subscriptions, make_job(company="Stripe")) == [12]
+
+
+@pytest.mark.parametrize("location, expected", [
+    ("New York, NY", [10, 12]),
+    ("Remote - New York", [10, 12]),
+    ("York, PA", [12]),
+    ("Newark, NJ", [12]),
+    ("San Francisco, CA", [11, 12]),
+])
+def test_location_matches_whole_words_in_order(location, expected):
+    subscriptions = [Subscription(1, 10, locations=["new york"]), Subscription(1, 11, locations=["San Francisco", "Seattle"]),
+                     Subscription(1, 12)]
+    assert matched_channels(subscriptions, make_job(location=location)) == expected
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Machine Learning Engineer Intern", [10, 12]),
+    ("Learning Machine Intern", [12]),
+    ("C++ Developer Intern", [11, 12]),
+    ("C Developer Intern", [12]),
+])
+def test_keywords_match_title_phrases(title, expected):
+    subscriptions = [Subscription(1, 10, keywords=["machine learning"]), Subscription(1, 11, keywords=["c++"]),
+                     Subscription(1, 12)]
+    assert matched_channels(subscriptions, make_job(title=title)) == expected
+
+
+def test_every_filter_must_match():
+    subscription = Subscription(1, 10, role_types=["Internship"], companies=["Stripe"], locations=["Remote"],
+                                keywords=["backend"])
+    assert matched_channels([subscription], make_job(title="Backend Intern", location="Remote")) == [10]
+    assert matched_channels([subscription], make_job(title="Frontend Intern", location="Remote")) == []
+    assert matched_channels([subscription], make_job(title="Backend Intern", location="Austin, TX")) == []
+
+
+def test_group_keeps_job_order_per_channel():
+    index = SubscriptionIndex([Subscription(1, 10, keywords=["backend"]), Subscription(1, 11)])
+    jobs = [make_job(title="Backend Intern"), make_job(title="Data Intern"), make_job(title="Backend Engineer")]
+    assert index.group(jobs) == {10: [jobs[0], jobs[2]], 11: jobs}
+
+
+def test_index_agrees_with_a_scan_of_every_subscription():
+    rng = random.Random(3)
+    subscriptions = [random_subscription(rng, i) for i in range(300)]
+    index = SubscriptionIndex(subscriptions)
+    for i in range(300):
+        job = random_job(rng, i)
+        assert index.match_ids(job) == scan_matches(subscriptions, job)
+
+
+def test_parse_subscription():
+    subscription = parse_subscription(1, 10, "role:intern,newgrad location:New York, Remote exclude:Meta keywords:backend")
+    assert subscription.role_types == ["Internship", "New Grad"]
+    assert subscription.locations == ["New York", "Remote"]
+    assert subscription.exclude_companies == ["Meta"]
+    assert subscription.keywords == ["backend"]
+    assert subscription.companies == []
+
+
+def test_parse_subscription_rejects_unknown_roles():
+    with pytest.raises(ValueError):
+        parse_subscription(1, 10, "role:manager")
+
+
+def test_subscribe_replaces_and_unsubscribe_removes_the_channel_filters():
+    collection = mongomock.MongoClient()["engjobs"]["subscriptions"]
+    collection.create_index("channel_id", unique=True)
+
+    save_subscription(Subscription(1, 10, keywords=["backend"]), collection)
+    save_subscription(Subscription(1, 10, keywords=["data"]), collection)
+    save_subscription(Subscription(1, 11), collection)
+    assert {s.channel_id: s.keywords for s in load_subscriptions(collection)} == {10: ["data"], 11: []}
+
+    assert delete_subscription(10, collection)
+    assert not delete_subscription(10, collection)
+    assert [s.channel_id for s in load_subscriptions(collection)] == [11]
@@ -0,0 +1,63 @@
+import pytest
+
+from scrapers.text_cleaning import clean_text, extract_url, strip_html
+
+# README cells and what the BeautifulSoup-based cleaner produced for them
+GOLDEN = [
+    ("**[Google](https://www.google.com)**", "Google"),
+    ("**[Software Engineering Intern, BS, Summer 2026](https://jobright.ai/jobs/info/686b3f1a?utm_campaign=Software%20Engineer%20Internship&utm_source=1&utm_medium=github)**",
+     "Software Engineering Intern, BS, Summer 2026"),
+    ("↳", "↳"),
+    ("**[AT&T Inc](https://www.att.com)**", "AT&T Inc"),
+    ("**[Procter & Gamble](https://us.pg.com)**", "Procter & Gamble"),
+    ("<strong><a href=\"https://simplify.jobs/c/Stripe\">Stripe</a></strong>", "Stripe"),
+    ("<a href=\"https://boards.greenhouse.io/x\"><img src=\"https://i.imgur.com/u1KNU8z.png\" width=\"118\" alt=\"Apply\"></a>", ""),
+    ("Machine Learning Engineer Intern 🎓", "Machine Learning Engineer Intern 🎓"),
+    ("Backend Engineer Intern <br> Summer 2026", "Backend Engineer Intern ,  Summer 2026"),
+    ("SWE Intern &amp; Data Platform", "SWE Intern & Data Platform"),
+    ("`Quant` Researcher _Intern_ #1", "Quant Researcher Intern 1"),
+    ("[Jane Street](https://www.janestreet.com) - Trading", "Jane Street - Trading"),
+    ("Hardware Engineering Intern – Silicon (Fall 2026)", "Hardware Engineering Intern – Silicon (Fall 2026)"),
+    ("Co-op&nbsp;Software Developer", "Co-op\xa0Software Developer"),
+    ("<details><summary>**5 locations**</summary>San Francisco, CA</br>New York, NY</br>Seattle, WA</details>",
+     "5 locations, San Francisco, CA, New York, NY, Seattle, WA"),
+    ("&amp;&lt;b&gt;", "&<b>"),
+    ("Tom &amp Jerry", "Tom & Jerry"),
+    ("x &#39; y", "x ' y"),
+    ("&unknown", "&unknown"),
+    ("<p>a</p>\n<p>b</p>", "a, \n, b"),
+    ("<script>x</script>Visible", "Visible"),
+    ("<pre>  a  b </pre>", "a  b"),
+    ("", ""),
+    ("   ", ""),
+]
+
+
+@pytest.mark.parametrize("cell, expected", GOLDEN)
+def test_golden_corpus(cell, expected):
+    assert clean_text(cell) == expected
+
+
+@pytest.mark.parametrize("cell, expected", [
+    ("Intern &foo; team", "Intern &foo; team"),
+    ("R&D &foo;", "R&D &foo;"),
+    ("AT&T;", "AT&T;"),
+])
+def test_unknown_entities_keep_their_semicolon(cell, expected):
+    # BeautifulSoup drops the ';' here; the cell text is kept as written instead
+    assert clean_text(cell) == expected
+
+
+def test_strip_html_joins_strings_with_the_separator():
+    assert strip_html("<b>a</b><i>b</i>", separator="|") == "a|b"
+    assert strip_html("a<br>b", separator="|") == "a|b"
+
+
+@pytest.mark.parametrize("cell, expected", [
+    ("**[Apply](https://boards.greenhouse.io/x/jobs/1)**", "https://boards.greenhouse.io/x/jobs/1"),
+    ("see https://jobs.lever.co/y/2 now", "https://jobs.lever.co/y/2"),
+    ("Closed", ""),
+    ("", ""),
+])
+def test_extract_url(cell, expected):
+    assert extract_url(cell) == expected